@@ -0,0 +1,169 @@
+// --- BROADCAST LAYER (WebSocket fan-out) ---
+// Each event is serialized once, queued, and flushed to every client once per tick.
+// Slow clients (high bufferedAmount) stop receiving frames: their backlog is conflated
+// (latest state per key wins) or trimmed, and is flushed when their socket drains.
+
+const FLUSH_INTERVAL_MS = 16;
+const HIGH_WATER_BYTES = 1 << 20; // stop writing to a client above this much unsent data
+const LOW_WATER_BYTES = 256 << 10; // ...and resume once it has drained below this
+const MAX_BACKLOG = 256; // ordered (non-conflatable) messages kept per slow client
+
+// High-frequency state events: a client only ever needs the latest one per key
+// (ai_token chunks are deltas, so they stay ordered; the final ai_response carries the full text)
+const CONFLATE_TYPES = new Set(["telemetry", "progress", "job_progress", "relay_stats"]);
+
+function conflationKey(type, payload) {
+  if (!CONFLATE_TYPES.has(type)) return null;
+  const id = payload && (payload.id ?? payload.key ?? payload.job);
+  return id === undefined ? type : `${type}:${id}`;
+}
+
+function matches(topics, type) {
+  if (topics.has("*") || topics.has(type)) return true;
+  // "ai_*" subscribes to every ai_ event
+  for (const topic of topics) {
+    if (topic.endsWith("*") && type.startsWith(topic.slice(0, -1))) return true;
+  }
+  return false;
+}
+
+class Broadcaster {
+  constructor(wss, options = {}) {
+    this.wss = wss;
+    this.flushInterval = options.flushInterval ?? FLUSH_INTERVAL_MS;
+    this.highWater = options.highWater ?? HIGH_WATER_BYTES;
+    this.lowWater = options.lowWater ?? LOW_WATER_BYTES;
+    this.maxBacklog = options.maxBacklog ?? MAX_BACKLOG;
+    this.queue = [];
+    this.timer = null;
+    this.clients = new Map(); // ws -> { topics, batch, backlog, conflated, slow }
+    this.stats = { published: 0, frames: 0, bytes: 0, conflated: 0, dropped: 0, flushes: 0 };
+
+    wss.on("connection", (ws) => this.attach(ws));
+  }
+
+  attach(ws) {
+    // Clients start subscribed to everything with one frame per event (the original wire format)
+    const state = { topics: new Set(["*"]), batch: false, backlog: [], conflated: new Map(), slow: false };
+    this.clients.set(ws, state);
+    ws.on("message", (data) => this.control(ws, state, data));
+    ws.on("close", () => this.clients.delete(ws));
+  }
+
+  control(ws, state, data) {
+    // { type: "subscribe" | "unsubscribe", topics: [...], batch: true }
+    let msg;
+    try {
+      msg = JSON.parse(data);
+    } catch (e) {
+      return;
+    }
+    const topics = Array.isArray(msg.topics) ? msg.topics.map(String) : [];
+    if (msg.type === "subscribe") {
+      if (state.topics.has("*") && topics.length) state.topics.clear();
+      topics.forEach((t) => state.topics.add(t));
+      if (typeof msg.batch === "boolean") state.batch = msg.batch;
+    } else if (msg.type === "unsubscribe") {
+      topics.forEach((t) => state.topics.delete(t));
+    } else {
+      return;
+    }
+    ws.send(JSON.stringify({ type: "subscribed", payload: { topics: [...state.topics], batch: state.batch } }));
+  }
+
+  publish(type, payload) {
+    this.stats.published++;
+    this.queue.push({ type, key: conflationKey(type, payload), data: JSON.stringify({ type, payload }) });
+    if (!this.timer) this.timer = setTimeout(() => this.flush(), this.flushInterval);
+  }
+
+  flush() {
+    this.timer = null;
+    const queue = this.queue;
+    this.queue = [];
+    this.stats.flushes++;
+
+    // Filtering and batch frames are shared by every client with the same subscription
+    const groups = new Map();
+    for (const [ws, state] of this.clients) {
+      if (ws.readyState !== ws.OPEN) continue;
+      const signature = [...state.topics].sort().join(",");
+      let group = groups.get(signature);
+      if (!group) {
+        const messages = queue.filter((m) => matches(state.topics, m.type));
+        group = { messages, frame: null };
+        groups.set(signature, group);
+      }
+      let messages = group.messages;
+      let shared = true;
+
+      if (state.slow || ws.bufferedAmount > this.highWater) {
+        this.defer(state, messages);
+        if (ws.bufferedAmount > this.lowWater) continue;
+        // Drained: send the (conflated) backlog in place of this tick's messages
+        state.slow = false;
+        messages = this.drain(state);
+        shared = false;
+      }
+      if (!messages.length) continue;
+
+      if (state.batch) {
+        let frame = shared ? group.frame : null;
+        if (!frame) {
+          frame = `{"type":"batch","payload":[${messages.map((m) => m.data).join(",")}]}`;
+          if (shared) group.frame = frame;
+        }
+        this.send(ws, frame);
+      } else {
+        messages.forEach((m) => this.send(ws, m.data));
+      }
+    }
+
+    // Keep ticking while anyone has a backlog so it drains even when nothing new is published
+    if (!this.timer && [...this.clients.values()].some((s) => s.slow)) {
+      this.timer = setTimeout(() => this.flush(), this.flushInterval);
+    }
+  }
+
+  defer(state, messages) {
+    state.slow = true;
+    for (const m of messages) {
+      if (m.key) {
+        if (state.conflated.has(m.key)) this.stats.conflated++;
+        state.conflated.delete(m.key); // re-insert so ordering follows the latest update
+        state.conflated.set(m.key, m);
+      } else {
+        state.backlog.push(m);
+      }
+    }
+    if (state.backlog.length > this.maxBacklog) {
+      this.stats.dropped += state.backlog.length - this.maxBacklog;
+      state.backlog.splice(0, state.backlog.length - this.maxBacklog);
+    }
+  }
+
+  drain(state) {
+    const messages = state.backlog.concat([...state.conflated.values()]);
+    state.backlog = [];
+    state.conflated.clear();
+    return messages;
+  }
+
+  send(ws, data) {
+    this.stats.frames++;
+    this.stats.bytes += data.length;
+    ws.send(data);
+  }
+
+  snapshot() {
+    let slow = 0;
+    let backlog = 0;
+    for (const state of this.clients.values()) {
+      if (state.slow) slow++;
+      backlog += state.backlog.length + state.conflated.size;
+    }
+    return { ...this.stats, clients: this.clients.size, slow, backlog, queued: this.queue.length };
+  }
+}
+
+module.exports = { Broadcaster, CONFLATE_TYPES, FLUSH_INTERVAL_MS };
@@ -0,0 +1,211 @@
+// --- REQUEST COORDINATOR (upstream model calls) ---
+// Identical in-flight prompts share one upstream call; the rest wait in a bounded FIFO queue
+// for a concurrency slot and a token from a token bucket (requests/second with burst).
+// Upstream text arrives as chunks; every caller (merged ones included, with replay) sees them as they land.
+
+const crypto = require("crypto");
+
+const MAX_CONCURRENT = 4;
+const MAX_QUEUE = 64;
+const RATE_PER_SEC = 2; // sustained upstream calls per second
+const BURST = 4;
+const SAMPLE_SIZE = 512; // latency samples kept for percentiles
+
+class QueueFullError extends Error {
+  constructor(size) {
+    super(`Request queue full (${size} waiting)`);
+    this.status = 429;
+  }
+}
+
+class Samples {
+  constructor(size = SAMPLE_SIZE) {
+    this.values = new Float64Array(size);
+    this.count = 0;
+    this.total = 0;
+  }
+
+  add(value) {
+    this.values[this.count % this.values.length] = value;
+    this.count++;
+    this.total += value;
+  }
+
+  summary() {
+    const n = Math.min(this.count, this.values.length);
+    if (!n) return { count: 0 };
+    const sorted = Array.from(this.values.subarray(0, n)).sort((a, b) => a - b);
+    const pct = (p) => sorted[Math.min(n - 1, Math.round((p / 100) * (n - 1)))];
+    return {
+      count: this.count,
+      mean: +(this.total / this.count).toFixed(2),
+      p50: +pct(50).toFixed(2),
+      p95: +pct(95).toFixed(2),
+      p99: +pct(99).toFixed(2),
+      max: +sorted[n - 1].toFixed(2),
+    };
+  }
+}
+
+class RequestCoordinator {
+  constructor(generate, options = {}) {
+    this.generate = generate; // async (prompt, onChunk) => full text
+    this.maxConcurrent = options.maxConcurrent ?? MAX_CONCURRENT;
+    this.maxQueue = options.maxQueue ?? MAX_QUEUE;
+    this.rate = options.rate ?? RATE_PER_SEC;
+    this.burst = options.burst ?? BURST;
+    this.now = options.now ?? (() => performance.now());
+
+    this.tokens = this.burst;
+    this.refilled = this.now();
+    this.inflight = new Map(); // prompt hash -> { promise, chunks, listeners }
+    this.queue = []; // [{ start, enqueued }]
+    this.active = 0;
+    this.timer = null;
+
+    this.counters = { requests: 0, merged: 0, upstream: 0, errors: 0, rejected: 0, throttled: 0 };
+    this.queueWait = new Samples();
+    this.upstreamLatency = new Samples();
+    this.ttft = new Samples(); // request arrival -> first chunk delivered to that caller
+  }
+
+  run(prompt, onChunk) {
+    /** -> Promise<{ text, merged, waitMs, upstreamMs, ttftMs }>; onChunk(text) fires per streamed chunk */
+    this.counters.requests++;
+    const arrived = this.now();
+    let ttftMs = null;
+    const deliver = (chunk) => {
+      if (ttftMs === null) {
+        ttftMs = this.now() - arrived;
+        this.ttft.add(ttftMs);
+      }
+      if (onChunk) onChunk(chunk);
+    };
+
+    const key = crypto.createHash("sha256").update(prompt).digest("hex");
+    const shared = this.inflight.get(key);
+    if (shared) {
+      this.counters.merged++;
+      // Late joiners catch up on what has already streamed
+      shared.chunks.forEach(deliver);
+      shared.listeners.add(deliver);
+      return shared.promise
+        .then((result) => ({ ...result, merged: true, ttftMs }))
+        .finally(() => shared.listeners.delete(deliver));
+    }
+    if (this.queue.length >= this.maxQueue) {
+      this.counters.rejected++;
+      return Promise.reject(new QueueFullError(this.queue.length));
+    }
+
+    const entry = { chunks: [], listeners: new Set([deliver]) };
+    const emit = (chunk) => {
+      entry.chunks.push(chunk);
+      entry.listeners.forEach((listener) => listener(chunk));
+    };
+    entry.promise = new Promise((resolve, reject) => {
+      this.queue.push({ enqueued: this.now(), start: (waitMs) => this.call(prompt, emit, waitMs).then(resolve, reject) });
+      this.pump();
+    }).finally(() => this.inflight.delete(key));
+    this.inflight.set(key, entry);
+    return entry.promise.then((result) => ({ ...result, ttftMs }));
+  }
+
+  async call(prompt, emit, waitMs) {
+    const started = this.now();
+    this.counters.upstream++;
+    let streamed = false;
+    try {
+      const text = await this.generate(prompt, (chunk) => {
+        streamed = true;
+        emit(chunk);
+      });
+      // Non-streaming generators still deliver their answer as one chunk
+      if (!streamed && text) emit(text);
+      const upstreamMs = this.now() - started;
+      this.upstreamLatency.add(upstreamMs);
+      return { text, merged: false, waitMs, upstreamMs };
+    } catch (error) {
+      this.counters.errors++;
+      throw error;
+    } finally {
+      this.active--;
+      this.pump();
+    }
+  }
+
+  refill() {
+    const now = this.now();
+    this.tokens = Math.min(this.burst, this.tokens + ((now - this.refilled) / 1000) * this.rate);
+    this.refilled = now;
+  }
+
+  pump() {
+    while (this.queue.length && this.active < this.maxConcurrent) {
+      this.refill();
+      if (this.tokens < 1) {
+        // Wake up exactly when the next token is due
+        if (!this.timer) {
+          this.counters.throttled++;
+          const delay = Math.ceil(((1 - this.tokens) / this.rate) * 1000);
+          this.timer = setTimeout(() => {
+            this.timer = null;
+            this.pump();
+          }, delay);
+        }
+        return;
+      }
+      this.tokens -= 1;
+      this.active++;
+      const job = this.queue.shift();
+      const waitMs = this.now() - job.enqueued;
+      this.queueWait.add(waitMs);
+      job.start(waitMs);
+    }
+  }
+
+  metrics() {
+    this.refill();
+    return {
+      ...this.counters,
+      active: this.active,
+      queued: this.queue.length,
+      inflight_prompts: this.inflight.size,
+      tokens: +this.tokens.toFixed(2),
+      limits: { max_concurrent: this.maxConcurrent, max_queue: this.maxQueue, rate_per_sec: this.rate, burst: this.burst },
+      queue_wait_ms: this.queueWait.summary(),
+      upstream_ms: this.upstreamLatency.summary(),
+      ttft_ms: this.ttft.summary(),
+    };
+  }
+}
+
+// Stand-in for Gemini so the bridge can be exercised offline (NEXUS_FAKE_MODEL=<ms>): streams word by word
+function fakeModel(latencyMs = 250) {
+  return async (prompt, onChunk) => {
+    const request = prompt.split("User:").pop().trim();
+    const words = `[fake model] ${request}`.split(/(?<= )/);
+    for (const word of words) {
+      await new Promise((resolve) => setTimeout(resolve, latencyMs / words.length));
+      if (onChunk) onChunk(word);
+    }
+    return words.join("");
+  };
+}
+
+// Gemini streaming adapter: first tokens reach callers long before the full generation finishes
+function geminiStream(model) {
+  return async (prompt, onChunk) => {
+    const result = await model.generateContentStream(prompt);
+    let text = "";
+    for await (const chunk of result.stream) {
+      const piece = chunk.text();
+      if (!piece) continue;
+      text += piece;
+      if (onChunk) onChunk(piece);
+    }
+    return text;
+  };
+}
+
+module.exports = { RequestCoordinator, QueueFullError, fakeModel, geminiStream };
@@ -6,6 +6,8 @@ const express = require("express");
 const cors = require("cors");
 const bodyParser = require("body-parser");
 const { GoogleGenerativeAI } = require("@google/generative-ai");
+const { Broadcaster } = require("./broadcaster");
+const { RequestCoordinator, fakeModel, geminiStream } = require("./coordinator");
 require("dotenv").config();
 
 // --- CONFIGURATION ---
@@ -16,36 +18,128 @@ const GEMINI_API_KEY = process.env.GEMINI_API_KEY || "YOUR_KEY_HERE";
 const genAI = new GoogleGenerativeAI(GEMINI_API_KEY);
 const model = genAI.getGenerativeModel({ model: "gemini-1.5-flash" });
 
+// Every upstream call goes through the coordinator: identical prompts merge, concurrency and rate are bounded
+const generate = process.env.NEXUS_FAKE_MODEL
+  ? fakeModel(Number(process.env.NEXUS_FAKE_MODEL) || undefined)
+  : geminiStream(model);
+const coordinator = new RequestCoordinator(generate, {
+  maxConcurrent: Number(process.env.NEXUS_MAX_CONCURRENT) || undefined,
+  maxQueue: Number(process.env.NEXUS_MAX_QUEUE) || undefined,
+  rate: Number(process.env.NEXUS_RATE) || undefined,
+  burst: Number(process.env.NEXUS_BURST) || undefined,
+});
+
 // --- HTTP SERVER (Remote Chat Interface) ---
 const app = express();
 app.use(cors());
 app.use(bodyParser.json());
 
-app.post("/chat", async (req, res) => {
-  const { message, context } = req.body;
-  console.error(`[Nexus Remote] Received: ${message}`);
+const MAX_BATCH_ITEMS = 32;
 
-  try {
-    const prompt = `
+function buildPrompt(message, context) {
+  // request_id is per call; leaving it out keeps identical requests mergeable
+  const { request_id, ...shared } = context || {};
+  return `
       You are the Antigravity Nexus AI, an expert engineering assistant.
-      Context: ${JSON.stringify(context || {})}
+      Context: ${JSON.stringify(shared)}
       Task: Respond to the user's request about the Antigravity project.
       User: ${message}
     `;
+}
+
+app.post("/chat", async (req, res) => {
+  const { message, context, stream } = req.body;
+  const requestId = context && context.request_id;
+  console.error(`[Nexus Remote] Received: ${message}`);
+
+  // stream: true + Accept: text/event-stream -> SSE 'data: {"text": ...}' chunks, then 'data: [DONE]'
+  const sse = Boolean(stream) && (req.get("Accept") || "").includes("text/event-stream");
+  if (sse) {
+    res.writeHead(200, { "Content-Type": "text/event-stream", "Cache-Control": "no-cache", Connection: "keep-alive" });
+  }
+
+  // Every generation also streams to WebSocket subscribers as incremental ai_token frames
+  let seq = 0;
+  const onChunk = (text) => {
+    broadcast("ai_token", { request_id: requestId, seq: seq++, text });
+    if (sse) res.write(`data: ${JSON.stringify({ text })}\n\n`);
+  };
 
-    const result = await model.generateContent(prompt);
-    const responseText = result.response.text();
+  try {
+    const { text: responseText, ttftMs } = await coordinator.run(buildPrompt(message, context), onChunk);
+    const ttft_ms = ttftMs === null ? null : Math.round(ttftMs);
 
     // Relay to Canvas if needed
-    broadcast("ai_response", { text: responseText, original: message });
+    broadcast("ai_response", { text: responseText, original: message, request_id: requestId, ttft_ms });
 
-    res.json({ response: responseText });
+    if (sse) {
+      res.write("data: [DONE]\n\n");
+      return res.end();
+    }
+    res.json({ response: responseText, ttft_ms });
   } catch (error) {
-    console.error("[Nexus Remote] Gemini Error:", error);
-    res.status(500).json({ error: "Failed to communicate with Gemini API" });
+    const busy = error.status === 429;
+    if (!busy) console.error("[Nexus Remote] Gemini Error:", error);
+    const reason = busy ? error.message : "Failed to communicate with Gemini API";
+    if (sse) {
+      // Headers are gone; report the failure in-band
+      res.write(`data: ${JSON.stringify({ error: reason })}\n\n`);
+      return res.end();
+    }
+    res.status(busy ? 429 : 500).json({ error: reason });
   }
 });
 
+// Batch: one round trip for many requests, generated in parallel, answered in request order
+app.post("/chat/batch", async (req, res) => {
+  const { items, context } = req.body;
+  if (!Array.isArray(items) || items.length === 0) {
+    return res.status(400).json({ error: "Expected a non-empty 'items' array" });
+  }
+  if (items.length > MAX_BATCH_ITEMS) {
+    return res.status(413).json({ error: `Batch limited to ${MAX_BATCH_ITEMS} items` });
+  }
+  console.error(`[Nexus Remote] Batch received: ${items.length} items`);
+
+  const started = Date.now();
+  const results = await Promise.allSettled(
+    items.map(async (item) => {
+      const itemStarted = Date.now();
+      const result = await coordinator.run(buildPrompt(item.message, { ...context, ...item.context }));
+      return { response: result.text, ms: Date.now() - itemStarted };
+    })
+  );
+
+  const responses = results.map((r) =>
+    r.status === "fulfilled" ? r.value : { error: String((r.reason && r.reason.message) || r.reason) }
+  );
+  broadcast("ai_batch_response", {
+    count: responses.length,
+    failed: responses.filter((r) => r.error).length,
+    ms: Date.now() - started,
+  });
+  res.json({ responses });
+});
+
+// Publish an event to WebSocket subscribers (Python tools, load tests)
+app.post("/broadcast", (req, res) => {
+  const { type, payload } = req.body;
+  if (typeof type !== "string" || !type) {
+    return res.status(400).json({ error: "Expected a string 'type'" });
+  }
+  broadcast(type, payload);
+  res.status(202).json({ queued: true });
+});
+
+// Coordinator counters plus queue wait / upstream latency percentiles
+app.get("/metrics", (req, res) => {
+  res.json(coordinator.metrics());
+});
+
+app.get("/ws/stats", (req, res) => {
+  res.json(broadcaster.snapshot());
+});
+
 app.listen(HTTP_PORT, () => {
   console.error(`[Nexus Remote] HTTP Chat API running on port ${HTTP_PORT}`);
 });
@@ -54,13 +148,10 @@ app.listen(HTTP_PORT, () => {
 const wss = new WebSocket.Server({ port: WSS_PORT });
 console.error(`[Nexus Bridge] WebSocket server running on port ${WSS_PORT}`);
 
+const broadcaster = new Broadcaster(wss);
+
 function broadcast(type, payload) {
-  const message = JSON.stringify({ type, payload });
-  wss.clients.forEach((client) => {
-    if (client.readyState === WebSocket.OPEN) {
-      client.send(message);
-    }
-  });
+  broadcaster.publish(type, payload);
 }
 
 // --- MCP SERVER ---
@@ -116,8 +207,7 @@ mcpServer.setRequestHandler(CallToolRequestSchema, async (request) => {
   }
 
   if (name === "nexus_chat") {
-    const result = await model.generateContent(args.message);
-    const text = result.response.text();
+    const { text } = await coordinator.run(args.message);
     broadcast("ai_chat", { text });
     return { content: [{ type: "text", text: text }] };
   }
@@ -0,0 +1,155 @@
+const test = require("node:test");
+const assert = require("node:assert");
+const { EventEmitter } = require("events");
+const { Broadcaster } = require("../broadcaster");
+
+// ws stand-ins: sent frames are recorded, bufferedAmount is set by the test to simulate a slow reader
+class FakeSocket extends EventEmitter {
+  constructor() {
+    super();
+    this.OPEN = 1;
+    this.readyState = 1;
+    this.bufferedAmount = 0;
+    this.sent = [];
+  }
+
+  send(data) {
+    this.sent.push(data);
+  }
+
+  messages() {
+    return this.sent.map((frame) => JSON.parse(frame)).filter((m) => m.type !== "subscribed");
+  }
+}
+
+function setup(options = {}) {
+  const wss = new EventEmitter();
+  const broadcaster = new Broadcaster(wss, { flushInterval: 1, ...options });
+  const connect = () => {
+    const ws = new FakeSocket();
+    wss.emit("connection", ws);
+    return ws;
+  };
+  return { broadcaster, connect };
+}
+
+function subscribe(ws, topics, batch) {
+  ws.emit("message", JSON.stringify({ type: "subscribe", topics, batch }));
+}
+
+const tick = () => new Promise((resolve) => setTimeout(resolve, 10));
+
+test("new clients get every event, one frame each", async () => {
+  const { broadcaster, connect } = setup();
+  const ws = connect();
+  broadcaster.publish("ai_chat", { text: "a" });
+  broadcaster.publish("add_card", { id: 1 });
+  await tick();
+  assert.deepStrictEqual(ws.messages(), [
+    { type: "ai_chat", payload: { text: "a" } },
+    { type: "add_card", payload: { id: 1 } },
+  ]);
+});
+
+test("events published within a tick go out in one flush", async () => {
+  const { broadcaster, connect } = setup();
+  connect();
+  for (let i = 0; i < 50; i++) broadcaster.publish("ai_token", { i });
+  await tick();
+  assert.strictEqual(broadcaster.snapshot().flushes, 1);
+});
+
+test("topic subscriptions filter, including prefix wildcards", async () => {
+  const { broadcaster, connect } = setup();
+  const cards = connect();
+  const ai = connect();
+  subscribe(cards, ["add_card"]);
+  subscribe(ai, ["ai_*"]);
+  assert.strictEqual(JSON.parse(ai.sent[0]).type, "subscribed");
+  broadcaster.publish("add_card", { id: 1 });
+  broadcaster.publish("ai_token", { text: "x" });
+  broadcaster.publish("ai_response", { text: "xy" });
+  await tick();
+  assert.deepStrictEqual(cards.messages().map((m) => m.type), ["add_card"]);
+  assert.deepStrictEqual(ai.messages().map((m) => m.type), ["ai_token", "ai_response"]);
+
+  ai.emit("message", JSON.stringify({ type: "unsubscribe", topics: ["ai_*"] }));
+  broadcaster.publish("ai_token", { text: "z" });
+  await tick();
+  assert.strictEqual(ai.messages().length, 2);
+});
+
+test("batch subscribers get one frame per tick, shared between identical subscriptions", async () => {
+  const { broadcaster, connect } = setup();
+  const a = connect();
+  const b = connect();
+  subscribe(a, ["*"], true);
+  subscribe(b, ["*"], true);
+  a.sent = [];
+  b.sent = [];
+  broadcaster.publish("ai_token", { text: "1" });
+  broadcaster.publish("ai_token", { text: "2" });
+  await tick();
+  assert.strictEqual(a.sent.length, 1);
+  assert.strictEqual(a.sent[0], b.sent[0]);
+  const frame = JSON.parse(a.sent[0]);
+  assert.strictEqual(frame.type, "batch");
+  assert.deepStrictEqual(frame.payload.map((m) => m.payload.text), ["1", "2"]);
+});
+
+test("malformed control frames are ignored", () => {
+  const { connect } = setup();
+  const ws = connect();
+  ws.emit("message", "not json");
+  ws.emit("message", JSON.stringify({ type: "hello" }));
+  assert.deepStrictEqual(ws.sent, []);
+});
+
+test("slow clients are skipped, conflated, and caught up once drained", async () => {
+  const { broadcaster, connect } = setup({ highWater: 1000, lowWater: 100 });
+  const fast = connect();
+  const slow = connect();
+  slow.bufferedAmount = 5000;
+  for (let i = 0; i < 10; i++) broadcaster.publish("telemetry", { id: "fps", value: i });
+  broadcaster.publish("add_card", { id: 7 });
+  await tick();
+  assert.strictEqual(fast.messages().length, 11);
+  assert.deepStrictEqual(slow.sent, []);
+  const stats = broadcaster.snapshot();
+  assert.strictEqual(stats.slow, 1);
+  assert.strictEqual(stats.conflated, 9);
+
+  // Drained: the backlog is flushed by the follow-up tick without anything new being published
+  slow.bufferedAmount = 0;
+  await tick();
+  assert.deepStrictEqual(slow.messages(), [
+    { type: "add_card", payload: { id: 7 } },
+    { type: "telemetry", payload: { id: "fps", value: 9 } },
+  ]);
+  assert.strictEqual(broadcaster.snapshot().slow, 0);
+});
+
+test("a slow client's ordered backlog is capped", async () => {
+  const { broadcaster, connect } = setup({ highWater: 1000, lowWater: 100, maxBacklog: 5 });
+  const slow = connect();
+  slow.bufferedAmount = 5000;
+  for (let i = 0; i < 20; i++) broadcaster.publish("ai_token", { i });
+  await tick();
+  assert.strictEqual(broadcaster.snapshot().dropped, 15);
+  slow.bufferedAmount = 0;
+  await tick();
+  assert.deepStrictEqual(slow.messages().map((m) => m.payload.i), [15, 16, 17, 18, 19]);
+});
+
+test("closed sockets are forgotten and never written to", async () => {
+  const { broadcaster, connect } = setup();
+  const gone = connect();
+  const closing = connect();
+  closing.readyState = 2;
+  gone.emit("close");
+  broadcaster.publish("add_card", { id: 1 });
+  await tick();
+  assert.deepStrictEqual(gone.sent, []);
+  assert.deepStrictEqual(closing.sent, []);
+  assert.strictEqual(broadcaster.snapshot().clients, 1);
+});
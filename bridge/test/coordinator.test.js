@@ -0,0 +1,137 @@
+const test = require("node:test");
+const assert = require("node:assert");
+const { RequestCoordinator, QueueFullError, fakeModel } = require("../coordinator");
+
+// Fake upstream: every call waits until the test releases it, then streams its chunks
+function gatedModel() {
+  const calls = [];
+  const generate = (prompt, onChunk) =>
+    new Promise((resolve, reject) => {
+      calls.push({
+        prompt,
+        chunk: (text) => onChunk && onChunk(text),
+        finish: (text) => resolve(text),
+        fail: (error) => reject(error),
+      });
+    });
+  return { calls, generate };
+}
+
+const settle = () => new Promise((resolve) => setImmediate(resolve));
+
+test("identical in-flight prompts share one upstream call, late joiners get the replay", async () => {
+  const model = gatedModel();
+  const coordinator = new RequestCoordinator(model.generate, { rate: 1000, burst: 10 });
+  const first = [];
+  const late = [];
+  const a = coordinator.run("same prompt", (c) => first.push(c));
+  const b = coordinator.run("same prompt");
+  await settle();
+  assert.strictEqual(model.calls.length, 1);
+  model.calls[0].chunk("hel");
+  const c = coordinator.run("same prompt", (chunk) => late.push(chunk));
+  model.calls[0].chunk("lo");
+  model.calls[0].finish("hello");
+  const [ra, rb, rc] = await Promise.all([a, b, c]);
+  assert.deepStrictEqual([ra.text, rb.text, rc.text], ["hello", "hello", "hello"]);
+  assert.deepStrictEqual([ra.merged, rb.merged, rc.merged], [false, true, true]);
+  assert.deepStrictEqual(first, ["hel", "lo"]);
+  assert.deepStrictEqual(late, ["hel", "lo"]);
+  const metrics = coordinator.metrics();
+  assert.strictEqual(metrics.requests, 3);
+  assert.strictEqual(metrics.merged, 2);
+  assert.strictEqual(metrics.upstream, 1);
+  assert.strictEqual(metrics.inflight_prompts, 0);
+});
+
+test("a finished prompt is not merged with a later identical one", async () => {
+  const coordinator = new RequestCoordinator(async (prompt) => `re:${prompt}`, { rate: 1000, burst: 10 });
+  await coordinator.run("p");
+  const again = await coordinator.run("p");
+  assert.strictEqual(again.merged, false);
+  assert.strictEqual(coordinator.metrics().upstream, 2);
+});
+
+test("concurrency is bounded and the rest wait in FIFO order", async () => {
+  const model = gatedModel();
+  const coordinator = new RequestCoordinator(model.generate, { maxConcurrent: 2, rate: 1000, burst: 10 });
+  const runs = ["a", "b", "c", "d"].map((p) => coordinator.run(p));
+  await settle();
+  assert.deepStrictEqual(model.calls.map((c) => c.prompt), ["a", "b"]);
+  assert.strictEqual(coordinator.metrics().queued, 2);
+  model.calls[0].finish("A");
+  await settle();
+  assert.deepStrictEqual(model.calls.map((c) => c.prompt), ["a", "b", "c"]);
+  model.calls.slice(1).forEach((c) => c.finish(c.prompt.toUpperCase()));
+  await settle();
+  model.calls[3].finish("D");
+  const results = await Promise.all(runs);
+  assert.deepStrictEqual(results.map((r) => r.text), ["A", "B", "C", "D"]);
+  assert.ok(results[2].waitMs >= 0);
+  assert.strictEqual(coordinator.metrics().queue_wait_ms.count, 4);
+});
+
+test("a full queue rejects with 429 instead of growing", async () => {
+  const model = gatedModel();
+  const coordinator = new RequestCoordinator(model.generate, { maxConcurrent: 1, maxQueue: 2, rate: 1000, burst: 10 });
+  const accepted = ["a", "b", "c"].map((p) => coordinator.run(p));
+  await settle();
+  await assert.rejects(coordinator.run("d"), (e) => e instanceof QueueFullError && e.status === 429);
+  // Merging into an in-flight prompt never needs a queue slot
+  const merged = coordinator.run("c");
+  assert.strictEqual(coordinator.metrics().rejected, 1);
+  for (let i = 0; i < 3; i++) {
+    model.calls[i].finish(model.calls[i].prompt);
+    await settle();
+  }
+  assert.deepStrictEqual((await Promise.all(accepted)).map((r) => r.text), ["a", "b", "c"]);
+  assert.strictEqual((await merged).merged, true);
+});
+
+test("upstream errors reach every merged caller and free the slot", async () => {
+  const model = gatedModel();
+  const coordinator = new RequestCoordinator(model.generate, { maxConcurrent: 1, rate: 1000, burst: 10 });
+  const a = coordinator.run("boom");
+  const b = coordinator.run("boom");
+  const next = coordinator.run("fine");
+  await settle();
+  model.calls[0].fail(new Error("upstream 500"));
+  await assert.rejects(a, /upstream 500/);
+  await assert.rejects(b, /upstream 500/);
+  await settle();
+  model.calls[1].finish("ok");
+  assert.strictEqual((await next).text, "ok");
+  const metrics = coordinator.metrics();
+  assert.strictEqual(metrics.errors, 1);
+  assert.strictEqual(metrics.active, 0);
+});
+
+test("the token bucket spaces out upstream calls past the burst", async () => {
+  const started = [];
+  const coordinator = new RequestCoordinator(async (prompt) => {
+    started.push(performance.now());
+    return prompt;
+  }, { rate: 20, burst: 1 });
+  await Promise.all(["a", "b", "c"].map((p) => coordinator.run(p)));
+  assert.ok(started[1] - started[0] >= 40, `second call after ${started[1] - started[0]} ms`);
+  assert.ok(started[2] - started[1] >= 40, `third call after ${started[2] - started[1]} ms`);
+  assert.ok(coordinator.metrics().throttled >= 2);
+});
+
+test("non-streaming generators deliver their answer as one chunk", async () => {
+  const chunks = [];
+  const coordinator = new RequestCoordinator(async () => "whole answer", { rate: 1000, burst: 10 });
+  const result = await coordinator.run("p", (c) => chunks.push(c));
+  assert.deepStrictEqual(chunks, ["whole answer"]);
+  assert.ok(result.ttftMs !== null);
+  assert.strictEqual(coordinator.metrics().upstream_ms.count, 1);
+});
+
+test("the offline fake model streams word by word", async () => {
+  const chunks = [];
+  const coordinator = new RequestCoordinator(fakeModel(10), { rate: 1000, burst: 10 });
+  const result = await coordinator.run("System: x\nUser: hello there", (c) => chunks.push(c));
+  assert.strictEqual(result.text, "[fake model] hello there");
+  assert.ok(chunks.length > 1);
+  assert.strictEqual(chunks.join(""), result.text);
+});
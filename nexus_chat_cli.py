@@ -1,38 +1,133 @@
-import requests
 import sys
-import json
+import os
+import asyncio
+import argparse
 
-SERVER_URL = "http://localhost:3002/chat"
+# Shared Nexus client modules live with the overlay
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "shader_overlay"))
+from response_cache import ResponseCache
+try:
+    from nexus_client import NexusClient, BridgeError, AIResponse, AIChat, AddCard, AIBatchResponse, HTTP_URL, WS_URL
+    from nexus_client.client import CONNECT_TIMEOUT, READ_TIMEOUT, RETRIES
+except ImportError:  # aiohttp not installed: plain blocking HTTP chat, no live events
+    NexusClient = None
+    from nexus_http import BlockingNexusClient, HTTP_URL, READ_TIMEOUT
+    WS_URL = os.environ.get("NEXUS_WS_URL", "ws://localhost:3001")
+    CONNECT_TIMEOUT, RETRIES = 3.0, 0
 
-def chat():
+PROMPT = "\n👤 YOU: "
+
+def show_event(event):
+    # Our own replies are already printed inline; everything else arrives live from the bridge
+    if event.mine:
+        return
+    print(f"\n📡 {event.describe()}{PROMPT}", end="", flush=True)
+
+def show_state(connected):
+    status = "🟢 live events connected" if connected else "🔴 live events disconnected (retrying)"
+    print(f"\n{status}{PROMPT}", end="", flush=True)
+
+def banner():
     print("🛡️ ANTIGRAVITY-UNREALENGINE-MAX - NL AGENT BUILDER")
     print("------------------------------------------")
     print("Type your message to the Nexus AI (Type 'quit' to exit)")
-    
+    print("Prefix a message with '!' to skip the response cache")
+
+async def chat(client, stream=True):
+    banner()
+
+    for event_type in (AIResponse, AIChat, AddCard, AIBatchResponse):
+        client.on(event_type, show_event)
+    client.on_state(show_state)
+
     while True:
-        user_input = input("\n👤 YOU: ")
-        
+        try:
+            user_input = await asyncio.to_thread(input, PROMPT)
+        except EOFError:
+            user_input = "quit"
+
         if user_input.lower() in ['quit', 'exit', 'q']:
             print("Shutting down NLP terminal link...")
             break
-            
+
+        use_cache = not user_input.startswith("!")
+        user_input = user_input.lstrip("!")
+
         try:
-            response = requests.post(SERVER_URL, json={
-                "message": user_input,
-                "context": {
-                    "source": "cli",
-                    "system": "Antigravity Nexus V1.0.2"
-                }
-            })
-            
-            if response.status_code == 200:
-                data = response.json()
-                print(f"\n🤖 AI: {data['response']}")
-            else:
-                print(f"\n❌ Error: Server returned {response.status_code}")
-                
+            print("\n🤖 AI: ", end="", flush=True)
+            _, stats = await client.chat(user_input, context={
+                "source": "cli",
+                "system": "Antigravity Nexus V1.0.2"
+            }, on_token=lambda chunk: print(chunk, end="", flush=True), use_cache=use_cache, stream=stream)
+            print(f"\n⏱️ TTFT {stats['ttft'] * 1000:.0f} ms | total {stats['total'] * 1000:.0f} ms"
+                  f"{' | streamed' if stats['streamed'] else ''}{' | ⚡ cached' if stats['cached'] else ''}")
+
+        except BridgeError as e:
+            print(f"\n❌ Error: {e}")
+        except asyncio.TimeoutError:
+            print(f"\n❌ Timed out after {client.timeout.sock_read:.0f}s waiting for the Nexus Bridge.")
         except Exception as e:
             print(f"\n❌ Connection Failed: Is the Nexus Bridge running on port 3002?")
 
+    if client.cache is not None:
+        print(f"📦 Response cache: {client.cache.stats()}")
+
+async def main(opts):
+    cache = None if opts.no_cache else ResponseCache()
+    client = NexusClient(opts.url, opts.ws_url, opts.connect_timeout, opts.read_timeout, opts.retries,
+                         cache=cache, source="cli")
+    async with client:
+        await chat(client, stream=not opts.no_stream)
+    if cache is not None:
+        cache.flush()
+
+def chat_plain(opts):
+    """Blocking chat loop for interpreters without aiohttp"""
+    print("⚠️ aiohttp not installed (pip install aiohttp): plain HTTP, no live bridge events")
+    cache = None if opts.no_cache else ResponseCache()
+    client = BlockingNexusClient(opts.url, opts.read_timeout, source="cli")
+    banner()
+    context = {"source": "cli", "system": "Antigravity Nexus V1.0.2"}
+    while True:
+        try:
+            user_input = input(PROMPT)
+        except EOFError:
+            user_input = "quit"
+        if user_input.lower() in ['quit', 'exit', 'q']:
+            print("Shutting down NLP terminal link...")
+            break
+        use_cache = not user_input.startswith("!")
+        user_input = user_input.lstrip("!")
+        print("\n🤖 AI: ", end="", flush=True)
+        cached = cache.get(user_input, None) if cache is not None and use_cache else None
+        if cached is not None:
+            print(f"{cached}\n⚡ cached")
+            continue
+        try:
+            text, stats = client.chat(user_input, context, lambda chunk: print(chunk, end="", flush=True),
+                                      stream=not opts.no_stream).result()
+            print(f"\n⏱️ TTFT {stats['ttft'] * 1000:.0f} ms | total {stats['total'] * 1000:.0f} ms"
+                  f"{' | streamed' if stats['streamed'] else ''}")
+            if cache is not None and text:
+                cache.put(user_input, None, text)
+        except Exception as e:
+            print(f"\n❌ Connection Failed: Is the Nexus Bridge running on port 3002? ({e})")
+    client.close()
+    if cache is not None:
+        cache.flush()
+        print(f"📦 Response cache: {cache.stats()}")
+
 if __name__ == "__main__":
-    chat()
+    args = argparse.ArgumentParser(description="Terminal chat with the Nexus bridge")
+    args.add_argument("--url", default=os.environ.get("NEXUS_CHAT_URL", HTTP_URL).removesuffix("/chat"))
+    args.add_argument("--ws-url", default=WS_URL)
+    args.add_argument("--connect-timeout", type=float, default=CONNECT_TIMEOUT)
+    args.add_argument("--read-timeout", type=float, default=READ_TIMEOUT)
+    args.add_argument("--retries", type=int, default=RETRIES)
+    args.add_argument("--no-stream", action="store_true", help="always wait for the full response")
+    args.add_argument("--no-cache", action="store_true", help="disable the on-disk response cache")
+    opts = args.parse_args()
+    if NexusClient is None:
+        chat_plain(opts)
+    else:
+        asyncio.run(main(opts))
@@ -0,0 +1,138 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import requests
+
+# Antigravity Nexus WebSocket load test
+# Opens many subscribers against a local bridge, publishes through POST /broadcast and measures fan-out latency
+
+WS_URL = os.environ.get("NEXUS_WS_URL", "ws://localhost:3001")
+HTTP_URL = os.environ.get("NEXUS_HTTP_URL", "http://localhost:3002")
+TOPIC = "loadtest"
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Subscriber:
+    def __init__(self, index, slow=False):
+        self.index = index
+        self.slow = slow
+        self.latencies = []
+        self.frames = 0
+        self.seqs = set()
+
+    def handle(self, raw):
+        self.frames += 1
+        received = time.time() * 1000
+        message = json.loads(raw)
+        events = message["payload"] if message["type"] == "batch" else [message]
+        for event in events:
+            if event["type"] != TOPIC:
+                continue
+            self.seqs.add(event["payload"]["seq"])
+            self.latencies.append(received - event["payload"]["sent"])
+
+
+async def run_subscriber(websockets, sub, opts, ready, done):
+    # Slow clients never read: the client-side queue fills and TCP pushes back on the bridge
+    async with websockets.connect(opts.url, max_queue=1 if sub.slow else 1024, max_size=None) as ws:
+        await ws.send(json.dumps({"type": "subscribe", "topics": [TOPIC], "batch": opts.batch}))
+        json.loads(await ws.recv())  # "subscribed" ack
+        ready.release()
+        if sub.slow:
+            await done.wait()
+            return
+        while not done.is_set():
+            try:
+                raw = await asyncio.wait_for(ws.recv(), timeout=0.25)
+            except asyncio.TimeoutError:
+                continue
+            sub.handle(raw)
+
+
+async def publish(opts, session):
+    interval = 1.0 / opts.rate
+    padding = "x" * opts.payload_bytes
+    start = time.perf_counter()
+    for seq in range(opts.messages):
+        body = {"type": TOPIC, "payload": {"seq": seq, "sent": time.time() * 1000, "pad": padding}}
+        await asyncio.to_thread(session.post, f"{opts.http}/broadcast", json=body, timeout=5)
+        delay = start + (seq + 1) * interval - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def load_test(opts):
+    try:
+        import websockets
+    except ImportError:
+        sys.exit("❌ The load test needs the 'websockets' package (pip install websockets)")
+
+    subscribers = [Subscriber(i, slow=i < opts.slow) for i in range(opts.clients)]
+    ready = asyncio.Semaphore(0)
+    done = asyncio.Event()
+    connect_start = time.perf_counter()
+    tasks = [asyncio.create_task(run_subscriber(websockets, sub, opts, ready, done)) for sub in subscribers]
+    for _ in subscribers:
+        await ready.acquire()
+    connect_ms = (time.perf_counter() - connect_start) * 1000
+    print(f"🔌 {len(subscribers)} clients connected in {connect_ms:.0f} ms ({opts.slow} slow, batch={opts.batch})")
+
+    session = requests.Session()
+    publish_start = time.perf_counter()
+    await publish(opts, session)
+    publish_s = time.perf_counter() - publish_start
+    await asyncio.sleep(opts.settle)
+    done.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    stats = session.get(f"{opts.http}/ws/stats", timeout=5).json()
+    session.close()
+    report(subscribers, opts, publish_s, stats)
+
+
+def report(subscribers, opts, publish_s, stats):
+    readers = [s for s in subscribers if not s.slow]
+    latencies = sorted(l for s in readers for l in s.latencies)
+    expected = opts.messages * len(readers)
+    delivered = sum(len(s.seqs) for s in readers)
+    frames = sum(s.frames for s in readers)
+
+    print(f"📤 Published {opts.messages} messages in {publish_s:.2f}s ({opts.messages / publish_s:.0f}/s)")
+    print(f"📥 Delivered {delivered}/{expected} to healthy clients "
+          f"({delivered / expected * 100 if expected else 100:.1f}%) in {frames} frames")
+    if latencies:
+        print(f"⏱️ Fan-out latency ms: p50 {percentile(latencies, 50):.1f} | p95 {percentile(latencies, 95):.1f} | "
+              f"p99 {percentile(latencies, 99):.1f} | max {latencies[-1]:.1f}")
+    print(f"🌉 Bridge: {stats}")
+    if opts.json:
+        print(json.dumps({
+            "clients": len(subscribers), "slow": opts.slow, "messages": opts.messages, "delivered": delivered,
+            "expected": expected, "frames": frames,
+            "p50": percentile(latencies, 50), "p95": percentile(latencies, 95), "p99": percentile(latencies, 99),
+            "bridge": stats,
+        }))
+
+
+if __name__ == "__main__":
+    args = argparse.ArgumentParser(description="WebSocket fan-out load test for the Nexus bridge")
+    args.add_argument("--url", default=WS_URL)
+    args.add_argument("--http", default=HTTP_URL)
+    args.add_argument("--clients", type=int, default=200)
+    args.add_argument("--slow", type=int, default=0, help="clients that never read (exercise backpressure)")
+    args.add_argument("--messages", type=int, default=500)
+    args.add_argument("--rate", type=float, default=200.0, help="published messages per second")
+    args.add_argument("--payload-bytes", type=int, default=256)
+    args.add_argument("--batch", action="store_true", help="subscribe with per-tick batch frames")
+    args.add_argument("--settle", type=float, default=1.0, help="seconds to wait for stragglers")
+    args.add_argument("--json", action="store_true", help="also print a machine-readable summary")
+    asyncio.run(load_test(args.parse_args()))
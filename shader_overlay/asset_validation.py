@@ -0,0 +1,318 @@
+import os
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from manifest_store import version_key
+from glb_inspect import inspect as inspect_glb
+
+# Antigravity Asset Validation Engine
+# Pluggable per-asset rules, run across a thread pool, reported as JSON or JUnit
+
+ERROR = "error"
+WARNING = "warning"
+
+# Triangle budgets per delivery platform (Khronos / XR guidance for mobile-class GPUs)
+POLY_BUDGETS = {
+    "mobile": 100000,
+    "xr": 100000,
+    "desktop": 1000000,
+}
+DEFAULT_PLATFORMS = ("mobile", "xr")
+
+NANITE_DOMAINS = {"Surface"}
+
+# Allowed relative drift between manifest poly_count and the triangles found in the GLB
+POLY_TOLERANCE = 0.05
+
+
+class Finding:
+    __slots__ = ("rule", "asset_id", "severity", "message")
+
+    def __init__(self, rule, asset_id, severity, message):
+        self.rule = rule
+        self.asset_id = asset_id
+        self.severity = severity
+        self.message = message
+
+    def to_dict(self):
+        return {"rule": self.rule, "asset": self.asset_id, "severity": self.severity, "message": self.message}
+
+
+class StatCache:
+    """os.stat results shared by every worker; each path hits the filesystem once"""
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def stat(self, path):
+        with self._lock:
+            if path in self._stats:
+                self.hits += 1
+                return self._stats[path]
+        try:
+            result = os.stat(path)
+        except OSError:
+            result = None
+        with self._lock:
+            self.misses += 1
+            self._stats[path] = result
+        return result
+
+    def exists(self, path):
+        return self.stat(path) is not None
+
+
+class ValidationContext:
+    def __init__(self, asset_root, platforms=DEFAULT_PLATFORMS, budgets=None, poly_tolerance=POLY_TOLERANCE):
+        self.asset_root = asset_root
+        self.platforms = tuple(platforms)
+        self.budgets = dict(POLY_BUDGETS, **(budgets or {}))
+        self.poly_tolerance = poly_tolerance
+        self.stats = StatCache()
+        self._glb = {}
+        self._glb_lock = threading.Lock()
+
+    def resolve(self, path):
+        return os.path.join(self.asset_root, path)
+
+    def glb_stats(self, path):
+        """Header-only GLB stats, cached per path (shared glTFs are inspected once)"""
+        with self._glb_lock:
+            if path in self._glb:
+                return self._glb[path]
+        try:
+            result = inspect_glb(path)
+        except (OSError, ValueError, KeyError, IndexError) as e:
+            result = e
+        with self._glb_lock:
+            self._glb[path] = result
+        return result
+
+
+# --- Rule registry ---
+
+RULES = {}
+
+
+def rule(name, needs_versions=False):
+    """Register fn(asset, ctx) -> iterable of (severity, message)"""
+    def register(fn):
+        fn.rule_name = name
+        fn.needs_versions = needs_versions
+        RULES[name] = fn
+        return fn
+    return register
+
+
+def _targets(asset):
+    return asset["latest"].get("targets", {})
+
+
+@rule("gltf_exists")
+def check_gltf_exists(asset, ctx):
+    gltf = _targets(asset).get("gltf")
+    if gltf is None:
+        return
+    path = gltf.get("path")
+    if not path:
+        yield ERROR, "glTF target has no path"
+    elif not ctx.stats.exists(ctx.resolve(path)):
+        yield WARNING, f"glTF missing on disk (placeholder): {path}"
+
+
+@rule("glb_polycount")
+def check_glb_polycount(asset, ctx):
+    gltf = _targets(asset).get("gltf")
+    if gltf is None or not gltf.get("path"):
+        return
+    full_path = ctx.resolve(gltf["path"])
+    if not ctx.stats.exists(full_path):
+        return  # gltf_exists reports missing files
+    stats = ctx.glb_stats(full_path)
+    if isinstance(stats, Exception):
+        yield ERROR, f"Unreadable glTF: {stats}"
+        return
+    declared = gltf.get("poly_count")
+    actual = stats["triangles"]
+    if declared is None:
+        yield WARNING, f"No poly_count in manifest (GLB has {actual} triangles)"
+    elif abs(actual - declared) > max(declared, 1) * ctx.poly_tolerance:
+        yield ERROR, f"poly_count drift: manifest {declared}, GLB {actual} triangles ({stats['vertices']} vertices)"
+
+
+@rule("polycount_budget")
+def check_polycount_budget(asset, ctx):
+    gltf = _targets(asset).get("gltf")
+    if gltf is None:
+        return
+    polys = gltf.get("poly_count", 0) or 0
+    for platform in ctx.platforms:
+        budget = ctx.budgets.get(platform)
+        if budget is not None and polys > budget:
+            yield WARNING, f"Polycount ({polys}) exceeds {platform} budget ({budget})"
+
+
+@rule("nanite_lumen")
+def check_nanite_lumen(asset, ctx):
+    unreal = _targets(asset).get("unreal")
+    if unreal is None:
+        return
+    domain = unreal.get("material_domain")
+    if unreal.get("nanite") and domain not in NANITE_DOMAINS:
+        yield ERROR, f"Nanite enabled on unsupported material domain '{domain}'"
+    if unreal.get("nanite") and unreal.get("lumen") is None:
+        yield WARNING, "Nanite mesh has no Lumen setting"
+    if not (unreal.get("asset_path") or "").startswith("/Game/"):
+        yield ERROR, f"Unreal asset_path is not a /Game/ path: {unreal.get('asset_path')}"
+
+
+@rule("spline_url")
+def check_spline_url(asset, ctx):
+    spline = _targets(asset).get("spline")
+    if spline is None:
+        return
+    url = spline.get("url")
+    if not url:
+        yield ERROR, "Spline target has no URL"
+    elif not url.startswith("https://"):
+        yield ERROR, f"Spline URL is not https: {url}"
+    elif "placeholder" in url:
+        yield WARNING, "Spline URL is a placeholder"
+
+
+@rule("version_order", needs_versions=True)
+def check_version_order(asset, ctx):
+    # Convention: versions[0] is the newest, strictly descending after that
+    keys = [version_key(v.get("ver")) for v in asset["versions"]]
+    if len(set(keys)) != len(keys):
+        yield ERROR, "Duplicate version numbers"
+    if any(a <= b for a, b in zip(keys, keys[1:])):
+        yield ERROR, "Versions are not listed newest first"
+
+
+# --- Engine ---
+
+class ValidationReport:
+    def __init__(self, rule_names):
+        self.findings = []
+        self.assets = 0
+        self.seconds = 0.0
+        self.rule_seconds = {name: 0.0 for name in rule_names}
+        self.rule_failures = {name: 0 for name in rule_names}
+
+    def merge(self, findings, assets, rule_seconds):
+        self.findings.extend(findings)
+        self.assets += assets
+        for name, seconds in rule_seconds.items():
+            self.rule_seconds[name] += seconds
+        for finding in findings:
+            self.rule_failures[finding.rule] += 1
+
+    def count(self, severity):
+        return sum(1 for f in self.findings if f.severity == severity)
+
+    @property
+    def passed(self):
+        return self.count(ERROR) == 0
+
+    def to_dict(self):
+        return {
+            "summary": {
+                "assets": self.assets,
+                "errors": self.count(ERROR),
+                "warnings": self.count(WARNING),
+                "seconds": round(self.seconds, 4),
+                "passed": self.passed,
+            },
+            "rules": {
+                name: {"seconds": round(self.rule_seconds[name], 4), "findings": self.rule_failures[name]}
+                for name in self.rule_seconds
+            },
+            "findings": [f.to_dict() for f in self.findings],
+        }
+
+    def to_junit(self):
+        suites = ET.Element("testsuites", name="nexus_asset_validation",
+                            tests=str(len(self.rule_seconds)), time=f"{self.seconds:.4f}")
+        by_rule = {}
+        for finding in self.findings:
+            by_rule.setdefault(finding.rule, []).append(finding)
+
+        for name, seconds in self.rule_seconds.items():
+            findings = by_rule.get(name, [])
+            errors = [f for f in findings if f.severity == ERROR]
+            suite = ET.SubElement(suites, "testsuite", name=name, tests="1",
+                                  failures=str(min(len(errors), 1)), time=f"{seconds:.4f}")
+            case = ET.SubElement(suite, "testcase", classname=name, name=f"{self.assets} assets",
+                                 time=f"{seconds:.4f}")
+            for finding in findings:
+                tag = "failure" if finding.severity == ERROR else "system-out"
+                node = ET.SubElement(case, tag)
+                if tag == "failure":
+                    node.set("message", f"{finding.asset_id}: {finding.message}")
+                node.text = f"[{finding.severity}] {finding.asset_id}: {finding.message}"
+        return ET.tostring(suites, encoding="unicode")
+
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _run_chunk(assets, rules, ctx):
+    findings = []
+    timings = {fn.rule_name: 0.0 for fn in rules}
+    clock = time.perf_counter
+    for asset in assets:
+        for fn in rules:
+            start = clock()
+            for severity, message in fn(asset, ctx):
+                findings.append(Finding(fn.rule_name, asset["id"], severity, message))
+            timings[fn.rule_name] += clock() - start
+    return findings, len(assets), timings
+
+
+def _run_pass(pool, assets, rules, ctx, chunk_size, max_pending, report, count_assets=True):
+    # At most max_pending chunks are decoded and waiting at once, so memory stays O(workers * chunk_size)
+    pending = deque()
+
+    def merge_oldest():
+        findings, assets_seen, timings = pending.popleft().result()
+        report.merge(findings, assets_seen if count_assets else 0, timings)
+
+    for chunk in _chunks(assets, chunk_size):
+        pending.append(pool.submit(_run_chunk, chunk, rules, ctx))
+        if len(pending) >= max_pending:
+            merge_oldest()
+    while pending:
+        merge_oldest()
+
+
+def validate(store, ctx, rules=None, workers=8, chunk_size=500):
+    """Run the selected rules (default: all registered) over every asset in a ManifestStore"""
+    selected = [RULES[name] for name in (rules or RULES)]
+    report = ValidationReport([fn.rule_name for fn in selected])
+    # Version histories are only decoded for the pass that runs the rules needing them
+    plain = [fn for fn in selected if not fn.needs_versions]
+    versioned = [fn for fn in selected if fn.needs_versions]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        if plain:
+            _run_pass(pool, store.iter_assets(), plain, ctx, chunk_size, workers * 2, report)
+        if versioned:
+            _run_pass(pool, store.iter_assets(with_versions=True), versioned, ctx, chunk_size, workers * 2, report,
+                      count_assets=not plain)
+    report.seconds = time.perf_counter() - start
+    return report
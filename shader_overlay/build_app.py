@@ -1,8 +1,17 @@
-import PyInstaller.__main__
+import argparse
+import json
 import os
+import sys
+import time
 
-# Define assets to include
-assets = [
+from resource_pack import PACK_NAME, ENTRY_PAGES, ResourcePack, build_pack, load_closure
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PACK_DIR = os.path.join(ROOT, "build", "pack")
+REPORT_PATH = os.path.join(PACK_DIR, "pack_report.json")
+
+# Pre-pack layout: every page shipped loose whether or not the app can reach it
+LOOSE_ASSETS = [
     ('index.html', '.'),
     ('spline.html', '.'),
     ('snippets.html', '.'),
@@ -22,21 +31,129 @@ assets = [
     ('live_scratchpad.html', '.'),
     ('mobile_sync.html', '.'),
     ('extensions_launcher.html', '.'),
+    ('nexus_asset_manifest.json', '.'),
     ('theme.css', '.'),
     ('three.min.js', '.'),
     ('unreal_asset_thumbnails_1768423247157.png', '.'),
 ]
 
-# Build command parts
-datas = [f"{os.path.abspath(src)}:{dst}" for src, dst in assets]
-icon_path = os.path.abspath("ue_app_icon_1768423980485.png")
-
-PyInstaller.__main__.run([
-    'main.py',
-    '--name=UnrealTacticalSuite',
-    '--windowed',
-    '--noconfirm',
-    '--clean',
-    f'--icon={icon_path}',
-    *[f'--add-data={d}' for d in datas],
-])
+# Read from Python (ManifestStore), so shipped loose alongside the pack
+PYTHON_DATA = [
+    ('nexus_asset_manifest.json', '.'),
+]
+
+LOAD_RUNS = 20
+
+
+def _size(rel):
+    return os.path.getsize(os.path.join(ROOT, rel))
+
+
+def time_loose(files):
+    """ms to read files straight from disk, best of LOAD_RUNS"""
+    best = None
+    for _ in range(LOAD_RUNS):
+        start = time.perf_counter()
+        for rel in files:
+            with open(os.path.join(ROOT, rel), "rb") as f:
+                f.read()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def time_packed(pack_path, files):
+    """ms to open the pack and serve files through a cold LRU, best of LOAD_RUNS"""
+    best = None
+    for _ in range(LOAD_RUNS):
+        start = time.perf_counter()
+        pack = ResourcePack(pack_path)
+        for rel in files:
+            pack.get(rel)
+        elapsed = (time.perf_counter() - start) * 1000
+        pack.close()
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def report(summary, pack_path):
+    graph = summary["graph"]
+    loose_files = [src for src, _ in LOOSE_ASSETS if os.path.exists(os.path.join(ROOT, src))]
+    loose_bytes = sum(_size(rel) for rel in loose_files)
+    shipped_bytes = summary["pack_bytes"] + sum(_size(src) for src, _ in PYTHON_DATA)
+    pages = {}
+    for page in ENTRY_PAGES:
+        files = load_closure(graph, page)
+        # The old layout never shipped the entry pages themselves; time them from the source tree
+        pages[page] = {
+            "files": files,
+            "loose_bytes": sum(_size(rel) for rel in files),
+            "loose_ms": round(time_loose(files), 3),
+            "packed_ms": round(time_packed(pack_path, files), 3),
+        }
+    return {
+        "loose": {"files": len(loose_files), "bytes": loose_bytes},
+        "packed": {key: summary[key] for key in ("files", "blobs", "raw_bytes", "minified_bytes", "unique_bytes",
+                                                 "pack_bytes")},
+        "shipped_bytes": shipped_bytes,
+        "dropped": sorted(set(loose_files) - set(graph) - {src for src, _ in PYTHON_DATA}),
+        "added": sorted(set(graph) - set(loose_files)),
+        "first_load": pages,
+    }
+
+
+def print_report(data):
+    loose, packed = data["loose"], data["packed"]
+    kb = lambda n: f"{n / 1024:,.1f} KB"
+    print("📦 Resource pack")
+    print(f"   loose layout : {loose['files']} files, {kb(loose['bytes'])}")
+    print(f"   packed       : {packed['files']} files in {packed['blobs']} blobs, "
+          f"{kb(packed['raw_bytes'])} -> {kb(packed['minified_bytes'])} minified -> {kb(packed['pack_bytes'])} compressed")
+    print(f"   shipped      : {kb(data['shipped_bytes'])} ({data['shipped_bytes'] / max(loose['bytes'], 1):.0%} of loose)")
+    if data["dropped"]:
+        print(f"   dropped (unreachable): {', '.join(data['dropped'])}")
+    if data["added"]:
+        print(f"   added (referenced, was missing): {', '.join(data['added'])}")
+    for page, load in data["first_load"].items():
+        print(f"   first load {page}: {len(load['files'])} files, {kb(load['loose_bytes'])}, "
+              f"loose {load['loose_ms']:.2f} ms vs packed {load['packed_ms']:.2f} ms (read + decompress, warm OS cache)")
+
+
+def build(opts):
+    if opts.loose:
+        datas = [f"{os.path.join(ROOT, src)}{os.pathsep}{dst}" for src, dst in LOOSE_ASSETS]
+    else:
+        pack_path = os.path.join(PACK_DIR, PACK_NAME)
+        summary = build_pack(ROOT, pack_path, extra=opts.keep, do_minify=not opts.no_minify)
+        data = report(summary, pack_path)
+        with open(REPORT_PATH, "w") as f:
+            json.dump(data, f, indent=2)
+        print_report(data)
+        print(f"   report written to {REPORT_PATH}")
+        datas = [f"{pack_path}{os.pathsep}."]
+        datas += [f"{os.path.join(ROOT, src)}{os.pathsep}{dst}" for src, dst in PYTHON_DATA]
+    if opts.pack_only:
+        return
+
+    import PyInstaller.__main__
+    icon_path = os.path.join(ROOT, "ue_app_icon_1768423980485.png")
+    PyInstaller.__main__.run([
+        os.path.join(ROOT, 'main.py'),
+        '--name=UnrealTacticalSuite',
+        '--windowed',
+        '--noconfirm',
+        '--clean',
+        f'--icon={icon_path}',
+        *[f'--add-data={d}' for d in datas],
+    ])
+
+
+if __name__ == "__main__":
+    args = argparse.ArgumentParser(description="Build the Unreal Tactical Suite bundle")
+    args.add_argument("--pack-only", action="store_true", help="build the resource pack and report, skip PyInstaller")
+    args.add_argument("--loose", action="store_true", help="ship pages as loose files (pre-pack layout)")
+    args.add_argument("--no-minify", action="store_true", help="pack files byte-for-byte")
+    args.add_argument("--keep", action="append", default=[], metavar="PAGE",
+                      help="extra entry page to pack even if nothing links to it")
+    opts = args.parse_args()
+    sys.exit(build(opts))
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Antigravity Content Index
+# Persistent content-hash index of an Unreal project, used to pick the cheapest BuildCookRun flags
+
+TRACKED_TREES = ("Source", "Content", "Config", "Plugins")
+# The .uproject (modules, enabled plugins, target settings) is tracked as its own pseudo-tree
+PROJECT_TREE = "Project"
+# Plugins carry both code and content, so any change there forces build AND cook; so does the .uproject
+BUILD_TREES = ("Source", "Plugins", PROJECT_TREE)
+COOK_TREES = ("Content", "Config", "Plugins", PROJECT_TREE)
+IGNORED_DIRS = {"Intermediate", "Binaries", "Saved", "DerivedDataCache", ".git"}
+CHUNK_SIZE = 1 << 20
+INDEX_VERSION = 1
+
+
+def hash_file(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def try_hash(path):
+    """-> digest, or the OSError (vanished or unreadable file) instead of raising out of the pool"""
+    try:
+        return hash_file(path)
+    except OSError as e:
+        return e
+
+
+def walk_files(root):
+    """Yield (path, stat) for every file under root, skipping generated directories"""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in IGNORED_DIRS:
+                            stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry.path, entry.stat(follow_symlinks=False)
+        except OSError:
+            # Missing or unreadable (PermissionError) directories are skipped, not fatal to the scan
+            continue
+
+
+def project_files(project_dir):
+    """(path, stat) of the project's top-level .uproject file(s)"""
+    try:
+        with os.scandir(project_dir) as it:
+            return [(e.path, e.stat()) for e in it if e.name.endswith(".uproject") and e.is_file()]
+    except OSError:
+        return []
+
+
+def tree_of(rel):
+    return rel.split("/", 1)[0] if "/" in rel else PROJECT_TREE
+
+
+class ContentIndex:
+    def __init__(self, project_dir, index_path=None, workers=8):
+        self.project_dir = project_dir
+        self.index_path = index_path or os.path.join(project_dir, "Saved", "NexusContentIndex.json")
+        self.workers = workers
+        self.files = {}        # relpath -> [size, mtime_ns, hash]
+        self.phase_seconds = {}  # last full-run timing per UAT phase
+        self.last_total = None
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        self.files = data.get("files", {})
+        self.phase_seconds = data.get("phase_seconds", {})
+        self.last_total = data.get("last_total")
+
+    def save(self, files, phase_seconds=None, total=None):
+        self.files = files
+        if phase_seconds:
+            # Only phases that actually ran update their baseline
+            for name, seconds in phase_seconds.items():
+                if seconds > 0:
+                    self.phase_seconds[name] = seconds
+        if total is not None:
+            self.last_total = total
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "files": self.files,
+                "phase_seconds": self.phase_seconds,
+                "last_total": self.last_total,
+            }, f)
+        os.replace(tmp, self.index_path)
+
+    def scan(self):
+        """Return (files, stats). Only files whose size/mtime moved get re-hashed."""
+        current = {}
+        to_hash = []
+        trees = [walk_files(os.path.join(self.project_dir, tree)) for tree in TRACKED_TREES]
+        for files in [project_files(self.project_dir)] + trees:
+            for path, st in files:
+                rel = os.path.relpath(path, self.project_dir).replace(os.sep, "/")
+                known = self.files.get(rel)
+                # A None digest is a file that could not be read last time: always retry it
+                if known and known[0] == st.st_size and known[1] == st.st_mtime_ns and known[2] is not None:
+                    current[rel] = known
+                else:
+                    current[rel] = [st.st_size, st.st_mtime_ns, None]
+                    to_hash.append((rel, path))
+
+        vanished = unreadable = 0
+        if to_hash:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for (rel, _), digest in zip(to_hash, pool.map(lambda item: try_hash(item[1]), to_hash)):
+                    if isinstance(digest, FileNotFoundError):
+                        # Deleted between the walk and the hash (Content/ churns while the editor runs)
+                        del current[rel]
+                        vanished += 1
+                    elif isinstance(digest, OSError):
+                        # Digest stays None: never equal to a known one, so the change forces a build/cook
+                        unreadable += 1
+                    else:
+                        current[rel][2] = digest
+
+        return current, {"files": len(current), "hashed": len(to_hash), "vanished": vanished,
+                         "unreadable": unreadable}
+
+    def diff(self, current):
+        changed = {tree: [] for tree in TRACKED_TREES + (PROJECT_TREE,)}
+        for rel, entry in current.items():
+            known = self.files.get(rel)
+            if known is None or known[2] != entry[2]:
+                changed[tree_of(rel)].append(rel)
+        for rel in self.files:
+            if rel not in current:
+                changed[tree_of(rel)].append(rel)
+        return changed
+
+    def plan(self, current):
+        """Decide which BuildCookRun stages are needed since the last successful package."""
+        changed = self.diff(current)
+        first_run = not self.files
+        needs_build = first_run or any(changed[t] for t in BUILD_TREES)
+        needs_cook = first_run or any(changed[t] for t in COOK_TREES)
+
+        flags = []
+        skipped = []
+        if needs_build:
+            flags.append("-build")
+        else:
+            skipped.append("build")
+
+        if needs_cook:
+            flags += ["-cook", "-allmaps"]
+            if not first_run:
+                # Only re-cook packages whose dependencies changed
+                flags.append("-iterativecooking")
+        else:
+            flags.append("-skipcook")
+            skipped.append("cook")
+
+        if needs_build or needs_cook:
+            flags += ["-stage", "-pak", "-archive"]
+        else:
+            skipped += ["stage", "pak", "archive"]
+
+        estimated_saving = sum(self.phase_seconds.get(name, 0.0) for name in skipped)
+        return {
+            "first_run": first_run,
+            "changed": {tree: len(paths) for tree, paths in changed.items()},
+            "needs_build": needs_build,
+            "needs_cook": needs_cook,
+            "up_to_date": not (needs_build or needs_cook),
+            "flags": flags,
+            "skipped": skipped,
+            "estimated_saving": round(estimated_saving, 2),
+        }
@@ -0,0 +1,166 @@
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict, deque
+
+# Antigravity C++ Builder
+# Generated classes are queued, written only when their bytes differ from disk, and compiled with ONE
+# debounced Live Coding recompile per batch instead of one per request
+
+DEBOUNCE_SECONDS = 1.5   # quiet time after the last queued class before the batch builds
+MAX_DELAY_SECONDS = 10.0  # a steady stream of classes still builds this often
+REPORTS_KEPT = 50
+CLASS_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+def content_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class SourceTree:
+    """Writes into one Source/<Module> directory, skipping files whose content is already on disk.
+    Disk digests are cached by (mtime_ns, size), so an unchanged file is hashed once, not on every write."""
+
+    def __init__(self, source_dir):
+        self.source_dir = source_dir
+        self._digests = {}  # path -> (mtime_ns, size, digest)
+
+    def path(self, name):
+        return os.path.join(self.source_dir, name)
+
+    def disk_digest(self, path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        cached = self._digests.get(path)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        with open(path, "rb") as f:
+            digest = content_digest(f.read())
+        self._digests[path] = (st.st_mtime_ns, st.st_size, digest)
+        return digest
+
+    def write(self, name, text):
+        """-> True if the file was (re)written, False if disk already had these bytes"""
+        path = self.path(name)
+        data = text.encode("utf-8")
+        digest = content_digest(data)
+        if self.disk_digest(path) == digest:
+            return False
+        # Replace in one step: Live Coding / UBT never sees a half-written file
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        st = os.stat(path)
+        self._digests[path] = (st.st_mtime_ns, st.st_size, digest)
+        return True
+
+
+class CppBatcher:
+    """queue() from the game thread, tick() every frame: once the queue has been quiet for `debounce` seconds,
+    changed files are written and recompile() runs once for everything not yet through a successful recompile.
+    on_report(report) receives the per-batch summary."""
+
+    def __init__(self, source_dir, recompile, on_report=None, debounce=DEBOUNCE_SECONDS,
+                 max_delay=MAX_DELAY_SECONDS, clock=time.perf_counter):
+        self.tree = SourceTree(source_dir)
+        self.recompile = recompile
+        self.on_report = on_report
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.clock = clock
+        self._pending = OrderedDict()  # class name -> (header, source); a newer generation replaces an older one
+        self._first = None
+        self._last = None
+        self._handle = None
+        # Written to disk but not yet through a successful recompile; a later identical write must still build
+        self._uncompiled = set()
+        self.reports = deque(maxlen=REPORTS_KEPT)
+
+    def start(self):
+        import unreal
+        if self._handle is None:
+            self._handle = unreal.register_slate_post_tick_callback(self.tick)
+
+    def stop(self):
+        import unreal
+        if self._handle is not None:
+            unreal.unregister_slate_post_tick_callback(self._handle)
+            self._handle = None
+
+    def queue(self, name, header, source):
+        if not isinstance(name, str) or not CLASS_NAME.fullmatch(name):
+            raise ValueError(f"not a usable class file name: {name!r}")
+        if not isinstance(header, str) or not isinstance(source, str):
+            raise ValueError(f"{name}: header_code and source_code must both be strings")
+        now = self.clock()
+        if not self._pending:
+            self._first = now
+        self._pending.pop(name, None)
+        self._pending[name] = (header, source)
+        self._last = now
+        return len(self._pending)
+
+    def pending(self):
+        return list(self._pending)
+
+    def due_in(self):
+        """Seconds until the queued batch builds, or None when nothing is queued"""
+        if not self._pending:
+            return None
+        due = min(self._last + self.debounce, self._first + self.max_delay)
+        return max(0.0, due - self.clock())
+
+    def tick(self, delta_seconds=0.0):
+        if self._pending and self.due_in() == 0.0:
+            self.flush()
+
+    def flush(self):
+        """Write the queued classes now and recompile if anything is uncompiled. -> report dict (None if idle)"""
+        if not self._pending and not self._uncompiled:
+            return None
+        batch, self._pending = self._pending, OrderedDict()
+        self._first = self._last = None
+        report = {"classes": list(batch), "written": [], "unchanged": [], "compiled": [], "errors": [],
+                  "write_ms": 0.0, "compile_ms": 0.0, "recompiled": False, "ok": True}
+        start = self.clock()
+        for name, (header, source) in batch.items():
+            try:
+                changed = [self.tree.write(f"{name}.h", header), self.tree.write(f"{name}.cpp", source)]
+            except OSError as e:
+                report["errors"].append(f"{name}: {e}")
+                continue
+            report["written" if any(changed) else "unchanged"].append(name)
+        report["write_ms"] = (self.clock() - start) * 1000
+
+        self._uncompiled.update(report["written"])
+        if self._uncompiled:
+            report["compiled"] = sorted(self._uncompiled)
+            start = self.clock()
+            try:
+                self.recompile()
+                report["recompiled"] = True
+                self._uncompiled.clear()
+            except Exception as e:
+                report["errors"].append(f"recompile: {e}")
+            report["compile_ms"] = (self.clock() - start) * 1000
+        report["ok"] = not report["errors"]
+        self.reports.append(report)
+        if self.on_report is not None:
+            self.on_report(report)
+        return report
+
+    def stats(self):
+        built = [r for r in self.reports if r["recompiled"]]
+        return {
+            "queued": len(self._pending),
+            "uncompiled": sorted(self._uncompiled),
+            "batches": len(self.reports),
+            "recompiles": len(built),
+            "classes": sum(len(r["classes"]) for r in self.reports),
+            "unchanged": sum(len(r["unchanged"]) for r in self.reports),
+            "avg_compile_ms": round(sum(r["compile_ms"] for r in built) / len(built), 1) if built else None,
+        }
@@ -0,0 +1,215 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+
+# Antigravity Diagnostics
+# Logging that never blocks the Qt thread (records cross a queue, formatting happens on the writer thread),
+# sampled debug output for hot paths, and opt-in span tracing exported as Chrome trace JSON (chrome://tracing, Perfetto)
+
+LOG_LEVEL = os.environ.get("ANTIGRAVITY_LOG_LEVEL", "INFO").upper()
+LOG_PATH = os.environ.get("ANTIGRAVITY_LOG_FILE")  # optional rotating file next to stderr
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+LOG_FILE_BYTES = 5 * 1024 * 1024
+HOT_SAMPLE_EVERY = 100
+HOT_MAX_MESSAGES = 256  # distinct format strings a HotLog keeps counters for
+TRACE_PATH = os.environ.get("ANTIGRAVITY_TRACE")  # set to a .json path to record spans
+TRACE_MAX_EVENTS = 200000
+# Items handed to a later pipeline stage: a relay target with no window never takes its commands back
+TRACE_MAX_DEFERRED = 1000  # per key, oldest dropped
+TRACE_MAX_DEFERRED_KEYS = 64
+
+_listener = None
+_shut_down = False
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves msg % args to the listener thread instead of formatting on the caller"""
+
+    def prepare(self, record):
+        if record.exc_info:
+            # Tracebacks reference live frames; render them while they still exist
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(level=LOG_LEVEL, path=LOG_PATH):
+    """Route the root logger through a queue to a background writer. Idempotent; returns the listener."""
+    global _listener
+    if _listener is not None:
+        return _listener
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler()]
+    if path:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        handlers.append(logging.handlers.RotatingFileHandler(path, maxBytes=LOG_FILE_BYTES, backupCount=3))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    records = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(DeferredQueueHandler(records))
+    root.setLevel(level)
+    _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown)
+    return _listener
+
+
+class HotLog:
+    """Debug logging for per-command paths: costs one level check when debug is off, and only every Nth record
+    per message is emitted when it is on"""
+
+    def __init__(self, logger, every=HOT_SAMPLE_EVERY, max_messages=HOT_MAX_MESSAGES):
+        self.logger = logger
+        self.every = every
+        self.max_messages = max_messages
+        self._seen = OrderedDict()  # format string -> count, LRU so f-string misuse cannot grow it without bound
+
+    def debug(self, msg, *args):
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        seen = self._seen.pop(msg, 0)
+        self._seen[msg] = seen + 1
+        if len(self._seen) > self.max_messages:
+            self._seen.popitem(last=False)
+        if seen % self.every == 0:
+            suffix = f" [sampled 1/{self.every}, #{seen + 1}]" if seen else ""
+            self.logger.debug(msg + suffix, *args)
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = self.tracer.now_us()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.start, cat=self.cat, **self.args)
+        return False
+
+    def set(self, **args):
+        self.args.update(args)
+
+
+class Tracer:
+    """Chrome trace 'complete' events in a bounded buffer. Disabled tracers hand out a shared no-op span."""
+
+    def __init__(self, path=TRACE_PATH, max_events=TRACE_MAX_EVENTS, max_deferred=TRACE_MAX_DEFERRED):
+        self.path = path
+        self.max_deferred = max_deferred
+        self.enabled = bool(path)
+        self.pid = os.getpid()
+        self.events = deque(maxlen=max_events)
+        self._deferred = {}  # key -> deque of items handed from one stage of a pipeline to the next
+        self._threads = {}  # tid -> lane name
+        self._tracks = {}
+        # Epoch-based microseconds, so timestamps taken in the browser (performance.timeOrigin + now()) line up
+        self._epoch0 = time.time()
+        self._perf0 = time.perf_counter()
+
+    def now_us(self):
+        return (self._epoch0 + time.perf_counter() - self._perf0) * 1e6
+
+    def span(self, name, cat="app", **args):
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def complete(self, name, start_us, end_us=None, cat="app", tid=None, **args):
+        if not self.enabled:
+            return
+        if end_us is None:
+            end_us = self.now_us()
+        self.events.append({"name": name, "cat": cat, "ph": "X", "ts": start_us, "dur": max(0.0, end_us - start_us),
+                            "pid": self.pid, "tid": self._track(tid) if tid else self._tid(), "args": args})
+
+    def _track(self, name):
+        # Named lanes (e.g. end-to-end command spans) that do not belong to one thread; small ids never clash
+        # with thread idents
+        tid = self._tracks.get(name)
+        if tid is None:
+            tid = self._tracks[name] = len(self._tracks) + 1
+            self._threads[tid] = name
+        return tid
+
+    def _tid(self):
+        ident = threading.get_ident()
+        if ident not in self._threads:
+            self._threads[ident] = threading.current_thread().name
+        return ident
+
+    def defer(self, key, item):
+        if not self.enabled:
+            return
+        items = self._deferred.get(key)
+        if items is None:
+            if len(self._deferred) >= TRACE_MAX_DEFERRED_KEYS:
+                del self._deferred[next(iter(self._deferred))]
+            items = self._deferred[key] = deque(maxlen=self.max_deferred)
+        items.append(item)
+
+    def take(self, key):
+        return list(self._deferred.pop(key, ())) if self.enabled else []
+
+    def write(self, path=None):
+        path = path or self.path
+        if not path:
+            return None
+        names = [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                 for tid, name in list(self._threads.items())]
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": names + list(self.events), "displayTimeUnit": "ms"}, f)
+        return path
+
+
+tracer = Tracer()
+
+
+def shutdown():
+    global _listener, _shut_down
+    if _shut_down:
+        return
+    _shut_down = True
+    if tracer.enabled and tracer.events:
+        logging.getLogger(__name__).info("🧭 Trace written to %s", tracer.write())
+    if _listener is not None:
+        _listener.stop()
+        # Anything logged after this (late atexit hooks) is written directly instead of queued for nobody
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if isinstance(handler, DeferredQueueHandler):
+                root.removeHandler(handler)
+        for handler in _listener.handlers:
+            root.addHandler(handler)
+        _listener = None
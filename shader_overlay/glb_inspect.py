@@ -0,0 +1,175 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+
+# Antigravity GLB Inspector
+# Reads only the glTF JSON chunk (via mmap) and derives real geometry/texture stats from accessor metadata.
+# The BIN chunk is never touched, so multi-hundred-MB files inspect in constant memory.
+
+GLB_MAGIC = b"glTF"
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+HEADER = struct.Struct("<4sII")
+CHUNK_HEADER = struct.Struct("<II")
+
+# Primitive modes: 4 = TRIANGLES, 5 = TRIANGLE_STRIP, 6 = TRIANGLE_FAN
+TRIANGLE_MODES = {4, 5, 6}
+
+
+class GLBError(ValueError):
+    pass
+
+
+def read_gltf_json(path):
+    """Return the glTF JSON document of a .glb (mmap, JSON chunk only) or .gltf file"""
+    if path.lower().endswith(".gltf"):
+        with open(path, "rb") as f:
+            return json.loads(f.read())
+
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < HEADER.size + CHUNK_HEADER.size:
+            raise GLBError(f"{path}: too small to be a GLB ({size} bytes)")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, version, length = HEADER.unpack_from(mm, 0)
+            if magic != GLB_MAGIC:
+                raise GLBError(f"{path}: bad magic {magic!r}")
+            if version != 2:
+                raise GLBError(f"{path}: unsupported GLB version {version}")
+            if length > size:
+                raise GLBError(f"{path}: header length {length} exceeds file size {size}")
+
+            chunk_len, chunk_type = CHUNK_HEADER.unpack_from(mm, HEADER.size)
+            if chunk_type != CHUNK_JSON:
+                raise GLBError(f"{path}: first chunk is not JSON")
+            start = HEADER.size + CHUNK_HEADER.size
+            if start + chunk_len > size:
+                raise GLBError(f"{path}: JSON chunk overruns the file")
+            # Only the JSON chunk is copied out; the memoryview is released before the map closes
+            with memoryview(mm)[start:start + chunk_len] as view:
+                return json.loads(bytes(view))
+
+
+def _primitive_counts(gltf, primitive):
+    accessors = gltf.get("accessors", [])
+    mode = primitive.get("mode", 4)
+    position = primitive.get("attributes", {}).get("POSITION")
+    vertices = accessors[position]["count"] if position is not None else 0
+
+    indices = primitive.get("indices")
+    n = accessors[indices]["count"] if indices is not None else vertices
+    if mode == 4:
+        triangles = n // 3
+    elif mode in TRIANGLE_MODES:
+        triangles = max(n - 2, 0)
+    else:
+        triangles = 0
+    return triangles, vertices
+
+
+def _image_bytes(gltf, image, base_dir):
+    view = image.get("bufferView")
+    if view is not None:
+        return gltf.get("bufferViews", [])[view].get("byteLength", 0)
+    uri = image.get("uri", "")
+    if uri.startswith("data:"):
+        payload = uri.split(",", 1)[-1]
+        return len(payload) * 3 // 4
+    if uri:
+        try:
+            return os.stat(os.path.join(base_dir, uri)).st_size
+        except OSError:
+            return 0
+    return 0
+
+
+def inspect(path):
+    """Triangle/vertex counts per unique mesh plus texture payload size"""
+    gltf = read_gltf_json(path)
+    triangles = vertices = primitives = 0
+    for mesh in gltf.get("meshes", []):
+        for primitive in mesh.get("primitives", []):
+            t, v = _primitive_counts(gltf, primitive)
+            triangles += t
+            vertices += v
+            primitives += 1
+
+    base_dir = os.path.dirname(path)
+    texture_bytes = sum(_image_bytes(gltf, image, base_dir) for image in gltf.get("images", []))
+    return {
+        "triangles": triangles,
+        "vertices": vertices,
+        "meshes": len(gltf.get("meshes", [])),
+        "primitives": primitives,
+        "images": len(gltf.get("images", [])),
+        "texture_bytes": texture_bytes,
+    }
+
+
+# --- Synthetic fixtures / benchmark ---
+
+def write_synthetic_glb(path, meshes=10, triangles_per_mesh=10000, bin_bytes=1 << 20, images=2):
+    """GLB with realistic accessor metadata and a BIN chunk of bin_bytes (sparse on most filesystems)"""
+    accessors, mesh_list, views = [], [], []
+    for m in range(meshes):
+        accessors.append({"bufferView": 0, "componentType": 5126, "count": triangles_per_mesh // 2 + 2, "type": "VEC3"})
+        accessors.append({"bufferView": 0, "componentType": 5125, "count": triangles_per_mesh * 3, "type": "SCALAR"})
+        mesh_list.append({"primitives": [{"attributes": {"POSITION": 2 * m}, "indices": 2 * m + 1, "mode": 4}]})
+    views.append({"buffer": 0, "byteOffset": 0, "byteLength": bin_bytes // 2})
+    image_list = []
+    for i in range(images):
+        views.append({"buffer": 0, "byteOffset": bin_bytes // 2, "byteLength": bin_bytes // (2 * max(images, 1))})
+        image_list.append({"bufferView": len(views) - 1, "mimeType": "image/png"})
+
+    doc = {
+        "asset": {"version": "2.0", "generator": "antigravity-synthetic"},
+        "buffers": [{"byteLength": bin_bytes}],
+        "bufferViews": views,
+        "accessors": accessors,
+        "meshes": mesh_list,
+        "images": image_list,
+    }
+    body = json.dumps(doc, separators=(",", ":")).encode()
+    body += b" " * (-len(body) % 4)
+    bin_len = bin_bytes + (-bin_bytes % 4)
+    total = HEADER.size + CHUNK_HEADER.size * 2 + len(body) + bin_len
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(GLB_MAGIC, 2, total))
+        f.write(CHUNK_HEADER.pack(len(body), CHUNK_JSON))
+        f.write(body)
+        f.write(CHUNK_HEADER.pack(bin_len, CHUNK_BIN))
+        f.truncate(total)
+    return meshes * triangles_per_mesh
+
+
+def benchmark(sizes_mb=(1, 64, 512), repeat=20):
+    try:
+        import resource
+    except ImportError:
+        resource = None
+
+    print("📐 GLB header inspection benchmark")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_mb in sizes_mb:
+            path = os.path.join(tmp, f"synthetic_{size_mb}mb.glb")
+            expected = write_synthetic_glb(path, meshes=50, triangles_per_mesh=20000, bin_bytes=size_mb << 20)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                stats = inspect(path)
+            per_file = (time.perf_counter() - start) / repeat * 1000
+            assert stats["triangles"] == expected, stats
+            rss = f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024} MB peak RSS" if resource else ""
+            print(f"  {size_mb:>5} MB GLB: {per_file:7.3f} ms/file  {stats['triangles']} tris  {rss}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--bench":
+        benchmark()
+    else:
+        for glb_path in sys.argv[1:]:
+            print(json.dumps({"path": glb_path, **inspect(glb_path)}))
@@ -0,0 +1,234 @@
+import itertools
+import json
+import logging
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from uat_log import PROGRESS_PREFIX
+
+# Antigravity Job Executor
+# Runs host system actions off the Qt main thread and supervises every child process
+
+logger = logging.getLogger(__name__)
+
+# Max concurrent jobs per action (anything not listed is only bounded by the pool)
+DEFAULT_LIMITS = {
+    "build_all": 1,
+    "launch_unreal": 1,
+    "git_sync": 1,
+    "open_vscode": 1,
+}
+
+OUTPUT_EVENT_INTERVAL = 0.25  # seconds between "output" progress events per job
+TAIL_LINES = 50
+HISTORY_SIZE = 100  # finished jobs kept for jobs(); older ones are forgotten
+
+
+class Job:
+    def __init__(self, job_id, action, key, cmd, cwd):
+        self.id = job_id
+        self.action = action
+        self.key = key
+        self.cmd = cmd
+        self.cwd = cwd
+        self.state = "queued"
+        self.pid = None
+        self.returncode = None
+        self.error = None
+        self.queued_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.tail = deque(maxlen=TAIL_LINES)
+        self.process = None
+        self.cancelled = False
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.action,
+            "state": self.state,
+            "pid": self.pid,
+            "returncode": self.returncode,
+            "error": self.error,
+            "queued_at": self.queued_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobExecutor:
+    def __init__(self, on_event, max_workers=4, limits=None, history_size=HISTORY_SIZE):
+        """on_event(dict) is called from worker threads; the caller must hop threads if needed."""
+        self.on_event = on_event
+        self.limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="nexus-job")
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._inflight = {}   # dedup key -> Job (queued or running)
+        self._running = {}    # action -> running count
+        self._waiting = {}    # action -> deque of Jobs held back by the action limit
+        self._jobs = {}       # id -> Job, queued or running only
+        self._history = deque(maxlen=history_size)  # finished/failed/cancelled Jobs, oldest first
+        self._closed = False
+
+    def submit(self, action, cmd, cwd=None, key=None):
+        """Queue a command. Identical in-flight requests return the existing Job."""
+        if key is None:
+            key = json.dumps([action, cmd, cwd])
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("JobExecutor is shut down")
+
+            existing = self._inflight.get(key)
+            if existing is not None:
+                duplicate = existing
+            else:
+                duplicate = None
+                job = Job(next(self._ids), action, key, cmd, cwd)
+                self._jobs[job.id] = job
+                self._inflight[key] = job
+                if self._has_slot(action):
+                    self._start(job)
+                else:
+                    self._waiting.setdefault(action, deque()).append(job)
+
+        if duplicate is not None:
+            self._emit(duplicate, "duplicate")
+            return duplicate
+
+        if job.state == "queued":
+            self._emit(job, "queued")
+        return job
+
+    def cancel(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.state not in ("queued", "running"):
+                return False
+            job.cancelled = True
+            waiting = self._waiting.get(job.action)
+            if job.state == "queued" and waiting and job in waiting:
+                waiting.remove(job)
+                self._finish(job, "cancelled")
+                removed = True
+            else:
+                removed = False
+            process = job.process
+
+        if removed:
+            self._emit(job, "cancelled")
+        elif process is not None:
+            process.terminate()
+        return True
+
+    def jobs(self):
+        with self._lock:
+            jobs = sorted(itertools.chain(self._history, self._jobs.values()), key=lambda job: job.id)
+            return [job.to_dict() for job in jobs]
+
+    def shutdown(self, wait=False):
+        with self._lock:
+            self._closed = True
+            for waiting in self._waiting.values():
+                for job in waiting:
+                    self._finish(job, "cancelled")
+            self._waiting.clear()
+            running = [job.process for job in self._jobs.values() if job.state == "running" and job.process]
+        for process in running:
+            process.terminate()
+        self.pool.shutdown(wait=wait)
+
+    # --- internals (caller holds the lock unless noted) ---
+
+    def _has_slot(self, action):
+        limit = self.limits.get(action)
+        return limit is None or self._running.get(action, 0) < limit
+
+    def _start(self, job):
+        job.state = "running"
+        self._running[job.action] = self._running.get(job.action, 0) + 1
+        self.pool.submit(self._run, job)
+
+    def _finish(self, job, state):
+        job.state = state
+        job.finished_at = time.time()
+        if self._inflight.get(job.key) is job:
+            del self._inflight[job.key]
+        if self._jobs.pop(job.id, None) is not None:
+            self._history.append(job)
+
+    def _run(self, job):
+        # Worker thread: spawn, stream, reap. Never touches Qt.
+        job.started_at = time.time()
+        self._emit(job, "started")
+        state = "failed"
+        try:
+            job.process = subprocess.Popen(
+                job.cmd, cwd=job.cwd,
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL, text=True, errors="replace",
+            )
+            job.pid = job.process.pid
+            if job.cancelled:
+                job.process.terminate()
+
+            last_event = 0.0
+            for line in job.process.stdout:
+                if line.startswith(PROGRESS_PREFIX):
+                    # Already throttled by the child, forward as-is
+                    try:
+                        progress = json.loads(line[len(PROGRESS_PREFIX):])
+                    except ValueError:
+                        progress = None  # truncated/garbled event: keep it as plain output
+                    if progress is not None:
+                        self._emit(job, "progress", progress=progress)
+                        continue
+                job.tail.append(line.rstrip("\n"))
+                now = time.monotonic()
+                if now - last_event >= OUTPUT_EVENT_INTERVAL:
+                    last_event = now
+                    self._emit(job, "output", line=job.tail[-1])
+
+            job.returncode = job.process.wait()
+            if job.cancelled:
+                state = "cancelled"
+            elif job.returncode == 0:
+                state = "finished"
+        except Exception as e:
+            job.error = str(e)
+            logger.error(f"Job {job.id} ({job.action}) failed to run: {e}")
+            # Never report a job as over while its child is still running
+            if job.process is not None and job.process.poll() is None:
+                job.process.terminate()
+                try:
+                    job.returncode = job.process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    job.process.kill()
+                    job.returncode = job.process.wait()
+        finally:
+            if job.process is not None and job.process.stdout:
+                job.process.stdout.close()
+            job.process = None
+            self._complete(job, state)
+
+    def _complete(self, job, state):
+        with self._lock:
+            self._finish(job, state)
+            self._running[job.action] -= 1
+            waiting = self._waiting.get(job.action)
+            if waiting and not self._closed and self._has_slot(job.action):
+                self._start(waiting.popleft())
+
+        self._emit(job, state, tail=list(job.tail)[-5:])
+
+    def _emit(self, job, event, **extra):
+        payload = job.to_dict()
+        payload["event"] = event
+        payload.update(extra)
+        try:
+            self.on_event(payload)
+        except Exception as e:
+            logger.error(f"Job event handler failed: {e}")
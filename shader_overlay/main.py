@@ -1,16 +1,49 @@
+import time
+PROCESS_T0 = time.perf_counter()  # startup trace origin: before the heavy Qt imports
+
 import sys
 import os
 import logging
-import subprocess
 import json
-from PySide6.QtCore import Qt, QUrl, QObject, Slot, Signal
+from PySide6.QtCore import Qt, QUrl, QObject, Slot, Signal, QTimer, QBuffer, QByteArray, QIODevice
 from PySide6.QtWidgets import QApplication, QMainWindow
+from PySide6.QtWebEngineCore import (QWebEnginePage, QWebEngineProfile, QWebEngineUrlScheme,
+                                     QWebEngineUrlSchemeHandler, QWebEngineUrlRequestJob)
 from PySide6.QtWebEngineWidgets import QWebEngineView
 from PySide6.QtWebChannel import QWebChannel
+from relay_queue import RelayQueue, FRAME_MS, batch_script
+from job_executor import JobExecutor
+from manifest_store import ManifestStore
+from startup_trace import StartupTrace, FIRST_PAINT_JS
+from resource_pack import ResourcePack, PACK_NAME
+from telemetry import TelemetryStore, CsvReplay, SAMPLES_EVENT
+import diagnostics
+from diagnostics import HotLog, tracer
+try:
+    from nexus_client import ThreadedNexusClient, ThreadedRemoteControl
+except ImportError:  # aiohttp not installed: the overlay runs without the shared bridge client
+    ThreadedNexusClient = ThreadedRemoteControl = None
 
-# Setup Logging
-logging.basicConfig(level=logging.DEBUG)
+# Setup Logging: queued to a writer thread, level from ANTIGRAVITY_LOG_LEVEL (spans: ANTIGRAVITY_TRACE=<file.json>)
+diagnostics.setup_logging()
 logger = logging.getLogger(__name__)
+hot_log = HotLog(logger)
+
+# eager: both windows at once | background: controller first, editor right after its first paint
+# lazy: editor only when something targets it
+STARTUP_MODE = os.environ.get("ANTIGRAVITY_STARTUP", "background")
+WEB_STORAGE = os.path.join(os.path.expanduser("~"), ".antigravity", "webengine")
+HTTP_CACHE_BYTES = 64 * 1024 * 1024
+PAINT_POLL_MS = 50
+PAINT_POLL_LIMIT = 100
+# Host-generated chatter that should not wake a lazily created editor on its own
+PASSIVE_ACTIONS = frozenset(["show_status", "job_event", "nexus_event"])
+PASSIVE_BACKLOG = 32
+# Pages come from the packed bundle (build_app.py) when there is one, loose files otherwise
+PACK_SCHEME = b"nexus"
+PACK_HOST = "app"
+# Telemetry reaches the controller at most this often, however fast samples arrive
+TELEMETRY_PUSH_MS = 250
 
 def resource_path(relative_path):
     try:
@@ -18,16 +51,69 @@ def resource_path(relative_path):
     except Exception:
         base_path = os.path.dirname(os.path.abspath(__file__))
     res = os.path.join(base_path, relative_path)
-    logger.debug(f"Resolved resource path: {res}")
+    hot_log.debug("Resolved resource path: %s", res)
     return res
 
 class CommandBridge(QObject):
     # Signal to relay commands to other windows
-    relay_cmd = Signal(str, str) # window_target, command_json
+    relay_cmd = Signal(str, str) # window_target, batch_json (JSON array of commands)
+    # Job events arrive on worker threads; this signal hops them onto the Qt main thread
+    job_event = Signal(str)
+    # Nexus bridge events/replies arrive on the client loop thread; same hop
+    nexus_event = Signal(str)
+    # Pages ask the host to open a window that may not exist yet (lazy startup)
+    window_requested = Signal(str)
+
+    def __init__(self):
+        super().__init__()
+        # Coalesce relay traffic and flush once per frame
+        self.relay_queue = RelayQueue()
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(FRAME_MS)
+        self.flush_timer.timeout.connect(self.flush_relay)
+
+        # Supervised host processes (spawn + pipe reads happen on worker threads)
+        self.executor = JobExecutor(lambda event: self.job_event.emit(json.dumps(event)))
+        self.job_event.connect(self.on_job_event)
+
+        # Asset manifest index, opened on first query
+        self.manifest_store = None
+
+        # One pooled connection to the Nexus bridge for every page, with live WebSocket events
+        self.nexus_event.connect(self.on_nexus_event)
+        self.nexus = None
+        self.nexus_tickets = 0
+        if ThreadedNexusClient is not None:
+            self.nexus = ThreadedNexusClient(source="antigravity_overlay")
+            for topic in ("ai_*", "add_card"):
+                self.nexus.on(topic, lambda event: self.nexus_event.emit(json.dumps(event.to_dict())))
+            self.nexus.on_state(lambda connected: self.nexus_event.emit(
+                json.dumps({"type": "bridge_state", "payload": {"connected": connected}})))
+        else:
+            logger.warning("aiohttp not installed: Nexus bridge events disabled")
+
+        # Remote Control connection to a running editor, opened by the first "unreal" command
+        self.unreal = None
+
+        # Engine telemetry: sample batches from the editor (or a CSV replay) land in a ring buffer on any thread;
+        # the controller gets a downsampled snapshot on a fixed timer
+        self.telemetry = TelemetryStore()
+        self.telemetry_replay = None
+        self.telemetry_pushed = 0
+        if self.nexus is not None:
+            self.nexus.on(SAMPLES_EVENT, lambda event: self.telemetry.ingest_many(event.payload.get("samples", [])))
+        if os.environ.get("ANTIGRAVITY_TELEMETRY_CSV"):
+            self.replay_telemetry(os.environ["ANTIGRAVITY_TELEMETRY_CSV"], 1.0)
+        self.telemetry_timer = QTimer(self)
+        self.telemetry_timer.setInterval(TELEMETRY_PUSH_MS)
+        self.telemetry_timer.timeout.connect(self.push_telemetry)
+        self.telemetry_timer.start()
 
     @Slot(str, str)
     def call(self, target, command_str):
-        logger.debug(f"Bridge received: {target} -> {command_str}")
+        hot_log.debug("Bridge received: %s -> %s", target, command_str)
+        received = tracer.now_us() if tracer.enabled else None
         
         try:
             cmd_data = json.loads(command_str)
@@ -36,45 +122,334 @@ class CommandBridge(QObject):
             # 1. SYSTEM ACTIONS (Executed on Host)
             if target == "system":
                 self.execute_system_action(action, cmd_data)
+
+            # 2. UNREAL ACTIONS (Remote Control API, batched per frame off the UI thread)
+            elif target == "unreal":
+                self.route_unreal(action, cmd_data)
             
-            # 2. RELAY ACTIONS (Sent to Editor Window for UI/Viewport changes)
+            # 3. RELAY ACTIONS (Sent to Editor Window for UI/Viewport changes)
             else:
-                self.relay_cmd.emit(target, command_str)
+                self.relay(target, action, command_str)
                 
         except Exception as e:
-            logger.error(f"Error processing command: {e}")
+            logger.error("Error processing command: %s", e)
+            return
+
+        if received is not None:
+            self.trace_command(target, action, cmd_data.get("_t"), received)
+
+    def trace_command(self, target, action, sent_ms, received):
+        # JS stamps commands with performance.timeOrigin + now(); the transit is the QWebChannel hop
+        handled = tracer.now_us()
+        sent = sent_ms * 1000 if sent_ms else received
+        tracer.complete("bridge.call", received, handled, cat="bridge", target=target, action=action,
+                        transit_ms=round((received - sent) / 1000, 3))
+        if target in ("system", "unreal"):
+            tracer.complete(f"cmd:{action}", sent, handled, cat="command", tid="commands", target=target)
+        else:
+            # Finished when the window's runJavaScript reports back (WebWindow.run_js)
+            tracer.defer(target, (action, sent, received, handled))
+
+    def route_unreal(self, action, cmd_data):
+        if self.unreal is None:
+            if ThreadedRemoteControl is None:
+                logger.warning("aiohttp not installed: Unreal Remote Control disabled")
+                return
+            self.unreal = ThreadedRemoteControl(on_error=lambda e: logger.warning("⚠️ Unreal Remote Control: %s", e))
+        transaction = bool(cmd_data.get("transaction"))
+        if action == "set_property":
+            self.unreal.set_property(cmd_data["object"], cmd_data["property"], cmd_data.get("value"), transaction)
+        elif action == "call":
+            self.unreal.call(cmd_data["object"], cmd_data["function"], cmd_data.get("parameters"), transaction)
+        else:
+            logger.warning("Unknown unreal action: %s", action)
+
+    def relay(self, target, action, command_str):
+        if self.relay_queue.push(target, action, command_str):
+            self.flush_timer.start()
+
+    @Slot()
+    def flush_relay(self):
+        with tracer.span("relay.flush", cat="bridge") as span:
+            batches = self.relay_queue.drain()
+            span.set(targets=len(batches))
+            for target, batch_json in batches.items():
+                self.relay_cmd.emit(target, batch_json)
+
+    @Slot(result=str)
+    def write_trace(self):
+        """Dump the spans recorded so far (ANTIGRAVITY_TRACE must be set); returns the file path or ''"""
+        return tracer.write() or ""
+
+    @Slot(str)
+    def open_window(self, name):
+        self.window_requested.emit(name)
+
+    @Slot(result=str)
+    def relay_stats(self):
+        return json.dumps(self.relay_queue.stats())
+
+    @Slot(str, float, result=bool)
+    def replay_telemetry(self, path, speed):
+        """Play an Unreal CSV profile (csvprofile) into the telemetry store; speed 0 = as fast as possible"""
+        if not os.path.exists(path):
+            logger.error("❌ Telemetry profile not found: %s", path)
+            return False
+        if self.telemetry_replay is not None:
+            self.telemetry_replay.stop()
+        self.telemetry_replay = CsvReplay(path, self.telemetry, speed).start()
+        logger.info("📈 Replaying telemetry from %s at %sx", path, speed)
+        return True
+
+    @Slot()
+    def push_telemetry(self):
+        if self.telemetry.count == self.telemetry_pushed:
+            return
+        self.telemetry_pushed = self.telemetry.count
+        self.relay("controller", "telemetry", json.dumps({"action": "telemetry", **self.telemetry.snapshot()}))
+
+    @Slot(result=str)
+    def unreal_stats(self):
+        return json.dumps(self.unreal.stats() if self.unreal is not None else {"connected": False})
+
+    @Slot(result=str)
+    def job_stats(self):
+        return json.dumps(self.executor.jobs())
+
+    @Slot(int, result=bool)
+    def cancel_job(self, job_id):
+        return self.executor.cancel(job_id)
+
+    @Slot(str, result=str)
+    def asset_query(self, query_json):
+        """Paginated/filtered manifest slice for asset_explorer.html"""
+        try:
+            query = json.loads(query_json or "{}")
+            if self.manifest_store is None:
+                index_dir = os.path.join(os.path.expanduser("~"), ".antigravity")
+                os.makedirs(index_dir, exist_ok=True)
+                self.manifest_store = ManifestStore(
+                    resource_path("nexus_asset_manifest.json"),
+                    index_path=os.path.join(index_dir, "nexus_asset_manifest.idx.sqlite"))
+            else:
+                self.manifest_store.refresh()
+
+            if query.get("id"):
+                return json.dumps({"item": self.manifest_store.get(query["id"])})
+            if query.get("versions"):
+                return json.dumps({"versions": self.manifest_store.versions(query["versions"])})
+
+            filters = query.get("filters", {})
+            result = self.manifest_store.page(offset=query.get("offset", 0), limit=query.get("limit", 50), **filters)
+            if query.get("offset", 0) == 0:
+                result["meta"] = self.manifest_store.meta
+            return json.dumps(result)
+        except Exception as e:
+            logger.error("Asset query failed: %s", e)
+            return json.dumps({"error": str(e)})
+
+    @Slot(str)
+    def on_job_event(self, event_json):
+        event = json.loads(event_json)
+        logger.info("Job %s (%s): %s", event["id"], event["name"], event["event"])
+        self.relay("editor", "job_event", json.dumps({"action": "job_event", **event}))
+        if event["event"] == "progress":
+            progress = event["progress"]
+            phase = (progress["phase"] or "idle").upper()
+            msg = f"{event['name'].upper()}: {phase} • {progress['warnings']} WARNINGS • {progress['errors']} ERRORS"
+            self.relay("editor", "show_status", json.dumps({"action": "show_status", "msg": msg}))
+        elif event["event"] in ("started", "finished", "failed", "cancelled", "duplicate"):
+            msg = f"{event['name'].upper()}: {event['event'].upper()}"
+            self.relay("editor", "show_status", json.dumps({"action": "show_status", "msg": msg}))
+
+    @Slot(str, result=int)
+    def nexus_chat(self, request_json):
+        """Send {message, context} through the shared client; tokens stream back as 'ai_token' nexus_events
+        and the final reply as 'chat_reply'"""
+        if self.nexus is None:
+            return -1
+        request = json.loads(request_json)
+        self.nexus_tickets += 1
+        ticket = self.nexus_tickets
+        future = self.nexus.chat(request.get("message", ""), request.get("context"), stream=False)
+
+        def done(future):
+            try:
+                text, stats = future.result()
+                payload = {"ticket": ticket, "text": text, "request_id": stats["request_id"],
+                           "ms": round(stats["total"] * 1000)}
+            except Exception as e:
+                payload = {"ticket": ticket, "error": str(e) or type(e).__name__}
+            self.nexus_event.emit(json.dumps({"type": "chat_reply", "payload": payload}))
+        future.add_done_callback(done)
+        return ticket
+
+    @Slot(result=str)
+    def nexus_status(self):
+        if self.nexus is None:
+            return json.dumps({"available": False})
+        return json.dumps({"available": True, "connected": self.nexus.connected, **self.nexus.client.stats})
+
+    @Slot(str)
+    def on_nexus_event(self, event_json):
+        event = json.loads(event_json)
+        hot_log.debug("Nexus event: %s", event["type"])
+        self.relay("editor", "nexus_event", json.dumps({"action": "nexus_event", **event}))
+        if event["type"] == "bridge_state":
+            msg = "NEXUS BRIDGE: CONNECTED" if event["payload"]["connected"] else "NEXUS BRIDGE: OFFLINE"
+            self.relay("editor", "show_status", json.dumps({"action": "show_status", "msg": msg}))
+
+    def shutdown(self):
+        self.executor.shutdown()
+        if self.nexus is not None:
+            self.nexus.close()
+        if self.unreal is not None:
+            self.unreal.close()
+        if self.telemetry_replay is not None:
+            self.telemetry_replay.stop()
+        # Last: stops the log writer thread, so everything above still gets logged
+        diagnostics.shutdown()
 
     def execute_system_action(self, action, data):
-        logger.info(f"Executing System Action: {action}")
+        logger.info("Executing System Action: %s", action)
         
         if action == "open_vscode":
-            subprocess.Popen(["code", "."], cwd=os.getcwd())
+            self.executor.submit(action, ["code", "."], cwd=os.getcwd())
         
         elif action == "launch_unreal":
             editor_path = "/Users/Shared/Epic Games/UE_5.7/Engine/Binaries/Mac/UnrealEditor.app/Contents/MacOS/UnrealEditor"
             project_path = "/Users/joeywalter/Documents/Unreal Projects/MyProject/MyProject.uproject"
-            subprocess.Popen([editor_path, project_path, "-skipcompile"])
+            self.executor.submit(action, [editor_path, project_path, "-skipcompile"])
         
         elif action == "build_all":
             # Launch the real packaging script
-            subprocess.Popen([sys.executable, "package_unreal.py"], cwd=os.getcwd())
+            self.executor.submit(action, [sys.executable, "package_unreal.py", "--events", "--incremental"], cwd=os.getcwd())
         
         elif action == "git_sync":
-            subprocess.Popen(["git", "pull"], cwd=os.getcwd())
+            self.executor.submit(action, ["git", "pull"], cwd=os.getcwd())
             
         elif action == "cook":
             # Simulation of cooking, could link to a real UAT command
             logger.info("Triggering Native Content Cook...")
-            self.relay_cmd.emit("editor", json.dumps({"action": "show_status", "msg": "COOKING CONTENT..."}))
+            self.relay("editor", "show_status", json.dumps({"action": "show_status", "msg": "COOKING CONTENT..."}))
 
         elif action == "open_browser":
             url = data.get("url", "https://github.com")
-            subprocess.Popen(["open", url])
+            self.executor.submit(action, ["open", url])
+
+def register_pack_scheme():
+    """Must run before QApplication exists"""
+    scheme = QWebEngineUrlScheme(PACK_SCHEME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    # Same trust as the file:// pages it replaces: qrc:// qwebchannel.js, fetch() and the localhost bridge keep working
+    flags = (QWebEngineUrlScheme.Flag.SecureScheme | QWebEngineUrlScheme.Flag.LocalScheme
+             | QWebEngineUrlScheme.Flag.LocalAccessAllowed | QWebEngineUrlScheme.Flag.CorsEnabled)
+    fetch_allowed = getattr(QWebEngineUrlScheme.Flag, "FetchApiAllowed", None)  # Qt 6.6+
+    if fetch_allowed is not None:
+        flags |= fetch_allowed
+    scheme.setFlags(flags)
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+def open_pack():
+    path = os.environ.get("ANTIGRAVITY_PACK") or resource_path(PACK_NAME)
+    if os.environ.get("ANTIGRAVITY_LOOSE") or not os.path.exists(path):
+        return None
+    try:
+        return ResourcePack(path)
+    except (OSError, ValueError) as e:
+        logger.error("❌ Resource pack unusable, falling back to loose files: %s", e)
+        return None
 
-class AntigravityEditor(QMainWindow):
-    def __init__(self, bridge):
+class PackSchemeHandler(QWebEngineUrlSchemeHandler):
+    """nexus://app/<path> answered from the resource pack's in-memory LRU"""
+
+    def __init__(self, pack, parent=None):
+        super().__init__(parent)
+        self.pack = pack
+
+    def requestStarted(self, job):
+        found = self.pack.get(job.requestUrl().path())
+        if found is None:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+        data, mime = found
+        # Parented to the job so Qt frees it when the request finishes
+        buffer = QBuffer(job)
+        buffer.setData(QByteArray(data))
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        job.reply(mime.encode(), buffer)
+
+class WebWindow(QMainWindow):
+    """QMainWindow around one page on the shared profile + channel; relayed JS waits until the page has loaded"""
+    first_paint = Signal()
+
+    def __init__(self, shell, name, page_file):
         super().__init__()
-        self.bridge = bridge
+        self.shell = shell
+        self.bridge = shell.bridge
+        self.name = name
+        self.loaded = False
+        self.pending_js = []
+        self.paint_polls = 0
+
+        self.web_view = QWebEngineView()
+        self.web_view.setPage(QWebEnginePage(shell.profile, self.web_view))
+        self.web_view.page().setWebChannel(shell.channel)
+        self.web_view.loadFinished.connect(self.on_load_finished)
+        self.web_view.setUrl(shell.page_url(page_file))
+        self.setCentralWidget(self.web_view)
+        shell.trace.mark(f"{name}.created")
+
+    def run_js(self, script):
+        if self.loaded:
+            self.execute_js(script)
+        else:
+            self.pending_js.append(script)
+
+    def execute_js(self, script):
+        if not tracer.enabled:
+            self.web_view.page().runJavaScript(script)
+            return
+        commands = tracer.take(self.name)
+        issued = tracer.now_us()
+        self.web_view.page().runJavaScript(script, 0, lambda result: self.trace_js(commands, issued))
+
+    def trace_js(self, commands, issued):
+        done = tracer.now_us()
+        tracer.complete("runJavaScript", issued, done, cat="window", window=self.name, commands=len(commands))
+        for action, sent, received, handled in commands:
+            tracer.complete(f"cmd:{action}", sent, done, cat="command", tid="commands", window=self.name,
+                            transit_ms=round((received - sent) / 1000, 3),
+                            queued_ms=round((issued - handled) / 1000, 3),
+                            js_ms=round((done - issued) / 1000, 3))
+
+    def on_load_finished(self, ok):
+        if self.loaded:
+            return
+        self.loaded = True
+        self.shell.trace.mark(f"{self.name}.loaded")
+        for script in self.pending_js:
+            self.execute_js(script)
+        self.pending_js = []
+        self.poll_first_paint()
+
+    def poll_first_paint(self):
+        # Chromium records paint timings shortly after load; poll until they show up
+        self.web_view.page().runJavaScript(FIRST_PAINT_JS, 0, self.on_paint_timing)
+
+    def on_paint_timing(self, paint_json):
+        if self.shell.trace.painted(self.name, paint_json):
+            self.first_paint.emit()
+        elif self.paint_polls < PAINT_POLL_LIMIT:
+            self.paint_polls += 1
+            QTimer.singleShot(PAINT_POLL_MS, self.poll_first_paint)
+        else:
+            self.shell.trace.done(self.name)
+            self.first_paint.emit()
+
+class AntigravityEditor(WebWindow):
+    def __init__(self, shell):
+        super().__init__(shell, "editor", "nexus_hub.html")
         self.setWindowTitle("Antigravity Engine Editor")
         
         # Transparent, Frameless, Always on Top
@@ -83,61 +458,113 @@ class AntigravityEditor(QMainWindow):
         self.setStyleSheet("background-color: #0d1117;")
         
         self.setGeometry(100, 100, 1280, 720)
-        
-        self.web_view = QWebEngineView()
-        self.channel = QWebChannel()
-        self.channel.registerObject("bridge", self.bridge)
-        self.web_view.page().setWebChannel(self.channel)
-        
-        path = resource_path("nexus_hub.html")
-        url = QUrl.fromLocalFile(path)
-        self.web_view.setUrl(url)
-        self.setCentralWidget(self.web_view)
-        
-        # Listen for relay commands targeting 'editor'
-        self.bridge.relay_cmd.connect(self.handle_relay)
 
-    def handle_relay(self, target, cmd_str):
+    def handle_relay(self, target, batch_json):
         if target == "editor":
-            logger.debug(f"Injecting JS into editor: handleEngineCommand({cmd_str})")
-            # Clear escaping for JS execution
-            self.web_view.page().runJavaScript(f"if(typeof handleEngineCommand === 'function') handleEngineCommand({cmd_str});")
+            hot_log.debug("Injecting JS batch into editor: %s", batch_json)
+            # One runJavaScript per frame, regardless of how many commands were queued
+            self.run_js(batch_script(batch_json))
 
-class EngineController(QMainWindow):
-    def __init__(self, bridge):
-        super().__init__()
-        self.bridge = bridge
+class EngineController(WebWindow):
+    def __init__(self, shell):
+        super().__init__(shell, "controller", "engine_controller.html")
         self.setWindowTitle("Antigravity Engine Controller")
         self.setWindowFlags(Qt.WindowType.WindowStaysOnTopHint)
         self.setStyleSheet("background-color: #0d1117;")
         
         screen = QApplication.primaryScreen().geometry()
         self.setGeometry(screen.width() - 450, 60, 400, 850)
-        
-        self.web_view = QWebEngineView()
-        self.channel = QWebChannel()
-        self.channel.registerObject("bridge", self.bridge)
-        self.web_view.page().setWebChannel(self.channel)
 
-        path = resource_path("engine_controller.html")
-        self.web_view.setUrl(QUrl.fromLocalFile(path))
-        self.setCentralWidget(self.web_view)
+class WindowShell(QObject):
+    """Owns the shared web profile/channel and decides when each window is built"""
+
+    def __init__(self, app, bridge, mode=STARTUP_MODE):
+        super().__init__()
+        self.bridge = bridge
+        self.mode = mode
+        windows = ("controller", "editor") if mode != "lazy" else ("controller",)
+        self.trace = StartupTrace(PROCESS_T0, mode, windows)
+        self.trace.mark("qt_ready")
+
+        # One profile = one network stack and one HTTP disk cache for every page
+        self.profile = QWebEngineProfile("antigravity", app)
+        self.profile.setPersistentStoragePath(WEB_STORAGE)
+        self.profile.setCachePath(os.path.join(WEB_STORAGE, "cache"))
+        self.profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+        self.profile.setHttpCacheMaximumSize(HTTP_CACHE_BYTES)
+        self.pack = open_pack()
+        if self.pack is not None:
+            self.pack_handler = PackSchemeHandler(self.pack, self)
+            self.profile.installUrlSchemeHandler(PACK_SCHEME, self.pack_handler)
+            logger.info("📦 Serving pages from %s (%d files)", self.pack.path, len(self.pack.files))
+
+        # One channel serves every page's transport
+        self.channel = QWebChannel(self)
+        self.channel.registerObject("bridge", bridge)
+
+        self.controller = None
+        self.editor = None
+        self.backlog = []
+        bridge.relay_cmd.connect(self.route_relay)
+        bridge.window_requested.connect(self.open_window)
+
+    def page_url(self, page_file):
+        if self.pack is not None and page_file in self.pack:
+            return QUrl(f"{PACK_SCHEME.decode()}://{PACK_HOST}/{page_file}")
+        return QUrl.fromLocalFile(resource_path(page_file))
+
+    def start(self):
+        # Native Engine Controller (The real menus) first: it is what the user reaches for
+        self.controller = EngineController(self)
+        self.controller.show()
+        if self.mode == "eager":
+            self.show_editor()
+        elif self.mode == "background":
+            self.controller.first_paint.connect(lambda: QTimer.singleShot(0, self.show_editor))
+
+    def show_editor(self):
+        # Main 3D Simulator Editor
+        if self.editor is None:
+            self.editor = AntigravityEditor(self)
+            for batch_json in self.backlog:
+                self.editor.handle_relay("editor", batch_json)
+            self.backlog = []
+        self.editor.show()
+        return self.editor
+
+    @Slot(str)
+    def open_window(self, name):
+        if name == "editor":
+            self.show_editor().raise_()
+        elif name == "controller" and self.controller is not None:
+            self.controller.raise_()
+
+    @Slot(str, str)
+    def route_relay(self, target, batch_json):
+        if target == "controller":
+            if self.controller is not None:
+                self.controller.run_js(batch_script(batch_json))
+            return
+        if target != "editor":
+            return
+        if self.editor is None and self.mode == "lazy":
+            if all(cmd.get("action") in PASSIVE_ACTIONS for cmd in json.loads(batch_json)):
+                self.backlog = (self.backlog + [batch_json])[-PASSIVE_BACKLOG:]
+                return
+        self.show_editor().handle_relay(target, batch_json)
 
 if __name__ == "__main__":
     logger.debug("Starting Multi-Window Application Process...")
     os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = "--enable-gpu-rasterization --ignore-gpu-blocklist"
+    register_pack_scheme()
     
     app = QApplication(sys.argv)
     
     # Global Bridge
     bridge = CommandBridge()
     
-    # 1. Main 3D Simulator Editor
-    editor = AntigravityEditor(bridge)
-    editor.show()
-    
-    # 2. Native Engine Controller (The real menus)
-    controller = EngineController(bridge)
-    controller.show()
+    shell = WindowShell(app, bridge)
+    shell.start()
     
+    app.aboutToQuit.connect(bridge.shutdown)
     sys.exit(app.exec())
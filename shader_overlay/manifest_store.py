@@ -0,0 +1,236 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+
+# Antigravity Manifest Store
+# SQLite sidecar index over nexus_asset_manifest.json: O(1) id lookups, filtered pages, lazy versions
+
+SCHEMA_VERSION = "1"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS assets (
+    id TEXT PRIMARY KEY,
+    ord INTEGER NOT NULL,
+    name TEXT,
+    type TEXT,
+    latest_ver TEXT,
+    status TEXT,
+    unreal_path TEXT,
+    nanite INTEGER,
+    poly_count INTEGER,
+    version_count INTEGER,
+    digest TEXT NOT NULL,
+    latest_json TEXT NOT NULL,
+    versions_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_assets_type ON assets(type);
+CREATE INDEX IF NOT EXISTS idx_assets_status ON assets(status);
+CREATE INDEX IF NOT EXISTS idx_assets_unreal_path ON assets(unreal_path);
+CREATE INDEX IF NOT EXISTS idx_assets_nanite ON assets(nanite);
+CREATE INDEX IF NOT EXISTS idx_assets_ord ON assets(ord);
+"""
+
+# Query filter name -> indexed column
+FILTERS = {
+    "type": "type",
+    "status": "status",
+    "asset_path": "unreal_path",
+    "nanite": "nanite",
+}
+
+PAGE_LIMIT_MAX = 500
+
+
+def version_key(ver):
+    """'1.10.2-beta' -> (1, 10, 2); non-numeric parts sort as 0"""
+    return tuple(int(p) if p.isdigit() else 0 for p in re.split(r"[.\-+]", str(ver or ""))[:4])
+
+
+def latest_version(versions):
+    if not versions:
+        return {}
+    return max(versions, key=lambda v: version_key(v.get("ver")))
+
+
+class ManifestStore:
+    def __init__(self, manifest_path, index_path=None):
+        self.manifest_path = manifest_path
+        self.index_path = index_path or manifest_path + ".idx.sqlite"
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(self.index_path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self.last_refresh = None
+        self.refresh()
+
+    # --- index maintenance ---
+
+    def _meta(self, key, default=None):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _source_stamp(self):
+        st = os.stat(self.manifest_path)
+        return f"{SCHEMA_VERSION}:{st.st_size}:{st.st_mtime_ns}"
+
+    def refresh(self):
+        """Re-index if the JSON changed. Only assets whose content moved are rewritten."""
+        with self._lock:
+            stamp = self._source_stamp()
+            if self._meta("source_stamp") == stamp:
+                self.last_refresh = {"rebuilt": False, "upserted": 0, "deleted": 0}
+                return False
+
+            with open(self.manifest_path, "r") as f:
+                data = json.load(f)
+
+            known = {row[0]: (row[1], row[2]) for row in self.db.execute("SELECT id, digest, ord FROM assets")}
+            seen = set()
+            upserts = []
+            reorder = []
+            for ord_, asset in enumerate(data.get("asset_mappings", [])):
+                asset_id = asset.get("id")
+                if asset_id is None or asset_id in seen:
+                    continue
+                seen.add(asset_id)
+                # Versions dominate the payload, so their JSON doubles as the stored history
+                versions_json = json.dumps(asset.get("versions", []), separators=(",", ":"))
+                head = f"{asset_id}|{asset.get('name')}|{asset.get('type')}|"
+                digest = hashlib.blake2b((head + versions_json).encode(), digest_size=16).hexdigest()
+                if known.get(asset_id, (None,))[0] == digest:
+                    if known[asset_id][1] != ord_:
+                        reorder.append((ord_, asset_id))
+                    continue
+                upserts.append(self._row(ord_, asset, digest, versions_json))
+
+            removed = [(asset_id,) for asset_id in known if asset_id not in seen]
+            with self.db:
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO assets VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)", upserts)
+                self.db.executemany("UPDATE assets SET ord = ? WHERE id = ?", reorder)
+                self.db.executemany("DELETE FROM assets WHERE id = ?", removed)
+                self.db.execute("INSERT OR REPLACE INTO meta VALUES ('manifest_meta', ?)",
+                                (json.dumps(data.get("meta", {})),))
+                self.db.execute("INSERT OR REPLACE INTO meta VALUES ('source_stamp', ?)", (stamp,))
+
+            self.last_refresh = {"rebuilt": True, "upserted": len(upserts), "deleted": len(removed)}
+            return True
+
+    def _row(self, ord_, asset, digest, versions_json):
+        versions = asset.get("versions", [])
+        latest = latest_version(versions)
+        targets = latest.get("targets", {})
+        unreal = targets.get("unreal", {})
+        gltf = targets.get("gltf", {})
+        nanite = unreal.get("nanite")
+        return (
+            asset["id"], ord_, asset.get("name"), asset.get("type"),
+            latest.get("ver"), latest.get("status"), unreal.get("asset_path"),
+            None if nanite is None else int(bool(nanite)), gltf.get("poly_count"),
+            len(versions), digest,
+            json.dumps(latest, separators=(",", ":")), versions_json,
+        )
+
+    # --- queries ---
+
+    def _query(self, sql, params=()):
+        # One shared connection, so reads are serialized with refresh()
+        with self._lock:
+            return self.db.execute(sql, params).fetchall()
+
+    @property
+    def meta(self):
+        rows = self._query("SELECT value FROM meta WHERE key = 'manifest_meta'")
+        return json.loads(rows[0][0]) if rows else {}
+
+    def __len__(self):
+        return self._query("SELECT COUNT(*) FROM assets")[0][0]
+
+    def get(self, asset_id):
+        rows = self._query("SELECT * FROM assets WHERE id = ?", (asset_id,))
+        return self._summary(rows[0]) if rows else None
+
+    def latest(self, asset_id):
+        rows = self._query("SELECT latest_json FROM assets WHERE id = ?", (asset_id,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def versions(self, asset_id):
+        """Full version history, only materialized on request"""
+        rows = self._query("SELECT versions_json FROM assets WHERE id = ?", (asset_id,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def _where(self, filters):
+        clauses, params = [], []
+        for key, value in filters.items():
+            if value is None or value == "":
+                continue
+            if key == "search":
+                clauses.append("name LIKE ?")
+                params.append(f"%{value}%")
+                continue
+            column = FILTERS.get(key)
+            if column is None:
+                raise ValueError(f"Unknown manifest filter: {key}")
+            if key == "nanite":
+                value = int(bool(value))
+            clauses.append(f"{column} = ?")
+            params.append(value)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _select(self, offset, limit, filters):
+        where, params = self._where(filters)
+        rows = self._query(f"SELECT * FROM assets{where} ORDER BY ord LIMIT ? OFFSET ?",
+                           params + [limit, offset])
+        return [self._summary(row) for row in rows]
+
+    def count(self, **filters):
+        where, params = self._where(filters)
+        return self._query(f"SELECT COUNT(*) FROM assets{where}", params)[0][0]
+
+    def find(self, offset=0, limit=50, **filters):
+        return self._select(max(0, int(offset)), max(0, min(int(limit), PAGE_LIMIT_MAX)), filters)
+
+    def page(self, offset=0, limit=50, **filters):
+        """Slice for the asset explorer: {'total', 'offset', 'items'}"""
+        return {
+            "total": self.count(**filters),
+            "offset": offset,
+            "items": self.find(offset=offset, limit=limit, **filters),
+        }
+
+    def iter_assets(self, batch=1000, with_versions=False, **filters):
+        """Stream every matching asset summary without loading the whole manifest"""
+        where, params = self._where(filters)
+        # Keyset pagination on ord keeps each batch O(batch) instead of rescanning an OFFSET
+        where = (where + " AND" if where else " WHERE") + " ord > ?"
+        last = -1
+        while True:
+            rows = self._query(f"SELECT * FROM assets{where} ORDER BY ord LIMIT ?", params + [last, batch])
+            if not rows:
+                return
+            for row in rows:
+                yield self._summary(row, with_versions)
+            last = rows[-1]["ord"]
+
+    def _summary(self, row, with_versions=False):
+        nanite = row["nanite"]
+        summary = {
+            "id": row["id"],
+            "name": row["name"],
+            "type": row["type"],
+            "version_count": row["version_count"],
+            "latest": json.loads(row["latest_json"]),
+            "nanite": None if nanite is None else bool(nanite),
+        }
+        if with_versions:
+            summary["versions"] = json.loads(row["versions_json"])
+        return summary
+
+    def close(self):
+        self.db.close()
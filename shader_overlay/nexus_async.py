@@ -0,0 +1,225 @@
+import asyncio
+import concurrent.futures
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from requests import Timeout as RequestsTimeout
+except ImportError:
+    RequestsTimeout = None
+
+# Antigravity Async Nexus Pipeline
+# HTTP round trips run on worker threads; results are applied on the Unreal game thread from a tick callback
+
+MAX_IN_FLIGHT = 2
+DEFAULT_TIMEOUT = 60.0
+TICK_BUDGET_MS = 4.0
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TIMED_OUT = "timed_out"
+
+TIMEOUT_ERRORS = tuple(t for t in (TimeoutError, asyncio.TimeoutError, concurrent.futures.TimeoutError,
+                                   RequestsTimeout) if t is not None)
+_worker = threading.local()  # the NexusRequest a pool thread is currently running
+
+
+class GameThreadDispatcher:
+    """Thread-safe inbox drained from unreal.register_slate_post_tick_callback"""
+
+    def __init__(self, budget_ms=TICK_BUDGET_MS, clock=time.perf_counter):
+        self.budget = budget_ms / 1000.0
+        self.clock = clock
+        self._inbox = queue.SimpleQueue()
+        self._handle = None
+        self.last_tick_ms = 0.0
+        self.max_tick_ms = 0.0
+
+    def start(self):
+        import unreal
+        if self._handle is None:
+            self._handle = unreal.register_slate_post_tick_callback(self.tick)
+
+    def stop(self):
+        import unreal
+        if self._handle is not None:
+            unreal.unregister_slate_post_tick_callback(self._handle)
+            self._handle = None
+
+    def post(self, fn, *args):
+        """Queue fn(*args) for the game thread (callable from any thread)"""
+        self._inbox.put((fn, args))
+
+    def tick(self, delta_seconds=0.0):
+        start = self.clock()
+        # Always run at least one item so a slow callback cannot starve the queue
+        while True:
+            try:
+                fn, args = self._inbox.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fn(*args)
+            except Exception as e:
+                import unreal
+                unreal.log_error(f"❌ Nexus dispatcher callback failed: {e}")
+            if self.clock() - start >= self.budget:
+                break
+        self.last_tick_ms = (self.clock() - start) * 1000.0
+        self.max_tick_ms = max(self.max_tick_ms, self.last_tick_ms)
+
+    def pending(self):
+        return self._inbox.qsize()
+
+
+class NexusRequest:
+    def __init__(self, request_id, message, mode):
+        self.id = request_id
+        self.message = message
+        self.mode = mode
+        self.state = PENDING
+        self.result = None
+        self.error = None
+        self.report = None  # filled in by callbacks that produce a summary (e.g. batches)
+        self.submitted = time.perf_counter()
+        self.finished = None
+        self.future = None
+        self._cancelled = threading.Event()
+        self._cancel_hooks = []
+        self._hooks_lock = threading.Lock()
+
+    def cancel(self):
+        """Drop the result. Queued requests never start; running ones are aborted through their cancel hooks
+        (see wait_result), and anything that still arrives is discarded."""
+        if self.state in (DONE, FAILED, CANCELLED, TIMED_OUT):
+            return False
+        with self._hooks_lock:
+            self._cancelled.set()
+            hooks, self._cancel_hooks = self._cancel_hooks, []
+        for hook in hooks:
+            hook()
+        if self.future is not None and self.future.cancel():
+            self.state = CANCELLED
+            self.finished = time.perf_counter()
+        return True
+
+    def on_cancel(self, hook):
+        """Call hook() when the request is cancelled (right away if it already is)"""
+        with self._hooks_lock:
+            if not self._cancelled.is_set():
+                self._cancel_hooks.append(hook)
+                return
+        hook()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.submitted
+
+    def __repr__(self):
+        return f"<NexusRequest {self.id} {self.mode} {self.state} {self.elapsed:.2f}s>"
+
+
+def current_request():
+    """The NexusRequest whose fetch is running on this worker thread, or None"""
+    return getattr(_worker, "request", None)
+
+
+def wait_result(future, timeout=None):
+    """Worker thread: wait for a concurrent future (e.g. from ThreadedNexusClient) under one overall deadline.
+    Cancelling the current request cancels the future, which aborts the HTTP request, and frees the worker even
+    when the future cannot be cancelled (a blocking fetch already running on another pool)."""
+    request = current_request()
+    settled = threading.Event()
+    future.add_done_callback(lambda f: settled.set())
+    if request is not None:
+        request.on_cancel(lambda: (future.cancel(), settled.set()))
+    if not settled.wait(timeout):
+        future.cancel()
+        raise TimeoutError(f"Nexus request exceeded {timeout:.0f}s")
+    if not future.done():
+        raise concurrent.futures.CancelledError()
+    return future.result()
+
+
+class AsyncNexusClient:
+    def __init__(self, dispatcher, fetch, max_in_flight=MAX_IN_FLIGHT, timeout=DEFAULT_TIMEOUT):
+        """fetch(payload, timeout) -> response text; runs on a worker thread"""
+        self.dispatcher = dispatcher
+        self.fetch = fetch
+        self.timeout = timeout
+        self.pool = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="nexus-http")
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._active = {}
+
+    def submit(self, message, payload, mode, on_done, on_error=None, cached=None, timeout=None, fetch=None):
+        """Start a request. on_done(request, text) / on_error(request, exc) run on the game thread."""
+        request = NexusRequest(next(self._ids), message, mode)
+        with self._lock:
+            self._active[request.id] = request
+
+        if cached is not None:
+            # Cache hits skip the pool but still complete on a tick, like every other result
+            self.dispatcher.post(self._complete, request, cached, None, on_done, on_error)
+            return request
+
+        request.future = self.pool.submit(self._run, request, fetch or self.fetch, payload,
+                                          timeout or self.timeout, on_done, on_error)
+        return request
+
+    def _run(self, request, fetch, payload, timeout, on_done, on_error):
+        # Worker thread: network only, never touches unreal state
+        text, error = None, None
+        if not request.cancelled:
+            request.state = RUNNING
+            _worker.request = request
+            try:
+                text = fetch(payload, timeout)
+            except Exception as e:
+                error = e
+            finally:
+                _worker.request = None
+        self.dispatcher.post(self._complete, request, text, error, on_done, on_error)
+
+    def _complete(self, request, text, error, on_done, on_error):
+        # Game thread
+        with self._lock:
+            self._active.pop(request.id, None)
+        request.finished = time.perf_counter()
+        if request.cancelled:
+            request.state = CANCELLED
+            return
+        if error is not None:
+            request.error = error
+            request.state = TIMED_OUT if isinstance(error, TIMEOUT_ERRORS) else FAILED
+            if on_error:
+                on_error(request, error)
+            return
+        request.result = text
+        request.state = DONE
+        on_done(request, text)
+
+    def active(self):
+        with self._lock:
+            # Requests cancelled before they left the pool queue never reach _complete
+            for request_id in [r.id for r in self._active.values() if r.state == CANCELLED]:
+                del self._active[request_id]
+            return list(self._active.values())
+
+    def cancel_all(self):
+        for request in self.active():
+            request.cancel()
+
+    def shutdown(self):
+        self.cancel_all()
+        self.pool.shutdown(wait=False)
@@ -0,0 +1,4 @@
+from .client import NexusClient, BridgeError, iter_sse, HTTP_URL, WS_URL
+from .events import BridgeEvent, AIResponse, AIChat, AddCard, AIBatchResponse, EVENT_TYPES, parse_event
+from .remote_control import RemoteControlClient, RemoteControlError, RC_HTTP_URL, RC_WS_URL
+from .threaded import ThreadedNexusClient, ThreadedRemoteControl
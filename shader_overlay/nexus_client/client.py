@@ -0,0 +1,354 @@
+import asyncio
+import inspect
+import itertools
+import json
+import logging
+import os
+import random
+import time
+import uuid
+from collections import deque
+
+import aiohttp
+
+from .events import parse_event, topic_of
+
+# One pooled HTTP session (port 3002) + one auto-reconnecting WebSocket (port 3001) per process
+
+HTTP_URL = os.environ.get("NEXUS_HTTP_URL", "http://localhost:3002")
+WS_URL = os.environ.get("NEXUS_WS_URL", "ws://localhost:3001")
+CONNECT_TIMEOUT = 3.0
+READ_TIMEOUT = 120.0
+RETRIES = 3
+BACKOFF = 0.5
+MAX_CONNECTIONS = 4
+RETRY_STATUSES = (500, 502, 503, 504)
+RECONNECT_MIN = 0.5
+RECONNECT_MAX = 15.0
+HEARTBEAT = 20.0
+ISSUED_MEMORY = 256  # request ids remembered for tagging our own broadcasts
+
+logger = logging.getLogger(__name__)
+
+
+class BridgeError(Exception):
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class NexusClient:
+    def __init__(self, http_url=HTTP_URL, ws_url=WS_URL, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                 retries=RETRIES, backoff=BACKOFF, max_connections=MAX_CONNECTIONS, cache=None, source="python"):
+        self.http_url = http_url.rstrip("/")
+        self.ws_url = ws_url
+        self.timeout = aiohttp.ClientTimeout(total=None, sock_connect=connect_timeout, sock_read=read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_connections = max_connections
+        self.cache = cache
+        self.source = source
+        self.client_id = uuid.uuid4().hex[:8]
+        self.connected = False
+        self._session = None
+        self._ws = None
+        self._ws_task = None
+        self._closing = False
+        self._ids = itertools.count(1)
+        self._issued = deque(maxlen=ISSUED_MEMORY)
+        self._handlers = {}  # topic -> [handler(event)]
+        self._server_topics = set()  # what the bridge currently filters on for this socket
+        self._state_handlers = []
+        self.stats = {"requests": 0, "retries": 0, "events": 0, "reconnects": 0, "last_ttft_ms": None}
+
+    async def start(self, events=True):
+        if self._session is None:
+            # +1 so the WebSocket never competes with HTTP for a pooled connection
+            connector = aiohttp.TCPConnector(limit=self.max_connections + 1, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        if events and self._ws_task is None:
+            self._ws_task = asyncio.ensure_future(self._ws_loop())
+        return self
+
+    async def close(self):
+        self._closing = True
+        if self._ws_task is not None:
+            self._ws_task.cancel()
+            try:
+                await self._ws_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._ws_task = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    # --- HTTP ---
+
+    def new_request_id(self):
+        request_id = f"{self.client_id}-{next(self._ids)}"
+        self._issued.append(request_id)
+        return request_id
+
+    async def post_json(self, path, body, timeout=None):
+        """POST with connect/5xx retries; read timeouts are not retried (the generation may still be running)"""
+        async with self._post(path, body, timeout=timeout) as response:
+            if not 200 <= response.status < 300:
+                raise BridgeError(f"Bridge Error: {response.status}", response.status)
+            return await response.json()
+
+    def _post(self, path, body, headers=None, timeout=None):
+        return _RetryingPost(self, f"{self.http_url}{path}", body, headers, timeout)
+
+    async def chat(self, message, context=None, on_token=None, use_cache=True, stream=True, timeout=None):
+        """Returns (text, stats). on_token(chunk) is called as tokens arrive when the bridge streams."""
+        context = dict(context or {})
+        mode = context.get("mode")
+        if self.cache is not None and use_cache:
+            start = time.perf_counter()
+            cached = self.cache.get(message, mode)
+            if cached is not None:
+                if on_token:
+                    on_token(cached)
+                elapsed = time.perf_counter() - start
+                return cached, {"status": 200, "ttft": elapsed, "total": elapsed, "streamed": False,
+                                "cached": True, "request_id": None}
+
+        context.setdefault("source", self.source)
+        context["request_id"] = request_id = self.new_request_id()
+        headers = {"Accept": "text/event-stream, application/json"} if stream else {}
+        start = time.perf_counter()
+        stats = {"status": None, "ttft": None, "total": None, "streamed": False, "cached": False,
+                 "request_id": request_id}
+        body = {"message": message, "context": context, "stream": stream}
+        async with self._post("/chat", body, headers, timeout) as response:
+            stats["status"] = response.status
+            if response.status != 200:
+                raise BridgeError(f"Server returned {response.status}", response.status)
+            if response.content_type == "text/event-stream":
+                stats["streamed"] = True
+                parts = []
+                async for chunk in iter_sse(response):
+                    if stats["ttft"] is None:
+                        stats["ttft"] = time.perf_counter() - start
+                    parts.append(chunk)
+                    if on_token:
+                        on_token(chunk)
+                text = "".join(parts)
+            else:
+                text = (await response.json())["response"]
+                stats["ttft"] = time.perf_counter() - start
+                if on_token:
+                    on_token(text)
+
+        stats["total"] = time.perf_counter() - start
+        if stats["ttft"] is not None:
+            self.stats["last_ttft_ms"] = round(stats["ttft"] * 1000, 1)
+        if self.cache is not None and text:
+            # Opting out of lookups still refreshes the stored answer
+            await asyncio.to_thread(self.cache.put, message, mode, text)
+        return text, stats
+
+    async def chat_batch(self, items, context=None, timeout=None):
+        """[{message, context?}] -> [text | BridgeError] in order; falls back to parallel /chat on older bridges"""
+        try:
+            data = await self.post_json("/chat/batch", {"items": items, "context": context or {}}, timeout)
+        except BridgeError as e:
+            if e.status != 404:
+                raise
+            results = await asyncio.gather(*[
+                self.post_json("/chat", {"message": item["message"], "context": {
+                    **(context or {}), **item.get("context", {}), "request_id": self.new_request_id()}}, timeout)
+                for item in items
+            ], return_exceptions=True)
+            return [r.get("response", "") if isinstance(r, dict) else r for r in results]
+        return [r["response"] if "response" in r else BridgeError(r.get("error", "unknown error"))
+                for r in data["responses"]]
+
+    async def publish(self, type, payload=None):
+        """Broadcast an event to every WebSocket subscriber via the bridge"""
+        return await self.post_json("/broadcast", {"type": type, "payload": payload}, timeout=10)
+
+    # --- WebSocket events ---
+
+    def on(self, event_type, handler):
+        """Call handler(event) for every broadcast of event_type ('ai_response', AIResponse, 'ai_*' or '*').
+        Coroutine handlers are scheduled as tasks. Returns an unsubscribe function."""
+        topic = topic_of(event_type)
+        handlers = self._handlers.setdefault(topic, [])
+        handlers.append(handler)
+        self._resubscribe()
+
+        def unsubscribe():
+            if handler in handlers:
+                handlers.remove(handler)
+            if not handlers:
+                self._handlers.pop(topic, None)
+            self._resubscribe()
+        return unsubscribe
+
+    def on_state(self, handler):
+        """handler(connected: bool) whenever the WebSocket connects or drops"""
+        self._state_handlers.append(handler)
+
+    async def wait_for(self, event_type, predicate=None, timeout=None):
+        """Next event of event_type matching predicate"""
+        future = asyncio.get_running_loop().create_future()
+
+        def handler(event):
+            if not future.done() and (predicate is None or predicate(event)):
+                future.set_result(event)
+        unsubscribe = self.on(event_type, handler)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            unsubscribe()
+
+    def _resubscribe(self):
+        if self._ws is not None and not self._ws.closed:
+            asyncio.ensure_future(self._send_subscription(self._ws))
+
+    async def _send_subscription(self, ws):
+        # Only the topics someone listens to cross the wire; batch frames cut per-event overhead
+        topics = set(self._handlers) or {"*"}
+        removed = self._server_topics - topics
+        self._server_topics = topics
+        try:
+            if removed:
+                await ws.send_str(json.dumps({"type": "unsubscribe", "topics": sorted(removed)}))
+            await ws.send_str(json.dumps({"type": "subscribe", "topics": sorted(topics), "batch": True}))
+        except (aiohttp.ClientError, ConnectionError, RuntimeError) as e:
+            logger.debug(f"Subscription update failed: {e}")
+
+    async def _ws_loop(self):
+        delay = RECONNECT_MIN
+        while not self._closing:
+            try:
+                async with self._session.ws_connect(self.ws_url, heartbeat=HEARTBEAT) as ws:
+                    self._ws = ws
+                    self._server_topics = set()
+                    delay = RECONNECT_MIN
+                    self._set_connected(True)
+                    await self._send_subscription(ws)
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            self._dispatch_frame(msg.data)
+                        elif msg.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED):
+                            break
+            except asyncio.CancelledError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                logger.debug(f"Nexus WebSocket unavailable: {e}")
+            finally:
+                self._ws = None
+                if self._closing:
+                    self.connected = False
+                else:
+                    self._set_connected(False)
+            if self._closing:
+                break
+            self.stats["reconnects"] += 1
+            await asyncio.sleep(delay * (1 + random.random() * 0.2))
+            delay = min(delay * 2, RECONNECT_MAX)
+
+    def _set_connected(self, connected):
+        if connected == self.connected:
+            return
+        self.connected = connected
+        for handler in list(self._state_handlers):
+            try:
+                handler(connected)
+            except Exception as e:
+                logger.error(f"Nexus state handler failed: {e}")
+
+    def _dispatch_frame(self, data):
+        try:
+            message = json.loads(data)
+        except ValueError:
+            return
+        if not isinstance(message, dict):
+            return  # not an event frame; must never take down the reconnect loop
+        messages = message.get("payload") if message.get("type") == "batch" else [message]
+        if not isinstance(messages, list):
+            return
+        for raw in messages:
+            if not isinstance(raw, dict) or raw.get("type") == "subscribed":
+                continue
+            event = parse_event(raw)
+            event.mine = event.request_id is not None and event.request_id in self._issued
+            self.stats["events"] += 1
+            for handler in self._handlers_for(event.type):
+                try:
+                    result = handler(event)
+                    if inspect.isawaitable(result):
+                        asyncio.ensure_future(result)
+                except Exception as e:
+                    logger.error(f"Nexus event handler failed ({event.type}): {e}")
+
+    def _handlers_for(self, event_type):
+        handlers = []
+        for topic, topic_handlers in self._handlers.items():
+            if topic == "*" or topic == event_type or (topic.endswith("*") and event_type.startswith(topic[:-1])):
+                handlers.extend(topic_handlers)
+        return handlers
+
+
+class _RetryingPost:
+    """async with-able POST that retries connect failures and 5xx responses with exponential backoff"""
+
+    def __init__(self, client, url, body, headers, timeout):
+        self.client = client
+        self.url = url
+        self.body = body
+        self.headers = headers
+        self.timeout = None
+        if timeout is not None:
+            self.timeout = aiohttp.ClientTimeout(total=None, sock_connect=client.timeout.sock_connect,
+                                                 sock_read=timeout)
+        self.response = None
+
+    async def __aenter__(self):
+        client = self.client
+        client.stats["requests"] += 1
+        for attempt in range(client.retries + 1):
+            last = attempt == client.retries
+            try:
+                response = await client._session.post(self.url, json=self.body, headers=self.headers,
+                                                      timeout=self.timeout or client.timeout)
+            except aiohttp.ClientConnectorError:
+                if last:
+                    raise
+            else:
+                if response.status not in RETRY_STATUSES or last:
+                    self.response = response
+                    return response
+                response.release()
+            client.stats["retries"] += 1
+            await asyncio.sleep(client.backoff * (2 ** attempt))
+
+    async def __aexit__(self, *exc):
+        if self.response is not None:
+            self.response.release()
+
+
+async def iter_sse(response):
+    """Yield text chunks from a 'data: {...}' server-sent event stream"""
+    # Read to the end of the body (past [DONE]) so the keep-alive connection can be reused
+    async for raw in response.content:
+        line = raw.decode("utf-8", "replace").strip()
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            continue
+        event = json.loads(data)
+        if "error" in event:
+            raise BridgeError(event["error"])
+        if event.get("text"):
+            yield event["text"]
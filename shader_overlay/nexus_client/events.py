@@ -0,0 +1,105 @@
+import time
+
+# Typed views over the bridge's WebSocket broadcasts ({"type": ..., "payload": {...}})
+
+
+class BridgeEvent:
+    type = None
+
+    def __init__(self, type, payload):
+        self.type = type
+        self.payload = payload if payload is not None else {}
+        self.request_id = self.payload.get("request_id") if isinstance(self.payload, dict) else None
+        self.mine = False  # set by the client when request_id is one it issued
+        self.received = time.time()
+
+    def get(self, key, default=None):
+        return self.payload.get(key, default) if isinstance(self.payload, dict) else default
+
+    def describe(self):
+        return f"{self.type}: {self.payload}"
+
+    def to_dict(self):
+        return {"type": self.type, "payload": self.payload, "request_id": self.request_id, "mine": self.mine}
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.type} request_id={self.request_id}>"
+
+
+class AIResponse(BridgeEvent):
+    type = "ai_response"
+
+    @property
+    def text(self):
+        return self.get("text", "")
+
+    @property
+    def original(self):
+        return self.get("original", "")
+
+    def describe(self):
+        return f"AI reply to '{self.original[:40]}': {self.text}"
+
+
+class AIChat(BridgeEvent):
+    type = "ai_chat"
+
+    @property
+    def text(self):
+        return self.get("text", "")
+
+    def describe(self):
+        return f"AI (MCP): {self.text}"
+
+
+class AddCard(BridgeEvent):
+    type = "add_card"
+
+    @property
+    def title(self):
+        return self.get("title", "")
+
+    @property
+    def content(self):
+        return self.get("content", "")
+
+    @property
+    def card_type(self):
+        return self.get("type", "note")
+
+    def describe(self):
+        return f"Card [{self.card_type}] {self.title}: {self.content}"
+
+
+class AIBatchResponse(BridgeEvent):
+    type = "ai_batch_response"
+
+    @property
+    def count(self):
+        return self.get("count", 0)
+
+    @property
+    def failed(self):
+        return self.get("failed", 0)
+
+    @property
+    def ms(self):
+        return self.get("ms", 0)
+
+    def describe(self):
+        return f"Batch of {self.count} answered in {self.ms} ms ({self.failed} failed)"
+
+
+EVENT_TYPES = {cls.type: cls for cls in (AIResponse, AIChat, AddCard, AIBatchResponse)}
+
+
+def topic_of(event_type):
+    """'ai_response', AIResponse or '*' -> subscription topic string"""
+    if isinstance(event_type, type) and issubclass(event_type, BridgeEvent):
+        return event_type.type
+    return str(event_type)
+
+
+def parse_event(message):
+    cls = EVENT_TYPES.get(message.get("type"), BridgeEvent)
+    return cls(message.get("type"), message.get("payload"))
@@ -0,0 +1,301 @@
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import time
+from collections import OrderedDict, deque
+
+import aiohttp
+
+# Unreal Remote Control API (Remote Control plugin, WebControl.StartServer) from outside the editor process.
+# Writes queue per frame, repeated property writes collapse to the newest value, and each frame goes out as ONE
+# /remote/batch request. Over the WebSocket transport batches are pipelined: frame N+1 is sent before N's reply.
+
+RC_HTTP_URL = os.environ.get("UE_RC_HTTP_URL", "http://localhost:30010")
+RC_WS_URL = os.environ.get("UE_RC_WS_URL", "ws://localhost:30020")
+RC_TRANSPORT = os.environ.get("UE_RC_TRANSPORT", "ws")
+FRAME_MS = 16
+MAX_BATCH = 256        # sub-requests per /remote/batch
+MAX_IN_FLIGHT = 8      # pipelined batches awaiting a reply (WebSocket transport)
+REQUEST_TIMEOUT = 10.0
+RECONNECT_MIN = 0.5
+RECONNECT_MAX = 10.0
+RTT_SAMPLES = 256
+
+logger = logging.getLogger(__name__)
+
+
+class RemoteControlError(Exception):
+    def __init__(self, message, status=None, body=None):
+        super().__init__(message)
+        self.status = status
+        self.body = body
+
+
+def property_request(object_path, name, value, transaction=False):
+    return {
+        "URL": "/remote/object/property",
+        "Verb": "PUT",
+        "Body": {
+            "objectPath": object_path,
+            "propertyName": name,
+            "propertyValue": {name: value},
+            "access": "WRITE_TRANSACTION_ACCESS" if transaction else "WRITE_ACCESS",
+        },
+    }
+
+
+def call_request(object_path, function, parameters=None, transaction=False):
+    return {
+        "URL": "/remote/object/call",
+        "Verb": "PUT",
+        "Body": {
+            "objectPath": object_path,
+            "functionName": function,
+            "parameters": parameters or {},
+            "generateTransaction": transaction,
+        },
+    }
+
+
+class _Op:
+    __slots__ = ("request", "futures")
+
+    def __init__(self, request, future):
+        self.request = request
+        self.futures = [future]
+
+
+class RemoteControlClient:
+    """asyncio client. set_property()/call() are plain methods returning futures, cheap enough to call per frame."""
+
+    def __init__(self, http_url=RC_HTTP_URL, ws_url=RC_WS_URL, transport=RC_TRANSPORT, frame_ms=FRAME_MS,
+                 max_batch=MAX_BATCH, max_in_flight=MAX_IN_FLIGHT, timeout=REQUEST_TIMEOUT):
+        if transport not in ("ws", "http"):
+            raise ValueError(f"transport must be 'ws' or 'http', not {transport!r}")
+        self.http_url = http_url.rstrip("/")
+        self.ws_url = ws_url
+        self.transport = transport
+        self.frame = frame_ms / 1000.0
+        self.max_batch = max_batch
+        # Plain HTTP answers in order on one keep-alive connection, so only WebSocket batches overlap
+        self.max_in_flight = max_in_flight if transport == "ws" else 1
+        self.timeout = timeout
+        self._session = None
+        self._ws = None
+        self._ws_task = None
+        self._ws_ready = None
+        self._pending = OrderedDict()  # ("prop", path, name) | ("call", seq) -> _Op
+        self._seq = itertools.count(1)
+        self._ids = itertools.count(1)
+        self._replies = {}  # batch id -> future(response dict), WebSocket transport
+        self._slots = None
+        self._flush_handle = None
+        self._flushing = set()
+        self._closing = False
+        self._rtt = deque(maxlen=RTT_SAMPLES)
+        self.stats_counters = {"ops": 0, "coalesced": 0, "batches": 0, "sent_ops": 0, "errors": 0, "reconnects": 0}
+
+    async def start(self):
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_in_flight + 1, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(
+                total=None, sock_connect=3.0, sock_read=self.timeout))
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+        if self.transport == "ws" and self._ws_task is None:
+            self._ws_ready = asyncio.Event()
+            self._ws_task = asyncio.ensure_future(self._ws_loop())
+        return self
+
+    async def close(self):
+        self._closing = True
+        if self._pending:
+            await self.flush()
+        if self._flushing:
+            await asyncio.wait(list(self._flushing), timeout=self.timeout)
+        if self._ws_task is not None:
+            self._ws_task.cancel()
+            try:
+                await self._ws_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._ws_task = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    # --- Queueing (loop thread) ---
+
+    def set_property(self, object_path, name, value, transaction=False):
+        """Write object_path.name = value on the next frame; a newer write in the same frame replaces it"""
+        key = ("prop", object_path, name)
+        future = asyncio.get_running_loop().create_future()
+        op = self._pending.pop(key, None)
+        if op is not None:
+            # Last write wins and moves to the end, so it lands after anything queued since
+            self.stats_counters["coalesced"] += 1
+            op.request = property_request(object_path, name, value, transaction)
+            op.futures.append(future)
+        else:
+            op = _Op(property_request(object_path, name, value, transaction), future)
+        self._pending[key] = op
+        self._queued()
+        return future
+
+    def call(self, object_path, function, parameters=None, transaction=False):
+        """Call a BlueprintCallable function on the next frame; calls are never merged"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending[("call", next(self._seq))] = _Op(call_request(object_path, function, parameters, transaction),
+                                                        future)
+        self._queued()
+        return future
+
+    def _queued(self):
+        self.stats_counters["ops"] += 1
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.frame, self._flush_soon)
+        elif len(self._pending) >= self.max_batch:
+            self._flush_handle.cancel()
+            self._flush_soon()
+
+    def _flush_soon(self):
+        self._flush_handle = None
+        task = asyncio.ensure_future(self.flush())
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def flush(self):
+        """Send everything queued so far, MAX_BATCH sub-requests per batch"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        ops = list(self._pending.values())
+        self._pending.clear()
+        sends = []
+        for start in range(0, len(ops), self.max_batch):
+            chunk = ops[start:start + self.max_batch]
+            # Taking the slot before the next chunk keeps batches on the wire in queue order
+            await self._slots.acquire()
+            sends.append(asyncio.ensure_future(self._send(chunk)))
+        if sends:
+            await asyncio.gather(*sends)
+
+    async def _send(self, ops):
+        requests = [dict(op.request, RequestId=index) for index, op in enumerate(ops)]
+        started = time.perf_counter()
+        self.stats_counters["batches"] += 1
+        self.stats_counters["sent_ops"] += len(ops)
+        try:
+            if self.transport == "ws":
+                responses = await self._send_ws({"Requests": requests})
+            else:
+                responses = await self._send_http({"Requests": requests})
+        except Exception as e:
+            self.stats_counters["errors"] += len(ops)
+            error = e if isinstance(e, RemoteControlError) else RemoteControlError(f"Remote Control batch failed: {e}")
+            for op in ops:
+                for future in op.futures:
+                    if not future.done():
+                        future.set_exception(error)
+            return
+        finally:
+            self._slots.release()
+        self._rtt.append((time.perf_counter() - started) * 1000)
+        by_id = {r.get("RequestId"): r for r in responses if isinstance(r, dict)}
+        for index, op in enumerate(ops):
+            response = by_id.get(index, {"ResponseCode": 0, "ResponseBody": "missing from batch reply"})
+            code = response.get("ResponseCode", 0)
+            for future in op.futures:
+                if future.done():
+                    continue
+                if 200 <= code < 300:
+                    future.set_result(response.get("ResponseBody"))
+                else:
+                    self.stats_counters["errors"] += 1
+                    future.set_exception(RemoteControlError(f"Remote Control {op.request['URL']} -> {code}",
+                                                            code, response.get("ResponseBody")))
+
+    async def _send_http(self, batch):
+        async with self._session.put(f"{self.http_url}/remote/batch", json=batch) as response:
+            if response.status != 200:
+                raise RemoteControlError(f"Remote Control batch -> {response.status}", response.status,
+                                         await response.text())
+            return (await response.json(content_type=None)).get("Responses", [])
+
+    async def _send_ws(self, batch):
+        await asyncio.wait_for(self._ws_ready.wait(), self.timeout)
+        batch_id = next(self._ids)
+        reply = asyncio.get_running_loop().create_future()
+        self._replies[batch_id] = reply
+        try:
+            await self._ws.send_str(json.dumps({"MessageName": "http", "Parameters": {
+                "RequestId": batch_id, "Url": "/remote/batch", "Verb": "PUT", "Body": batch}}))
+            response = await asyncio.wait_for(reply, self.timeout)
+        finally:
+            self._replies.pop(batch_id, None)
+        if response.get("ResponseCode") != 200:
+            raise RemoteControlError(f"Remote Control batch -> {response.get('ResponseCode')}",
+                                     response.get("ResponseCode"), response.get("ResponseBody"))
+        return (response.get("ResponseBody") or {}).get("Responses", [])
+
+    async def _ws_loop(self):
+        delay = RECONNECT_MIN
+        while not self._closing:
+            try:
+                async with self._session.ws_connect(self.ws_url, heartbeat=20.0, max_msg_size=0) as ws:
+                    self._ws = ws
+                    self._ws_ready.set()
+                    delay = RECONNECT_MIN
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            self._on_reply(msg.data)
+                        elif msg.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED):
+                            break
+            except asyncio.CancelledError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                logger.debug(f"Remote Control WebSocket unavailable: {e}")
+            finally:
+                self._ws_ready.clear()
+                self._ws = None
+                # Pipelined batches on the dead socket will never be answered
+                for reply in self._replies.values():
+                    if not reply.done():
+                        reply.set_exception(RemoteControlError("Remote Control WebSocket closed"))
+            if self._closing:
+                break
+            self.stats_counters["reconnects"] += 1
+            await asyncio.sleep(delay * (1 + random.random() * 0.2))
+            delay = min(delay * 2, RECONNECT_MAX)
+
+    def _on_reply(self, data):
+        try:
+            message = json.loads(data)
+        except ValueError:
+            return
+        if not isinstance(message, dict) or not isinstance(message.get("RequestId"), (int, str)):
+            return  # not a reply frame; must never take down the reconnect loop
+        reply = self._replies.get(message["RequestId"])
+        if reply is not None and not reply.done():
+            reply.set_result(message)
+
+    def stats(self):
+        rtt = sorted(self._rtt)
+        return {
+            **self.stats_counters,
+            "transport": self.transport,
+            "connected": self._ws is not None if self.transport == "ws" else self._session is not None,
+            "queued": len(self._pending),
+            "in_flight": len(self._replies) if self.transport == "ws" else len(self._flushing),
+            "ops_per_batch": round(self.stats_counters["sent_ops"] / self.stats_counters["batches"], 1)
+            if self.stats_counters["batches"] else 0.0,
+            "rtt_ms": {"p50": round(rtt[len(rtt) // 2], 2), "max": round(rtt[-1], 2)} if rtt else None,
+        }
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import time
+
+from .client import NexusClient
+from .remote_control import RemoteControlClient, RemoteControlError
+
+ERROR_REPORT_INTERVAL = 5.0  # seconds between on_error calls; failures in between are counted, not reported
+
+# Async clients on private event loop threads, for hosts that own their main thread (Qt, the Unreal game thread)
+
+
+class ThreadedNexusClient:
+    def __init__(self, events=True, **client_options):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="nexus-client", daemon=True)
+        self.thread.start()
+        # aiohttp sessions must be created on the loop that uses them
+        self.client = self.call(self._create(events, client_options)).result()
+
+    async def _create(self, events, client_options):
+        return await NexusClient(**client_options).start(events=events)
+
+    def call(self, coro):
+        """Run a coroutine on the client loop -> concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def chat(self, message, context=None, on_token=None, use_cache=True, stream=True, timeout=None):
+        return self.call(self.client.chat(message, context, on_token, use_cache, stream, timeout))
+
+    def chat_batch(self, items, context=None, timeout=None):
+        return self.call(self.client.chat_batch(items, context, timeout))
+
+    def post_json(self, path, body, timeout=None):
+        return self.call(self.client.post_json(path, body, timeout))
+
+    def publish(self, type, payload=None):
+        return self.call(self.client.publish(type, payload))
+
+    def on(self, event_type, handler, via=None):
+        """Subscribe from any thread. via(handler, event) marshals delivery, e.g. a game-thread dispatcher's post."""
+        deliver = (lambda event: via(handler, event)) if via else handler
+        unsubscribe = self.call(self._on(event_type, deliver)).result()
+        return lambda: self.loop.call_soon_threadsafe(unsubscribe)
+
+    async def _on(self, event_type, handler):
+        return self.client.on(event_type, handler)
+
+    def on_state(self, handler, via=None):
+        deliver = (lambda connected: via(handler, connected)) if via else handler
+        self.loop.call_soon_threadsafe(self.client.on_state, deliver)
+
+    @property
+    def connected(self):
+        return self.client.connected
+
+    def close(self, timeout=5.0):
+        if not self.loop.is_running():
+            return
+        try:
+            self.call(self.client.close()).result(timeout)
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout)
+
+
+class ThreadedRemoteControl:
+    """RemoteControlClient on its own loop thread; writes are fire-and-forget so a UI thread can issue them per frame"""
+
+    def __init__(self, on_error=None, error_interval=ERROR_REPORT_INTERVAL, **client_options):
+        self.on_error = on_error
+        self.error_interval = error_interval
+        self._last_error = None      # the exception object last seen; one batch failure is shared by all its writes
+        self._last_report = None
+        self._suppressed = 0
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="unreal-rc", daemon=True)
+        self.thread.start()
+        self.client = asyncio.run_coroutine_threadsafe(self._create(client_options), self.loop).result()
+
+    async def _create(self, client_options):
+        return await RemoteControlClient(**client_options).start()
+
+    def set_property(self, object_path, name, value, transaction=False):
+        self.loop.call_soon_threadsafe(self._track, self.client.set_property, object_path, name, value, transaction)
+
+    def call(self, object_path, function, parameters=None, transaction=False):
+        self.loop.call_soon_threadsafe(self._track, self.client.call, object_path, function, parameters, transaction)
+
+    def _track(self, method, *args):
+        method(*args).add_done_callback(self._done)
+
+    def _done(self, future):
+        # Nobody awaits these futures; retrieve failures so they are reported here, at most once per interval
+        if future.cancelled() or future.exception() is None:
+            return
+        error = future.exception()
+        if error is self._last_error:
+            return  # another write of the same failed batch
+        self._last_error = error
+        now = time.monotonic()
+        if self._last_report is not None and now - self._last_report < self.error_interval:
+            self._suppressed += 1
+            return
+        if self._suppressed:
+            error = RemoteControlError(f"{error} (+{self._suppressed} more failures since the last report)",
+                                       getattr(error, "status", None), getattr(error, "body", None))
+        self._last_report = now
+        self._suppressed = 0
+        if self.on_error:
+            self.on_error(error)
+
+    def flush(self):
+        return asyncio.run_coroutine_threadsafe(self.client.flush(), self.loop)
+
+    def stats(self, timeout=1.0):
+        return asyncio.run_coroutine_threadsafe(self._stats(), self.loop).result(timeout)
+
+    async def _stats(self):
+        return self.client.stats()
+
+    def close(self, timeout=5.0):
+        if not self.loop.is_running():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.client.close(), self.loop).result(timeout)
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout)
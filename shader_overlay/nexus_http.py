@@ -0,0 +1,118 @@
+import itertools
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Antigravity Nexus HTTP fallback
+# Standard-library bridge client for interpreters without aiohttp (Unreal's embedded Python):
+# same chat()/chat_batch() surface as ThreadedNexusClient, no pooled session and no live WebSocket events
+
+HTTP_URL = os.environ.get("NEXUS_HTTP_URL", "http://localhost:3002")
+READ_TIMEOUT = 120.0
+MAX_WORKERS = 4
+
+
+class BridgeHTTPError(RuntimeError):
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class BlockingNexusClient:
+    def __init__(self, http_url=HTTP_URL, read_timeout=READ_TIMEOUT, source="python", max_workers=MAX_WORKERS):
+        self.http_url = http_url.rstrip("/")
+        self.read_timeout = read_timeout
+        self.source = source
+        self.client_id = uuid.uuid4().hex[:8]
+        self.connected = False  # never: there is no event socket
+        self._ids = itertools.count(1)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="nexus-http-fallback")
+
+    def new_request_id(self):
+        return f"{self.client_id}-{next(self._ids)}"
+
+    def _open(self, path, body, timeout, accept="application/json"):
+        request = urllib.request.Request(f"{self.http_url}{path}", data=json.dumps(body).encode(), method="POST",
+                                         headers={"Content-Type": "application/json", "Accept": accept})
+        try:
+            return urllib.request.urlopen(request, timeout=timeout or self.read_timeout)
+        except urllib.error.HTTPError as e:
+            raise BridgeHTTPError(f"Bridge Error: {e.code}", e.code) from None
+
+    def post_json(self, path, body, timeout=None):
+        with self._open(path, body, timeout) as response:
+            return json.loads(response.read() or b"{}")
+
+    # --- ThreadedNexusClient-compatible surface: calls return concurrent futures ---
+
+    def chat(self, message, context=None, on_token=None, use_cache=True, stream=True, timeout=None):
+        return self._pool.submit(self._chat, message, context, on_token, stream, timeout)
+
+    def _chat(self, message, context, on_token, stream, timeout):
+        context = dict(context or {})
+        context.setdefault("source", self.source)
+        context["request_id"] = request_id = self.new_request_id()
+        start = time.perf_counter()
+        stats = {"status": None, "ttft": None, "total": None, "streamed": False, "cached": False,
+                 "request_id": request_id}
+        accept = "text/event-stream, application/json" if stream else "application/json"
+        with self._open("/chat", {"message": message, "context": context, "stream": stream}, timeout, accept) as r:
+            stats["status"] = r.status
+            if r.headers.get_content_type() == "text/event-stream":
+                stats["streamed"] = True
+                parts = []
+                for raw in r:
+                    line = raw.decode("utf-8", "replace").strip()
+                    if not line.startswith("data:") or line[5:].strip() == "[DONE]":
+                        continue
+                    event = json.loads(line[5:])
+                    if "error" in event:
+                        raise BridgeHTTPError(f"Bridge Error: {event['error']}")
+                    if event.get("text"):
+                        if stats["ttft"] is None:
+                            stats["ttft"] = time.perf_counter() - start
+                        parts.append(event["text"])
+                        if on_token:
+                            on_token(event["text"])
+                text = "".join(parts)
+            else:
+                text = json.loads(r.read()).get("response", "")
+                stats["ttft"] = time.perf_counter() - start
+                if on_token:
+                    on_token(text)
+        stats["total"] = time.perf_counter() - start
+        return text, stats
+
+    def chat_batch(self, items, context=None, timeout=None):
+        return self._pool.submit(self._chat_batch, items, context, timeout)
+
+    def _chat_batch(self, items, context, timeout):
+        try:
+            data = self.post_json("/chat/batch", {"items": items, "context": context or {}}, timeout)
+        except BridgeHTTPError as e:
+            if e.status != 404:
+                raise
+            # Older bridge: one /chat per item, in order
+            results = []
+            for item in items:
+                try:
+                    results.append(self._chat(item["message"], {**(context or {}), **item.get("context", {})},
+                                              None, False, timeout)[0])
+                except Exception as e:
+                    results.append(e)
+            return results
+        return [r["response"] if "response" in r else BridgeHTTPError(r.get("error", "unknown error"))
+                for r in data["responses"]]
+
+    def on(self, event_type, handler, via=None):
+        return lambda: None
+
+    def on_state(self, handler, via=None):
+        pass
+
+    def close(self, timeout=5.0):
+        self._pool.shutdown(wait=False)
@@ -1,14 +1,23 @@
+import argparse
+import json
 import subprocess
 import os
 import sys
+import time
+from uat_log import UATLogParser, ProgressThrottle, PROGRESS_PREFIX, stream
+from content_index import ContentIndex
 
 # Paths
 ENGINE_PATH = "/Users/Shared/Epic Games/UE_5.7"
 UAT_PATH = os.path.join(ENGINE_PATH, "Engine/Build/BatchFiles/RunUAT.sh")
 PROJECT_PATH = "/Users/joeywalter/Documents/Unreal Projects/MyProject/MyProject.uproject"
+PROJECT_DIR = os.path.dirname(PROJECT_PATH)
 ARCHIVE_PATH = "/Users/joeywalter/antigravity-nexus/native_builds"
 
-def package_project():
+FULL_STAGE_FLAGS = ["-cook", "-allmaps", "-build", "-stage", "-pak", "-archive"]
+
+def package_project(events=False, interval=0.5, verbose=False, incremental=False):
+    """Run BuildCookRun; returns UAT's exit code (0 also when the incremental plan is up to date)"""
     print(f"🚀 Starting AAA Native Packaging for macOS (Metal 3)...")
     
     if not os.path.exists(ARCHIVE_PATH):
@@ -25,27 +34,107 @@ def package_project():
         "-platform=Mac",
         "-clientconfig=Development",
         "-archivedirectory=" + ARCHIVE_PATH,
-        "-cook",
-        "-allmaps",
-        "-build",
-        "-stage",
-        "-pak",
-        "-archive"
     ]
 
+    index = plan = current = None
+    parser = UATLogParser()
     try:
+        if incremental:
+            index = ContentIndex(PROJECT_DIR)
+            scan_start = time.perf_counter()
+            current, scan = index.scan()
+            plan = index.plan(current)
+            print(f"🔎 Content index: {scan['files']} files, {scan['hashed']} hashed in "
+                  f"{(time.perf_counter() - scan_start) * 1000:.0f} ms | changed: {plan['changed']}")
+            if scan['unreadable']:
+                print(f"⚠️ {scan['unreadable']} unreadable files counted as changed")
+            if plan['up_to_date']:
+                print(f"✅ UP TO DATE: nothing changed since the last package "
+                      f"(saved ~{plan['estimated_saving']:.0f}s)")
+                return 0
+            if plan['skipped']:
+                print(f"⏭️ Skipping {', '.join(plan['skipped'])} (estimated ~{plan['estimated_saving']:.0f}s saved)")
+            cmd += plan['flags']
+        else:
+            cmd += FULL_STAGE_FLAGS
+
         process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-        for line in process.stdout:
-            print(line, end='')
+        stream(process.stdout, parser, make_throttle(events, interval), echo=echo_line(verbose))
         
         process.wait()
+        report(parser)
         if process.returncode == 0:
             print(f"\n✅ SUCCESS: Native Mac App created at {ARCHIVE_PATH}/Mac")
+            if index is not None:
+                record_incremental(index, plan, current, parser)
         else:
-            print(f"\n❌ FAILED: Check the logs above.")
+            print(f"\n❌ FAILED: Recent UAT output:")
+            for line in parser.recent:
+                print(f"  | {line}")
+        return process.returncode
             
     except Exception as e:
         print(f"Error executing packaging: {e}")
+        return 1
+
+def record_incremental(index, plan, current, parser):
+    # Only a successful package may advance the index; timings from full runs become the baseline
+    snap = parser.snapshot()
+    full = plan['first_run'] or (not plan['skipped'] and '-iterativecooking' not in plan['flags'])
+    phases = {name: p['seconds'] for name, p in snap['phases'].items()}
+    if full:
+        index.save(current, phase_seconds=phases, total=snap['elapsed'])
+    else:
+        if index.last_total:
+            print(f"⏱️ Incremental package took {snap['elapsed']:.0f}s vs {index.last_total:.0f}s full "
+                  f"(saved {index.last_total - snap['elapsed']:.0f}s)")
+        index.save(current)
+
+def replay_log(log_path, events=False, interval=0.5, verbose=False):
+    """Run the parser over a recorded UAT log (no Unreal install needed)"""
+    parser = UATLogParser()
+    start = time.perf_counter()
+    with open(log_path, 'r', errors='replace') as f:
+        stream(f, parser, make_throttle(events, interval), echo=echo_line(verbose))
+    elapsed = time.perf_counter() - start
+
+    report(parser)
+    rate = parser.total_lines / elapsed if elapsed > 0 else 0
+    print(f"⏱️ Replayed {parser.total_lines} lines in {elapsed * 1000:.1f} ms ({rate:,.0f} lines/s)")
+    return parser
+
+def make_throttle(events, interval):
+    if events:
+        # Structured progress for the host (JobExecutor forwards these to the editor window)
+        publish = lambda snap: print(PROGRESS_PREFIX + json.dumps(snap), flush=True)
+    else:
+        publish = lambda snap: print(f"📦 [{(snap['phase'] or 'idle').upper()}] {snap['elapsed']:.0f}s | "
+                                     f"⚠️ {snap['warnings']} | ❌ {snap['errors']}", flush=True)
+    return ProgressThrottle(publish, interval=interval)
+
+def echo_line(verbose):
+    return (lambda line: print(line, end='' if line.endswith('\n') else '\n')) if verbose else None
+
+def report(parser):
+    snap = parser.snapshot()
+    print("\n--- UAT Phase Summary ---")
+    for name, phase in snap['phases'].items():
+        if phase['started']:
+            print(f"  {name:<8} {phase['seconds']:>9.2f}s  warnings={phase['warnings']:<5} errors={phase['errors']}")
+    print(f"  total    {snap['elapsed']:>9.2f}s  warnings={snap['warnings']:<5} errors={snap['errors']}")
 
 if __name__ == "__main__":
-    package_project()
+    args = argparse.ArgumentParser(description="Package the Unreal project via BuildCookRun")
+    args.add_argument("--replay", metavar="LOG", help="parse a recorded UAT log instead of running UAT")
+    args.add_argument("--events", action="store_true", help="emit structured progress lines for the host app")
+    args.add_argument("--interval", type=float, default=0.5, help="min seconds between progress events")
+    args.add_argument("--verbose", action="store_true", help="echo every raw UAT line")
+    args.add_argument("--incremental", action="store_true", help="skip UAT stages whose inputs are unchanged")
+    opts = args.parse_args()
+
+    if opts.replay:
+        replay_log(opts.replay, events=opts.events, interval=opts.interval, verbose=opts.verbose)
+    else:
+        # The host (JobExecutor build_all) reports the job from this exit code
+        sys.exit(package_project(events=opts.events, interval=opts.interval, verbose=opts.verbose,
+                                 incremental=opts.incremental))
@@ -0,0 +1,270 @@
+import configparser
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Antigravity Project Index
+# .uproject discovery across several volumes, persisted and revalidated by directory mtime
+
+INDEX_PATH = os.path.join(os.path.expanduser("~"), ".antigravity", "uproject_index.json")
+INDEX_VERSION = 1
+DEFAULT_ROOTS = (os.path.join(os.path.expanduser("~"), "Documents", "Unreal Projects"),)
+# Anything below a project (Content, Saved, ...) is never another project; nor are these anywhere
+IGNORED_DIRS = {"Intermediate", "Binaries", "Saved", "DerivedDataCache", "Content", "Plugins", "Source",
+                ".git", ".svn", "node_modules", "__pycache__"}
+MAX_DEPTH = 6
+WORKERS = 16
+
+# Launch resolution for EngineAssociation: "5.7" is an installed build, a GUID/name is a registered source build
+ENGINE_INSTALL_ROOTS = {
+    "darwin": "/Users/Shared/Epic Games",
+    "win32": "C:/Program Files/Epic Games",
+    "linux": os.path.join(os.path.expanduser("~"), "Epic Games"),
+}
+EDITOR_BINARIES = {
+    "darwin": "Engine/Binaries/Mac/UnrealEditor.app/Contents/MacOS/UnrealEditor",
+    "win32": "Engine/Binaries/Win64/UnrealEditor.exe",
+    "linux": "Engine/Binaries/Linux/UnrealEditor",
+}
+INSTALL_INI = os.path.join(os.path.expanduser("~"), ".config", "Epic", "UnrealEngine", "Install.ini")
+DEFAULT_ENGINE = "5.7"
+
+
+def configured_roots():
+    """ANTIGRAVITY_PROJECT_ROOTS (os.pathsep separated) or the default Unreal Projects folder"""
+    env = os.environ.get("ANTIGRAVITY_PROJECT_ROOTS")
+    roots = env.split(os.pathsep) if env else DEFAULT_ROOTS
+    return [os.path.abspath(os.path.expanduser(r)) for r in roots if r]
+
+
+def scan_dir(path):
+    """One directory listing -> (mtime_ns, subdirs, .uproject files) or None if it is gone"""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+        subdirs, uprojects = [], []
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name.endswith(".uproject") and entry.is_file():
+                    st = entry.stat()
+                    uprojects.append((entry.path, st.st_mtime_ns))
+                elif entry.is_dir(follow_symlinks=False) and entry.name not in IGNORED_DIRS \
+                        and not entry.name.startswith("."):
+                    subdirs.append(entry.path)
+        return mtime_ns, subdirs, uprojects
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        return None
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def read_uproject(path):
+    """The parts of a .uproject the launcher shows: engine association, description, enabled plugins"""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        data = json.load(f)
+    return {
+        "engine": data.get("EngineAssociation") or "",
+        "description": data.get("Description") or data.get("Category") or "",
+        "plugins": sorted(p["Name"] for p in data.get("Plugins", []) if p.get("Enabled", True) and "Name" in p),
+        "modules": [m["Name"] for m in data.get("Modules", []) if "Name" in m],
+    }
+
+
+def editor_binary(association, platform=sys.platform):
+    """UnrealEditor executable for an EngineAssociation value (UE_EDITOR overrides everything)"""
+    override = os.environ.get("UE_EDITOR")
+    if override:
+        return override
+    key = "win32" if platform.startswith("win") else "darwin" if platform == "darwin" else "linux"
+    association = association or DEFAULT_ENGINE
+    if association[:1].isdigit():
+        root = os.environ.get("UE_INSTALL_ROOT", ENGINE_INSTALL_ROOTS[key])
+        return os.path.join(root, f"UE_{association}", EDITOR_BINARIES[key])
+    # Source builds registered by UnrealVersionSelector ({GUID} = engine dir)
+    installs = configparser.ConfigParser()
+    installs.optionxform = str
+    installs.read(INSTALL_INI)
+    if installs.has_option("Installations", association):
+        return os.path.join(installs.get("Installations", association), EDITOR_BINARIES[key])
+    return editor_binary(DEFAULT_ENGINE, platform)
+
+
+class ProjectIndex:
+    """roots -> {dir: listing} + {uproject path: project}; refresh() re-lists only directories whose mtime moved.
+    A directory's mtime changes when entries are added/removed/renamed in it, which is exactly when its listing can."""
+
+    def __init__(self, roots=None, path=INDEX_PATH, workers=WORKERS, max_depth=MAX_DEPTH):
+        self.roots = roots if roots is not None else configured_roots()
+        self.path = path
+        self.workers = workers
+        self.max_depth = max_depth
+        self._dirs = {}      # root -> {dir: {mtime_ns, depth, subdirs, projects}}
+        self._projects = {}  # uproject path -> {name, path, dir, root, mtime_ns, details}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self.last_refresh = None
+        self.load()
+
+    def projects(self):
+        """Cached projects, most recently touched first; never touches the scanned volumes"""
+        with self._lock:
+            projects = [dict(p) for p in self._projects.values() if p["root"] in self.roots]
+        return sorted(projects, key=lambda p: (-p["mtime_ns"], p["name"].lower()))
+
+    def refresh(self):
+        """Bring the index up to date with the disks. -> (projects, stats)"""
+        with self._refresh_lock:
+            start = time.perf_counter()
+            stats = {"roots": len(self.roots), "checked": 0, "listed": 0, "added": 0, "removed": 0,
+                     "updated": 0}
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                # Every known directory of every root is stat()ed in one parallel sweep
+                with self._lock:
+                    known = [(root, d) for root in self.roots for d in self._dirs.get(root, {})]
+                mtimes = dict(zip(known, pool.map(lambda item: _mtime(item[1]), known)))
+                # A .uproject edited in place leaves its directory's mtime alone, so the files are stat()ed too
+                with self._lock:
+                    files = [path for path, p in self._projects.items() if p["root"] in self.roots]
+                file_mtimes = dict(zip(files, pool.map(_mtime, files)))
+                stats["checked"] = len(known) + len(files)
+                with self._lock:
+                    for path, mtime_ns in file_mtimes.items():
+                        if mtime_ns is not None and path in self._projects:
+                            stats["updated"] += self._touch(path, mtime_ns)
+                stale = []
+                with self._lock:
+                    for root in self.roots:
+                        dirs = self._dirs.setdefault(root, {})
+                        if root not in dirs:
+                            stale.append((root, root, 0))
+                        stale.extend((root, d, entry["depth"]) for d, entry in dirs.items()
+                                     if mtimes.get((root, d)) != entry["mtime_ns"])
+                self._rescan(pool, stale, stats)
+            stats["seconds"] = round(time.perf_counter() - start, 3)
+            self.last_refresh = stats
+            if stats["listed"] or stats["updated"]:
+                self.save()
+            return self.projects(), stats
+
+    def _rescan(self, pool, stale, stats):
+        # Level-synchronous parallel walk: every stale directory of a level is listed at once, across all roots
+        level = stale
+        while level:
+            results = pool.map(lambda item: scan_dir(item[1]), level)
+            next_level = []
+            with self._lock:
+                for (root, d, depth), listing in zip(level, results):
+                    dirs = self._dirs[root]
+                    parent = dirs.get(os.path.dirname(d))
+                    if d != root and (parent is None or d not in parent["subdirs"]):
+                        continue  # dropped by its parent's re-listing earlier in this pass
+                    stats["listed"] += 1
+                    if listing is None:
+                        stats["removed"] += self._forget(root, d)
+                        continue
+                    mtime_ns, subdirs, uprojects = listing
+                    old = dirs.get(d, {"subdirs": [], "projects": []})
+                    found = [path for path, _ in uprojects]
+                    for path in set(old["projects"]) - set(found):
+                        self._projects.pop(path, None)
+                        stats["removed"] += 1
+                    for path, project_mtime in uprojects:
+                        stats["added"] += self._remember(root, d, path, project_mtime)
+                    # A project folder's children are its Content/Saved/...: not worth walking
+                    if uprojects or depth >= self.max_depth:
+                        subdirs = []
+                    for sub in set(old["subdirs"]) - set(subdirs):
+                        stats["removed"] += self._forget(root, sub)
+                    dirs[d] = {"mtime_ns": mtime_ns, "depth": depth, "subdirs": subdirs, "projects": found}
+                    # Known, unchanged subtrees were already validated by the stat sweep
+                    next_level.extend((root, sub, depth + 1) for sub in subdirs if sub not in dirs)
+            level = next_level
+
+    def _remember(self, root, d, path, mtime_ns):
+        project = self._projects.get(path)
+        if project is not None and project["mtime_ns"] == mtime_ns:
+            return 0
+        self._projects[path] = {
+            "name": os.path.splitext(os.path.basename(path))[0],
+            "path": path,
+            "dir": d,
+            "root": root,
+            "mtime_ns": mtime_ns,
+            "details": None,  # read_uproject(), filled on first details() call
+        }
+        return int(project is None)
+
+    def _touch(self, path, mtime_ns):
+        """Record a new .uproject mtime; cached details were read from the old contents"""
+        project = self._projects[path]
+        if project["mtime_ns"] == mtime_ns:
+            return 0
+        project["mtime_ns"] = mtime_ns
+        project["details"] = None
+        return 1
+
+    def _forget(self, root, d):
+        """Drop d and everything indexed under it; returns the number of projects removed"""
+        dirs = self._dirs[root]
+        removed = 0
+        stack = [d]
+        while stack:
+            entry = dirs.pop(stack.pop(), None)
+            if entry is None:
+                continue
+            for path in entry["projects"]:
+                removed += self._projects.pop(path, None) is not None
+            stack.extend(entry["subdirs"])
+        return removed
+
+    def details(self, path):
+        """Engine association, description and plugins of one project, read on first use and cached by mtime"""
+        mtime_ns = _mtime(path)
+        with self._lock:
+            project = self._projects.get(path)
+            if project is not None:
+                if mtime_ns is not None:
+                    self._touch(path, mtime_ns)
+                if project["details"] is not None:
+                    return project["details"]
+        try:
+            details = read_uproject(path)
+        except (OSError, ValueError) as e:
+            details = {"engine": "", "description": "", "plugins": [], "modules": [], "error": str(e)}
+        with self._lock:
+            if path in self._projects:
+                self._projects[path]["details"] = details
+        self.save()
+        return details
+
+    def load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        with self._lock:
+            self._dirs = data.get("dirs", {})
+            self._projects = data.get("projects", {})
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {"version": INDEX_VERSION, "dirs": self._dirs, "projects": self._projects}
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
@@ -0,0 +1,109 @@
+import time
+from collections import OrderedDict
+
+# Antigravity Relay Queue
+# Coalesces bridge commands per target so each window gets ONE runJavaScript per frame
+
+# Actions where only the newest command matters (last-write-wins). Keyed by action alone, so anything
+# carrying a per-parameter payload (set_param, set_viewport) must NOT be listed here
+COALESCE_ACTIONS = frozenset([
+    "show_status",
+    "view_outliner",
+    "view_details",
+    "view_content",
+    "telemetry",
+])
+
+FRAME_MS = 16
+
+
+class RelayQueue:
+    def __init__(self, coalesce_actions=COALESCE_ACTIONS):
+        self.coalesce_actions = frozenset(coalesce_actions)
+        # target -> OrderedDict(key -> raw command json)
+        self._pending = {}
+        self._first_enqueue = None
+        self._seq = 0
+
+        # Counters
+        self.enqueued = 0
+        self.coalesced = 0
+        self.flushes = 0  # drain() calls that emptied a frame
+        self.flushed_batches = 0  # one per target per flush
+        self.flushed_commands = 0
+        self.max_depth = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    def __len__(self):
+        return sum(len(cmds) for cmds in self._pending.values())
+
+    def push(self, target, action, command_str):
+        """Queue a raw command JSON string. Returns True if this started a new frame."""
+        started = self._first_enqueue is None
+        if started:
+            self._first_enqueue = time.perf_counter()
+
+        cmds = self._pending.setdefault(target, OrderedDict())
+        if action in self.coalesce_actions:
+            key = ("action", action)
+            if key in cmds:
+                # Last write wins, and moves to the end so it lands after anything queued since
+                del cmds[key]
+                self.coalesced += 1
+        else:
+            self._seq += 1
+            key = ("seq", self._seq)
+        cmds[key] = command_str
+
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, len(self))
+        return started
+
+    def drain(self):
+        """Pop everything queued this frame as {target: batch_json_array}."""
+        if not self._pending:
+            return {}
+
+        batches = {}
+        count = 0
+        for target, cmds in self._pending.items():
+            # Commands are already valid JSON, so the batch is built without re-serializing
+            batches[target] = "[" + ",".join(cmds.values()) + "]"
+            count += len(cmds)
+
+        latency_ms = (time.perf_counter() - self._first_enqueue) * 1000.0
+        self._pending = {}
+        self._first_enqueue = None
+
+        self.flushes += 1
+        self.flushed_batches += len(batches)
+        self.flushed_commands += count
+        self.last_flush_ms = latency_ms
+        self.max_flush_ms = max(self.max_flush_ms, latency_ms)
+        self._total_flush_ms += latency_ms
+        return batches
+
+    def stats(self):
+        flushes = self.flushes or 1
+        return {
+            "depth": len(self),
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "coalesced": self.coalesced,
+            "flushes": self.flushes,
+            "flushed_batches": self.flushed_batches,
+            "flushed_commands": self.flushed_commands,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "max_flush_ms": round(self.max_flush_ms, 3),
+            "avg_flush_ms": round(self._total_flush_ms / flushes, 3),
+        }
+
+
+def batch_script(batch_json):
+    """JS that feeds a whole batch to handleEngineCommand in one runJavaScript call"""
+    return (
+        "if(typeof handleEngineCommand === 'function') "
+        f"{batch_json}.forEach(function(c) {{ handleEngineCommand(c); }});"
+    )
@@ -0,0 +1,284 @@
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import threading
+import zipfile
+from collections import OrderedDict, deque
+from html.parser import HTMLParser
+
+# Antigravity Resource Pack
+# Pages and the files they reference, minified and stored once per distinct content in a single zip,
+# served to QtWebEngine from memory (see PackSchemeHandler in main.py)
+
+PACK_NAME = "resources.pack"
+PACK_VERSION = 1
+INDEX_NAME = "index.json"
+ENTRY_PAGES = ("engine_controller.html", "nexus_hub.html")
+CACHE_BYTES = 16 * 1024 * 1024
+
+# Already-compressed formats are stored as-is; deflating them again only costs load time
+STORED_EXTS = frozenset([".png", ".jpg", ".jpeg", ".webp", ".glb", ".gz", ".zip"])
+LOCAL_REF = re.compile(r"^[\w./-]+\.(?:html|js|css|json|png|jpe?g|svg|webp|glb)$")
+# Strings in inline scripts that name a local file (fetch('x.json'), iframe.src = 'x.html', ...)
+SCRIPT_REF = re.compile(r"""['"`]([\w./-]+\.(?:html|js|css|json|png|jpe?g|svg|webp|glb))['"`]""")
+CSS_URL = re.compile(r"""url\(\s*['"]?([^'")]+)['"]?\s*\)""")
+CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+CSS_PUNCT = re.compile(r"\s*([{};,>])\s*")
+HTML_COMMENT = re.compile(r"<!--(?!\[if).*?-->", re.S)
+# Blocks whose whitespace matters (pre/textarea) or that get their own minifier (script/style)
+HTML_RAW = re.compile(r"(<(script|style|pre|textarea)\b([^>]*)>)(.*?)(</\2\s*>)", re.S | re.I)
+
+
+def _is_local(ref):
+    return bool(ref) and "://" not in ref and not ref.startswith(("//", "#", "data:", "qrc:", "mailto:"))
+
+
+class ReferenceScanner(HTMLParser):
+    """Local files a page pulls in at load time (scripts, styles, iframes, images) and ones it can navigate to"""
+
+    LOAD_ATTRS = {"script": "src", "iframe": "src", "img": "src", "link": "href", "source": "src"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.loads = []
+        self.links = []
+        self._in_script = False
+        self._in_style = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "script" and not attrs.get("src"):
+            self._in_script = True
+        elif tag == "style":
+            self._in_style = True
+        load = attrs.get(self.LOAD_ATTRS.get(tag, ""))
+        if load and _is_local(load):
+            self.loads.append(load)
+        for name in ("data-src", "href"):
+            ref = attrs.get(name)
+            if ref and tag != "link" and _is_local(ref) and LOCAL_REF.match(ref):
+                self.links.append(ref)
+        if attrs.get("style"):
+            self.loads.extend(u for u in CSS_URL.findall(attrs["style"]) if _is_local(u))
+
+    def handle_endtag(self, tag):
+        if tag == "script":
+            self._in_script = False
+        elif tag == "style":
+            self._in_style = False
+
+    def handle_data(self, data):
+        if self._in_script:
+            self.links.extend(SCRIPT_REF.findall(data))
+        elif self._in_style:
+            self.loads.extend(u for u in CSS_URL.findall(data) if _is_local(u))
+
+
+def references(path):
+    """(load-time refs, navigation refs) of one page or stylesheet, as written in the file"""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        content = f.read()
+    if path.endswith(".css"):
+        return [u for u in CSS_URL.findall(content) if _is_local(u)], []
+    if not path.endswith(".html"):
+        return [], []
+    scanner = ReferenceScanner()
+    scanner.feed(content)
+    return scanner.loads, scanner.links
+
+
+def discover(root, entries=ENTRY_PAGES):
+    """Walk everything reachable from the entry pages.
+    -> {relative path: {"loads": [...], "links": [...]}} for files that exist under root, in discovery order"""
+    found = OrderedDict()
+    queue = deque(entries)
+    while queue:
+        rel = os.path.normpath(queue.popleft()).replace(os.sep, "/")
+        if rel in found or rel.startswith("../") or not os.path.isfile(os.path.join(root, rel)):
+            continue
+        loads, links = references(os.path.join(root, rel))
+        base = os.path.dirname(rel)
+        resolve = lambda ref: os.path.normpath(os.path.join(base, ref.split("?")[0].split("#")[0])).replace(os.sep, "/")
+        found[rel] = {
+            "loads": [r for r in map(resolve, loads) if os.path.isfile(os.path.join(root, r))],
+            "links": [r for r in map(resolve, links) if os.path.isfile(os.path.join(root, r))],
+        }
+        queue.extend(found[rel]["loads"] + found[rel]["links"])
+    return found
+
+
+def load_closure(graph, page):
+    """Files the browser fetches to show page: the page itself plus load-time refs, transitively"""
+    seen = []
+    stack = [page]
+    while stack:
+        rel = stack.pop()
+        if rel in seen or rel not in graph:
+            continue
+        seen.append(rel)
+        stack.extend(reversed(graph[rel]["loads"]))
+    return seen
+
+
+# --- Minification (conservative: line structure is kept, so ASI and error line numbers still work) ---
+
+def _backticks(line):
+    return len(re.findall(r"(?<!\\)`", line))
+
+
+def minify_js(source):
+    """Drop indentation, blank lines and whole-line // comments; template literal bodies are left untouched"""
+    out = []
+    in_template = False
+    for line in source.splitlines():
+        if not in_template:
+            line = line.strip()
+            if not line or line.startswith("//"):
+                continue
+        out.append(line)
+        if _backticks(line) % 2:
+            in_template = not in_template
+    return "\n".join(out)
+
+
+def minify_css(source):
+    css = CSS_COMMENT.sub("", source)
+    css = CSS_PUNCT.sub(r"\1", re.sub(r"\s+", " ", css))
+    return css.replace(";}", "}").strip()
+
+
+def _minify_block(match):
+    open_tag, tag, attrs, body, close_tag = match.groups()
+    tag = tag.lower()
+    if tag == "style":
+        body = minify_css(body)
+    elif tag == "script" and "src=" not in attrs and re.search(r"type=['\"](?!text/javascript|module)", attrs) is None:
+        body = minify_js(body)
+    return f"{open_tag}{body}{close_tag}"
+
+
+def minify_html(source):
+    parts = []
+    last = 0
+    for match in HTML_RAW.finditer(source):
+        parts.append(_minify_markup(source[last:match.start()]))
+        parts.append(_minify_block(match))
+        last = match.end()
+    parts.append(_minify_markup(source[last:]))
+    return "".join(parts)
+
+
+def _minify_markup(markup):
+    markup = HTML_COMMENT.sub("", markup)
+    return "\n".join(line.strip() for line in markup.splitlines() if line.strip())
+
+
+def minify(rel, data):
+    if rel.endswith(".min.js"):
+        return data
+    minifier = {".html": minify_html, ".css": minify_css, ".js": minify_js}.get(os.path.splitext(rel)[1])
+    if minifier is None:
+        return data
+    return minifier(data.decode("utf-8")).encode("utf-8")
+
+
+# --- Packing ---
+
+def content_digest(data):
+    return hashlib.sha256(data).hexdigest()[:20]
+
+
+def mime_type(rel):
+    return mimetypes.guess_type(rel)[0] or "application/octet-stream"
+
+
+def build_pack(root, out_path, entries=ENTRY_PAGES, extra=(), do_minify=True):
+    """Discover, minify and pack; identical files (after minification) share one blob. -> summary dict"""
+    graph = discover(root, tuple(entries) + tuple(extra))
+    files = {}
+    blobs = {}
+    raw_bytes = 0
+    for rel in graph:
+        with open(os.path.join(root, rel), "rb") as f:
+            data = f.read()
+        raw_bytes += len(data)
+        if do_minify:
+            data = minify(rel, data)
+        digest = content_digest(data)
+        blobs.setdefault(digest, data)
+        files[rel] = {"blob": digest, "mime": mime_type(rel), "size": len(data)}
+
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    tmp = f"{out_path}.{os.getpid()}.tmp"
+    with zipfile.ZipFile(tmp, "w") as archive:
+        index = {"version": PACK_VERSION, "entries": list(entries), "files": files, "graph": graph}
+        archive.writestr(INDEX_NAME, json.dumps(index), zipfile.ZIP_DEFLATED)
+        exts = {f["blob"]: os.path.splitext(rel)[1].lower() for rel, f in files.items()}
+        for digest, data in blobs.items():
+            stored = exts[digest] in STORED_EXTS
+            archive.writestr(f"blobs/{digest}", data, zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED,
+                             compresslevel=None if stored else 9)
+    os.replace(tmp, out_path)
+    return {
+        "files": len(files),
+        "blobs": len(blobs),
+        "raw_bytes": raw_bytes,
+        "minified_bytes": sum(f["size"] for f in files.values()),
+        "unique_bytes": sum(len(b) for b in blobs.values()),
+        "pack_bytes": os.path.getsize(out_path),
+        "graph": graph,
+    }
+
+
+class ResourcePack:
+    """Read side of a pack: path -> (bytes, mime), decompressed blobs kept in a byte-bounded LRU"""
+
+    def __init__(self, path, cache_bytes=CACHE_BYTES):
+        self.path = path
+        self.cache_bytes = cache_bytes
+        self._zip = zipfile.ZipFile(path)
+        index = json.loads(self._zip.read(INDEX_NAME))
+        if index.get("version") != PACK_VERSION:
+            raise ValueError(f"{path}: unsupported pack version {index.get('version')}")
+        self.files = index["files"]
+        self.entries = index["entries"]
+        self._cache = OrderedDict()  # blob digest -> bytes
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, rel):
+        return rel in self.files
+
+    def get(self, rel):
+        """(bytes, mime) or None when the pack has no such file"""
+        entry = self.files.get(rel.lstrip("/"))
+        if entry is None:
+            return None
+        digest = entry["blob"]
+        with self._lock:
+            data = self._cache.get(digest)
+            if data is not None:
+                self._cache.move_to_end(digest)
+                self.hits += 1
+                return data, entry["mime"]
+            self.misses += 1
+            data = self._zip.read(f"blobs/{digest}")
+            if len(data) <= self.cache_bytes:
+                self._cache[digest] = data
+                self._cached_bytes += len(data)
+                while self._cached_bytes > self.cache_bytes:
+                    _, evicted = self._cache.popitem(last=False)
+                    self._cached_bytes -= len(evicted)
+        return data, entry["mime"]
+
+    def stats(self):
+        with self._lock:
+            return {"files": len(self.files), "cached": len(self._cache), "cached_bytes": self._cached_bytes,
+                    "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        self._zip.close()
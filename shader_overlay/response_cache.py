@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+# Antigravity Response Cache
+# Client-side TTL + LRU cache for Nexus /chat replies, persisted across editor sessions
+
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".antigravity", "nexus_response_cache.json")
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 512
+CACHE_VERSION = 1
+SAVE_DELAY = 2.0  # puts are written at most this long after the first one of a burst
+CASE_INSENSITIVE_MODES = (None, "chat")  # code-generation prompts keep their identifiers' case
+
+# Politeness/filler that never changes what the model is asked to do
+FILLER = re.compile(r"^(?:(?:please|pls|can you|could you|would you|hey|hi|ok|okay|now)\b[\s,]*)+|\b(?:please|pls)\b",
+                    re.IGNORECASE)
+NUMBER_WORDS = {
+    "zero": "0", "one": "1", "two": "2", "three": "3", "four": "4", "five": "5", "six": "6",
+    "seven": "7", "eight": "8", "nine": "9", "ten": "10", "eleven": "11", "twelve": "12",
+    "twenty": "20", "fifty": "50", "hundred": "100", "a dozen": "12",
+}
+NUMBER_WORD = re.compile(r"\b(" + "|".join(sorted(NUMBER_WORDS, key=len, reverse=True)) + r")\b", re.IGNORECASE)
+
+
+def normalize_prompt(prompt, mode=None):
+    """'Please spawn TEN  red spheres!' -> 'spawn 10 red spheres' (case is only folded for chat)"""
+    text = unicodedata.normalize("NFKC", prompt)
+    if mode in CASE_INSENSITIVE_MODES:
+        text = text.casefold()
+    text = re.sub(r"\s+", " ", text).strip()
+    text = FILLER.sub("", text)
+    text = NUMBER_WORD.sub(lambda m: NUMBER_WORDS[m.group(1).lower()], text)
+    text = re.sub(r"\s+", " ", text)
+    # A prompt that is nothing but filler ("hi", "ok") keeps its own key instead of sharing ""
+    return text.strip(" .!?,;:") or prompt.strip()
+
+
+def cache_key(prompt, mode):
+    normalized = normalize_prompt(prompt, mode)
+    return hashlib.sha256(f"{mode or 'chat'}\0{normalized}".encode()).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, path=CACHE_PATH, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, clock=time.time,
+                 save_delay=SAVE_DELAY):
+        self.path = path
+        self.save_delay = save_delay
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> [created, response]
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._save_timer = None
+        self._save_lock = threading.Lock()  # timer thread vs flush() share one tmp file
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.load()
+
+    def _read(self):
+        """Unexpired [key, created, response] entries in the file, oldest first"""
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return []
+        if data.get("version") != CACHE_VERSION:
+            return []
+        now = self.clock()
+        return sorted((e for e in data.get("entries", []) if now - e[1] < self.ttl), key=lambda e: e[1])
+
+    def load(self):
+        if not self.path:
+            return
+        entries = self._read()
+        with self._lock:
+            for key, created, response in entries:
+                self._entries[key] = [created, response]
+            self._trim()
+
+    def save(self, merge=True):
+        """Write the cache. Other editor/CLI processes share the file, so their newer entries are kept."""
+        if not self.path:
+            return
+        with self._save_lock:
+            with self._lock:
+                entries = {key: [key, created, response] for key, (created, response) in self._entries.items()}
+                self._dirty = False
+            if merge:
+                for entry in self._read():
+                    if entry[0] not in entries or entries[entry[0]][1] < entry[1]:
+                        entries[entry[0]] = entry
+            entries = sorted(entries.values(), key=lambda e: e[1])[-self.max_entries:]
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump({"version": CACHE_VERSION, "entries": entries}, f)
+            os.replace(tmp, self.path)
+
+    def _save_later(self):
+        with self._lock:
+            self._save_timer = None
+        self.save()
+
+    def flush(self):
+        """Write pending puts now (call on shutdown)"""
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+        if timer is not None:
+            timer.cancel()
+        if self._dirty:
+            self.save()
+
+    def get(self, prompt, mode=None):
+        key = cache_key(prompt, mode)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.clock() - entry[0] >= self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, prompt, mode, response, persist=True):
+        key = cache_key(prompt, mode)
+        with self._lock:
+            self._entries[key] = [self.clock(), response]
+            self._entries.move_to_end(key)
+            self._trim()
+            if not persist:
+                return
+            self._dirty = True
+            # One JSON rewrite per burst of puts, on a timer thread
+            if self.path and self._save_timer is None:
+                self._save_timer = threading.Timer(self.save_delay, self._save_later)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def _trim(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+            self._entries.clear()
+        if timer is not None:
+            timer.cancel()
+        self.save(merge=False)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
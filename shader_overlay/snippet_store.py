@@ -0,0 +1,323 @@
+import ast
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+
+# Antigravity Snippet Store
+# AI-generated Python compiled once per distinct source, AST-checked before it runs, with a replayable history
+
+HISTORY_PATH = os.path.join(os.path.expanduser("~"), ".antigravity", "nexus_snippet_history.json")
+HISTORY_VERSION = 1
+MAX_SNIPPETS = 256
+HISTORY_SIZE = 200
+SAVE_DELAY = 2.0  # history is written off the game thread, at most this long after the last run
+
+# Editor snippets drive the unreal module; process, network and FFI access is never what was asked for
+FORBIDDEN_IMPORTS = frozenset({"subprocess", "socket", "ctypes", "multiprocessing", "shutil", "pty", "winreg"})
+FORBIDDEN_CALLS = frozenset({"__import__", "eval", "exec", "exit", "quit"})
+FENCE_OPEN = re.compile(r"```([\w+-]*)[ \t]*\r?\n")
+PYTHON_FENCES = ("", "python", "py")
+FENCE_CLOSE = "```"
+
+
+class SnippetError(Exception):
+    def __init__(self, digest, problems):
+        super().__init__("; ".join(problems))
+        self.digest = digest
+        self.problems = problems
+
+
+def source_digest(source):
+    return hashlib.sha256(source.encode()).hexdigest()[:16]
+
+
+def _has_break(loop):
+    """True if a break exits this loop (breaks inside nested loops/functions don't count)"""
+    stack = list(loop.body)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ast.Break):
+            return True
+        if isinstance(node, (ast.For, ast.AsyncFor, ast.While)):
+            stack.extend(node.orelse)
+            continue
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+            continue
+        stack.extend(ast.iter_child_nodes(node))
+    return False
+
+
+def _is_endless(loop):
+    if isinstance(loop, ast.While):
+        test = loop.test
+        return isinstance(test, ast.Constant) and bool(test.value)
+    # for _ in itertools.count() / count()
+    call = loop.iter
+    if isinstance(call, ast.Call):
+        func = call.func
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+        return name == "count"
+    return False
+
+
+def check_tree(tree, forbidden_imports=FORBIDDEN_IMPORTS):
+    """Static checks run before a snippet is allowed to execute on the game thread"""
+    problems = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name.split(".")[0] in forbidden_imports:
+                    problems.append(f"line {node.lineno}: forbidden import '{alias.name}'")
+        elif isinstance(node, ast.ImportFrom):
+            if node.module and node.level == 0 and node.module.split(".")[0] in forbidden_imports:
+                problems.append(f"line {node.lineno}: forbidden import '{node.module}'")
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FORBIDDEN_CALLS:
+            problems.append(f"line {node.lineno}: forbidden call '{node.func.id}()'")
+
+    # A top-level endless loop would freeze the editor: it runs from the Slate tick
+    for node in tree.body:
+        if isinstance(node, (ast.While, ast.For)) and _is_endless(node) and not _has_break(node):
+            problems.append(f"line {node.lineno}: endless top-level loop")
+    return problems
+
+
+class CodeBlockScanner:
+    """Feed streamed reply chunks; on_block fires for each fenced python block, in order, as soon as it closes"""
+
+    def __init__(self, on_block=None):
+        self.on_block = on_block
+        self.buffer = ""
+        self.blocks = []
+        self._start = None
+        self._python = False
+        self._scanned = 0
+        self._floor = 0  # end of the last closed block: its closing fence must not open another
+
+    @property
+    def code(self):
+        """Every closed python block joined in order, or None before the first one closes"""
+        return "\n\n".join(self.blocks) if self.blocks else None
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        while True:
+            # Re-scan a few characters back so fences split across chunks are still found
+            if self._start is None:
+                match = FENCE_OPEN.search(self.buffer, max(self._floor, self._scanned - 16))
+                self._scanned = len(self.buffer)
+                if not match:
+                    return
+                self._python = match.group(1).lower() in PYTHON_FENCES
+                self._start = self._scanned = match.end()
+            end = self.buffer.find(FENCE_CLOSE, max(self._start, self._scanned - len(FENCE_CLOSE)))
+            self._scanned = len(self.buffer)
+            if end == -1:
+                return
+            code = self.buffer[self._start:end].strip()
+            self._start = None
+            self._floor = self._scanned = end + len(FENCE_CLOSE)
+            # json/cpp/etc. blocks are consumed so their fences are not mistaken for python ones
+            if self._python:
+                self.blocks.append(code)
+                if self.on_block:
+                    self.on_block(code)
+
+
+def extract_code(text):
+    """Fenced python blocks of a complete reply joined in order, or the reply itself when it has none"""
+    scanner = CodeBlockScanner()
+    scanner.feed(text)
+    return text if scanner.code is None else scanner.code
+
+
+class Snippet:
+    def __init__(self, digest, source, code=None, problems=()):
+        self.digest = digest
+        self.source = source
+        self.code = code
+        self.problems = list(problems)
+        self.runs = 0
+        self.failures = 0
+        self.total_ms = 0.0
+        self.last_ms = None
+
+    @property
+    def valid(self):
+        return self.code is not None
+
+    def __repr__(self):
+        return f"<Snippet {self.digest} runs={self.runs} last={self.last_ms}>"
+
+
+class SnippetStore:
+    def __init__(self, path=HISTORY_PATH, max_snippets=MAX_SNIPPETS, history_size=HISTORY_SIZE,
+                 forbidden_imports=FORBIDDEN_IMPORTS, clock=time.perf_counter, save_delay=SAVE_DELAY):
+        self.path = path
+        self.save_delay = save_delay
+        self.max_snippets = max_snippets
+        self.forbidden_imports = forbidden_imports
+        self.clock = clock
+        self._snippets = OrderedDict()  # digest -> Snippet (rejected sources included, so they fail fast)
+        self._history = deque(maxlen=history_size)  # {digest, label, ok, ms, error, at}
+        self._sources = {}  # digest -> source for everything still in history
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._save_timer = None
+        self._save_lock = threading.Lock()  # timer thread vs flush() share one tmp file
+        self.compiles = 0
+        self.hits = 0
+        self.load()
+
+    def prepare(self, source, filename="<nexus>"):
+        """Snippet for source, compiled and checked at most once. Raises SnippetError if it may not run."""
+        digest = source_digest(source)
+        with self._lock:
+            snippet = self._snippets.get(digest)
+            if snippet is not None:
+                self._snippets.move_to_end(digest)
+                self.hits += 1
+        if snippet is None:
+            snippet = self._compile(digest, source, filename)
+            with self._lock:
+                self._snippets[digest] = snippet
+                while len(self._snippets) > self.max_snippets:
+                    self._snippets.popitem(last=False)
+        if not snippet.valid:
+            raise SnippetError(digest, snippet.problems)
+        return snippet
+
+    def _compile(self, digest, source, filename):
+        self.compiles += 1
+        try:
+            tree = ast.parse(source, filename)
+        except SyntaxError as e:
+            return Snippet(digest, source, problems=[f"line {e.lineno}: syntax error: {e.msg}"])
+        problems = check_tree(tree, self.forbidden_imports)
+        if problems:
+            return Snippet(digest, source, problems=problems)
+        return Snippet(digest, source, compile(tree, filename, "exec"))
+
+    def run(self, source, namespace=None, label=None):
+        """Execute source (a str or prepared Snippet); timing and outcome go to the history. Exceptions propagate."""
+        snippet = source if isinstance(source, Snippet) else self.prepare(source)
+        if not snippet.valid:
+            raise SnippetError(snippet.digest, snippet.problems)
+        if namespace is None:
+            namespace = {"__name__": "__nexus__"}
+        start = self.clock()
+        error = None
+        try:
+            exec(snippet.code, namespace)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            ms = (self.clock() - start) * 1000
+            snippet.runs += 1
+            snippet.total_ms += ms
+            snippet.last_ms = ms
+            if error is not None:
+                snippet.failures += 1
+            self._record(snippet, label, ms, error)
+        return snippet
+
+    def _record(self, snippet, label, ms, error):
+        with self._lock:
+            self._history.append({
+                "digest": snippet.digest,
+                "label": (label or "")[:120],
+                "ok": error is None,
+                "ms": round(ms, 3),
+                "error": str(error) if error is not None else None,
+                "at": time.time(),
+            })
+            self._sources[snippet.digest] = snippet.source
+            live = {entry["digest"] for entry in self._history}
+            for digest in [d for d in self._sources if d not in live]:
+                del self._sources[digest]
+            self._dirty = True
+            # Runs happen on the game thread; the JSON rewrite happens later on a timer thread, once per burst
+            if self.path and self._save_timer is None:
+                self._save_timer = threading.Timer(self.save_delay, self._save_later)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def _save_later(self):
+        with self._lock:
+            self._save_timer = None
+        self.save()
+
+    def flush(self):
+        """Write pending history now (call on shutdown)"""
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+        if timer is not None:
+            timer.cancel()
+        if self._dirty:
+            self.save()
+
+    def history(self, limit=None):
+        with self._lock:
+            entries = list(self._history)
+        return entries[-limit:] if limit else entries
+
+    def source(self, digest):
+        with self._lock:
+            return self._sources.get(digest)
+
+    def replay(self, index=-1, namespace=None):
+        """Re-run a history entry (by position or digest) from its cached code object"""
+        with self._lock:
+            if isinstance(index, str):
+                entry = next((e for e in reversed(self._history) if e["digest"] == index), None)
+            else:
+                entry = self._history[index] if self._history else None
+            source = self._sources.get(entry["digest"]) if entry else None
+        if source is None:
+            raise KeyError(f"no snippet in history for {index!r}")
+        return self.run(source, namespace, label=f"replay: {entry['label']}")
+
+    def load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != HISTORY_VERSION:
+            return
+        with self._lock:
+            self._history.extend(data.get("history", []))
+            sources = data.get("sources", {})
+            self._sources = {e["digest"]: sources[e["digest"]] for e in self._history if e["digest"] in sources}
+
+    def save(self):
+        if not self.path:
+            return
+        with self._save_lock:
+            with self._lock:
+                data = {"version": HISTORY_VERSION, "history": list(self._history), "sources": dict(self._sources)}
+                self._dirty = False
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+
+    def stats(self):
+        with self._lock:
+            snippets = list(self._snippets.values())
+            history = len(self._history)
+        return {
+            "snippets": len(snippets),
+            "rejected": sum(1 for s in snippets if not s.valid),
+            "compiles": self.compiles,
+            "hits": self.hits,
+            "history": history,
+            "exec_ms": round(sum(s.total_ms for s in snippets), 3),
+        }
@@ -0,0 +1,81 @@
+import json
+import logging
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Antigravity Startup Trace
+# Process start -> window created -> page loaded -> first paint, per window, appended to a JSON-lines log
+
+TRACE_PATH = os.path.join(os.path.expanduser("~"), ".antigravity", "startup_trace.log")
+
+# Chromium's own paint timings, on the page's clock (performance.timeOrigin is epoch ms)
+FIRST_PAINT_JS = """(() => {
+    const paints = performance.getEntriesByType('paint');
+    const at = (name) => (paints.find((e) => e.name === name) || {}).startTime;
+    return JSON.stringify({ origin: performance.timeOrigin, fp: at('first-paint'), fcp: at('first-contentful-paint') });
+})()"""
+
+logger = logging.getLogger(__name__)
+
+
+def rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+class StartupTrace:
+    def __init__(self, t0, mode, windows=(), path=TRACE_PATH):
+        """t0: time.perf_counter() taken as the first statement of the process"""
+        self.t0 = t0
+        self.epoch0 = time.time() - (time.perf_counter() - t0)
+        self.mode = mode
+        self.path = path
+        self.pending = set(windows)
+        self.marks = []
+        self.written = False
+
+    def mark(self, name):
+        ms = (time.perf_counter() - self.t0) * 1000
+        self._add(name, ms)
+        return ms
+
+    def _add(self, name, ms):
+        self.marks.append({"mark": name, "ms": round(ms, 1), "rss_mb": rss_mb()})
+        logger.info(f"⏱️ startup {name}: {ms:.0f} ms")
+
+    def painted(self, window, paint_json):
+        """Record a window's first paint from FIRST_PAINT_JS output. False if Chromium hasn't painted yet."""
+        try:
+            paint = json.loads(paint_json or "{}")
+        except ValueError:
+            paint = {}
+        at = paint.get("fcp") or paint.get("fp")
+        if at is None:
+            return False
+        self._add(f"{window}.first_paint", paint["origin"] + at - self.epoch0 * 1000)
+        self.done(window)
+        return True
+
+    def done(self, window):
+        self.pending.discard(window)
+        if not self.pending:
+            self.write()
+
+    def write(self):
+        if self.written or not self.path:
+            return
+        self.written = True
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        entry = {"at": round(self.epoch0, 3), "mode": self.mode, "marks": self.marks}
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        logger.info(f"⏱️ startup trace written to {self.path}")
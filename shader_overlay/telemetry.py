@@ -0,0 +1,241 @@
+import csv
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+from collections import deque
+
+# Antigravity Telemetry
+# Engine frame timings in fixed-memory ring buffers, with rolling percentiles kept up to date on every sample
+
+CHANNELS = ("frame_ms", "game_ms", "render_ms", "gpu_ms", "memory_mb")
+CAPACITY = 60000   # one minute at 1 kHz, ~2.9 MB for all channels + timestamps
+WINDOW = 1000      # samples behind p50/p95/p99
+SNAPSHOT_POINTS = 120
+SNAPSHOT_SPAN = 30.0  # seconds of history per snapshot
+PUBLISH_INTERVAL = 0.1
+# Bridge event carrying raw sample batches; not "telemetry", which the bridge conflates to the newest per tick
+SAMPLES_EVENT = "telemetry_samples"
+NAN = float("nan")
+
+# Unreal CSV profiler (csvprofile start/stop) column names per channel, first match wins
+CSV_COLUMNS = {
+    "frame_ms": ("FrameTime",),
+    "game_ms": ("GameThreadTime", "GameThread"),
+    "render_ms": ("RenderThreadTime", "RenderThread", "RenderThreadTime_CriticalPath"),
+    "gpu_ms": ("GPUTime", "GPU/Total"),
+    "memory_mb": ("PhysicalUsedMB", "MemoryUsedMB"),
+}
+
+
+class Channel:
+    """Ring of raw samples plus a sorted copy of the last `window` finite values"""
+
+    def __init__(self, capacity=CAPACITY, window=WINDOW):
+        self.values = array("d", [NAN]) * capacity
+        self.window = min(window, capacity)
+        self.sorted = []
+
+    def push(self, head, count, value):
+        # The sample leaving the percentile window is still in the ring, `window` slots back
+        if count >= self.window:
+            old = self.values[(head - self.window) % len(self.values)]
+            if old == old:  # not NaN
+                del self.sorted[bisect_left(self.sorted, old)]
+        self.values[head] = value
+        if value == value:
+            insort(self.sorted, value)
+
+    def percentile(self, pct):
+        if not self.sorted:
+            return None
+        return self.sorted[min(len(self.sorted) - 1, int(pct / 100 * len(self.sorted)))]
+
+
+class TelemetryStore:
+    def __init__(self, channels=CHANNELS, capacity=CAPACITY, window=WINDOW, points=SNAPSHOT_POINTS,
+                 span=SNAPSHOT_SPAN, clock=time.time):
+        self.channels = {name: Channel(capacity, window) for name in channels}
+        self.times = array("d", [0.0]) * capacity
+        self.capacity = capacity
+        self.clock = clock
+        self.head = 0
+        self.count = 0  # total samples ever; version number for pushers
+        # The downsampled history is aggregated as samples arrive, so snapshots cost O(points), not O(samples)
+        self.bucket_s = span / points
+        self.series = {name: deque(maxlen=points) for name in channels}
+        self.bucket_counts = deque(maxlen=points)
+        self._sums = dict.fromkeys(channels, 0.0)
+        self._ns = dict.fromkeys(channels, 0)
+        self._bucket_n = 0
+        self._bucket_end = None
+        self._latest = dict.fromkeys(channels)  # newest real value; channels sampled less often stay visible
+        self._lock = threading.Lock()
+
+    def ingest(self, sample):
+        """sample: {channel: value, 't': epoch seconds (optional)}; missing channels are recorded as gaps"""
+        with self._lock:
+            self._ingest(sample)
+
+    def ingest_many(self, samples):
+        with self._lock:
+            for sample in samples:
+                self._ingest(sample)
+
+    def _ingest(self, sample):
+        t = sample.get("t") or self.clock()
+        if self._bucket_end is None:
+            self._bucket_end = t + self.bucket_s
+        elif t >= self._bucket_end:
+            self._close_buckets(t)
+        head = self.head
+        count = self.count
+        for name, channel in self.channels.items():
+            value = sample.get(name)
+            if value is None:
+                channel.push(head, count, NAN)
+                continue
+            value = float(value)
+            channel.push(head, count, value)
+            self._latest[name] = value
+            self._sums[name] += value
+            self._ns[name] += 1
+        self.times[head] = t
+        self._bucket_n += 1
+        self.head = (head + 1) % self.capacity
+        self.count = count + 1
+
+    def _close_buckets(self, t):
+        for name, series in self.series.items():
+            n = self._ns[name]
+            series.append(round(self._sums[name] / n, 3) if n else None)
+            self._sums[name] = 0.0
+            self._ns[name] = 0
+        self.bucket_counts.append(self._bucket_n)
+        self._bucket_n = 0
+        # Silence shows up as gaps, at most one full history of them
+        skipped = min(int((t - self._bucket_end) / self.bucket_s), self.bucket_counts.maxlen)
+        for _ in range(skipped):
+            for series in self.series.values():
+                series.append(None)
+            self.bucket_counts.append(0)
+        self._bucket_end += (int((t - self._bucket_end) / self.bucket_s) + 1) * self.bucket_s
+
+    def percentiles(self, channel):
+        with self._lock:
+            c = self.channels[channel]
+            return {"p50": c.percentile(50), "p95": c.percentile(95), "p99": c.percentile(99)}
+
+    def snapshot(self):
+        """Compact view for the UI: per channel latest value, p50/p95/p99 and the bucketed history"""
+        with self._lock:
+            if not self.count:
+                return {"count": 0, "channels": {}}
+            channels = {}
+            for name, channel in self.channels.items():
+                latest = self._latest[name]
+                channels[name] = {
+                    "latest": None if latest is None else round(latest, 3),
+                    "p50": channel.percentile(50),
+                    "p95": channel.percentile(95),
+                    "p99": channel.percentile(99),
+                    "series": list(self.series[name]),
+                }
+            buckets = len(self.bucket_counts)
+            rate = sum(self.bucket_counts) / (buckets * self.bucket_s) if buckets else None
+            return {"count": self.count, "rate_hz": None if rate is None else round(rate, 1),
+                    "bucket_ms": round(self.bucket_s * 1000, 1), "channels": channels}
+
+
+def memory_mb():
+    """Resident set size of this process, or None where it cannot be read cheaply"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+class TelemetrySampler:
+    """Collects samples where they happen (e.g. the editor tick) and hands them to publish(samples) every interval"""
+
+    def __init__(self, publish, interval=PUBLISH_INTERVAL, clock=time.time):
+        self.publish = publish
+        self.interval = interval
+        self.clock = clock
+        self._buffer = []
+        self._last = clock()
+
+    def add(self, sample):
+        now = self.clock()
+        sample.setdefault("t", now)
+        self._buffer.append(sample)
+        if now - self._last >= self.interval:
+            self.flush()
+
+    def flush(self):
+        samples, self._buffer = self._buffer, []
+        self._last = self.clock()
+        if samples:
+            self.publish(samples)
+
+
+class CsvReplay:
+    """Feeds an Unreal CSV profile into a store, paced by its own FrameTime column (speed=0: as fast as possible)"""
+
+    def __init__(self, path, store, speed=1.0, loop=False):
+        self.path = path
+        self.store = store
+        self.speed = speed
+        self.loop = loop
+        self.rows = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="telemetry-replay", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self):
+        while not self._stop.is_set():
+            self._play_once()
+            if not self.loop:
+                break
+
+    def _play_once(self):
+        with open(self.path, newline="") as f:
+            reader = csv.reader(f)
+            header = [name.strip() for name in next(reader, [])]
+            columns = {}
+            for channel, names in CSV_COLUMNS.items():
+                found = next((header.index(n) for n in names if n in header), None)
+                if found is not None:
+                    columns[channel] = found
+            started = time.perf_counter()
+            played_ms = 0.0
+            for row in reader:
+                if self._stop.is_set():
+                    return
+                sample = {}
+                try:
+                    for channel, index in columns.items():
+                        sample[channel] = float(row[index])
+                except (ValueError, IndexError):
+                    continue  # trailing metadata / event rows
+                self.store.ingest(sample)
+                self.rows += 1
+                if self.speed > 0:
+                    played_ms += sample.get("frame_ms") or 0.0
+                    ahead = played_ms / 1000 / self.speed - (time.perf_counter() - started)
+                    if ahead > 0.002:
+                        time.sleep(ahead)
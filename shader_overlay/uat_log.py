@@ -0,0 +1,229 @@
+import calendar
+import re
+import time
+from collections import deque
+
+# Antigravity UAT Log Parser
+# Streams BuildCookRun output into phase timings, warning/error counts and throttled progress events
+
+PHASES = ("build", "cook", "stage", "pak", "archive")
+
+# Host processes (JobExecutor) forward stdout lines with this prefix as structured progress
+PROGRESS_PREFIX = "@@nexus_progress "
+
+PHASE_START = re.compile(r"\*{5,}\s*(BUILD|COOK|STAGE|PACKAGE|ARCHIVE) COMMAND STARTED")
+PHASE_END = re.compile(r"\*{5,}\s*(BUILD|COOK|STAGE|PACKAGE|ARCHIVE) COMMAND COMPLETED")
+PAK_START = re.compile(r"UnrealPak|Creating pak", re.IGNORECASE)
+COOK_PROGRESS = re.compile(r"Cooked packages (\d+) Packages Remain (\d+) Total (\d+)")
+EXIT_CODE = re.compile(r"AutomationTool exiting with ExitCode=(-?\d+)")
+ERROR_LINE = re.compile(r"(?:^|[\s\]])Error:|: error\b|\berror [A-Z]+\d+:|^ERROR:")
+WARNING_LINE = re.compile(r"(?:^|[\s\]])Warning:|: warning\b|\bwarning [A-Z]+\d+:|^WARNING:")
+# Engine-side output (cook commandlet, UnrealPak) is stamped [2024.03.05-14.22.10:123]; UAT reports child run times
+LOG_TIME = re.compile(r"\[(\d{4})\.(\d\d)\.(\d\d)-(\d\d)\.(\d\d)\.(\d\d):(\d{3})\]")
+TOOK = re.compile(r"\bTook (\d+(?:\.\d+)?)s\b")
+
+# UAT command names -> our phases (PACKAGE is where the pak step is reported)
+COMMAND_PHASES = {
+    "BUILD": "build",
+    "COOK": "cook",
+    "STAGE": "stage",
+    "PACKAGE": "pak",
+    "ARCHIVE": "archive",
+}
+
+
+class PhaseStats:
+    def __init__(self, name):
+        self.name = name
+        self.started = None
+        self.ended = None
+        self.lines = 0
+        self.warnings = 0
+        self.errors = 0
+        self.first_stamp = None  # log timestamps seen while the phase was active
+        self.last_stamp = None
+        self.took = 0.0  # "Took Ns to run ..." reported inside the phase
+
+    def stamp(self, at):
+        if self.first_stamp is None:
+            self.first_stamp = at
+        self.last_stamp = at
+
+    def logged(self):
+        """Duration the log itself records, or None when the phase had no stamps or Took lines"""
+        if self.first_stamp is None and not self.took:
+            return None
+        # Both under-count (stamps miss unstamped UAT lines, Took misses UAT's own work): take the larger
+        span = self.last_stamp - self.first_stamp if self.first_stamp is not None else 0.0
+        return max(span, self.took)
+
+    def duration(self, now):
+        if self.started is None:
+            return 0.0
+        logged = self.logged()
+        if logged is not None:
+            return logged
+        return (self.ended if self.ended is not None else now) - self.started
+
+    def to_dict(self, now):
+        return {
+            "started": self.started is not None,
+            "done": self.ended is not None,
+            "seconds": round(self.duration(now), 3),
+            "timing": "log" if self.logged() is not None else "clock",
+            "lines": self.lines,
+            "warnings": self.warnings,
+            "errors": self.errors,
+        }
+
+
+class UATLogParser:
+    def __init__(self, ring_size=200, clock=time.monotonic):
+        self.clock = clock
+        self.started = clock()
+        self.phases = {name: PhaseStats(name) for name in PHASES}
+        self.current = None
+        self.recent = deque(maxlen=ring_size)
+        self.total_lines = 0
+        self.cook_progress = None
+        self.exit_code = None
+        self.first_stamp = None
+        self.last_stamp = None
+
+    def feed(self, line):
+        """Consume one log line. Returns True when the active phase changed."""
+        line = line.rstrip("\r\n")
+        self.total_lines += 1
+        self.recent.append(line)
+        now = self.clock()
+        changed = False
+
+        start = PHASE_START.search(line)
+        end = None if start else PHASE_END.search(line)
+        if start:
+            changed = self._enter(COMMAND_PHASES[start.group(1)], now)
+        elif end:
+            # Stage hands over to pak mid-command, so COMPLETED closes whichever is active
+            if self.current in (COMMAND_PHASES[end.group(1)], "pak"):
+                self.phases[self.current].ended = now
+                self.current = None
+                changed = True
+        elif self.current == "stage" and PAK_START.search(line):
+            changed = self._enter("pak", now)
+
+        stats = self.phases[self.current] if self.current else None
+        if stats is not None:
+            stats.lines += 1
+
+        # Replayed logs arrive in milliseconds: time phases from the log where it says how long things took
+        stamp = LOG_TIME.search(line) if "[" in line else None
+        if stamp:
+            y, mo, d, h, mi, sec, ms = (int(g) for g in stamp.groups())
+            at = calendar.timegm((y, mo, d, h, mi, sec)) + ms / 1000
+            if self.first_stamp is None:
+                self.first_stamp = at
+            self.last_stamp = at
+            if stats is not None:
+                stats.stamp(at)
+        took = TOOK.search(line) if stats is not None and "Took " in line else None
+        if took:
+            stats.took += float(took.group(1))
+
+        if ERROR_LINE.search(line):
+            if stats is not None:
+                stats.errors += 1
+            else:
+                self._orphan("errors")
+        elif WARNING_LINE.search(line):
+            if stats is not None:
+                stats.warnings += 1
+            else:
+                self._orphan("warnings")
+
+        cook = COOK_PROGRESS.search(line)
+        if cook:
+            done, _, total = (int(g) for g in cook.groups())
+            self.cook_progress = done / total if total else None
+
+        code = EXIT_CODE.search(line)
+        if code:
+            self.exit_code = int(code.group(1))
+
+        return changed
+
+    def _enter(self, phase, now):
+        if self.current == phase:
+            return False
+        if self.current is not None:
+            self.phases[self.current].ended = now
+        stats = self.phases[phase]
+        if stats.started is None:
+            stats.started = now
+        stats.ended = None
+        self.current = phase
+        return True
+
+    def _orphan(self, field):
+        # Warnings/errors outside a phase (UAT setup, script compile) are billed to build
+        stats = self.phases["build"]
+        setattr(stats, field, getattr(stats, field) + 1)
+
+    @property
+    def warnings(self):
+        return sum(p.warnings for p in self.phases.values())
+
+    @property
+    def errors(self):
+        return sum(p.errors for p in self.phases.values())
+
+    def snapshot(self, tail=0):
+        now = self.clock()
+        elapsed = now - self.started
+        if self.first_stamp is not None:
+            elapsed = max(elapsed, self.last_stamp - self.first_stamp)
+        event = {
+            "phase": self.current,
+            "elapsed": round(elapsed, 3),
+            "lines": self.total_lines,
+            "warnings": self.warnings,
+            "errors": self.errors,
+            "cook_progress": None if self.cook_progress is None else round(self.cook_progress, 4),
+            "exit_code": self.exit_code,
+            "phases": {name: p.to_dict(now) for name, p in self.phases.items()},
+        }
+        if tail:
+            event["tail"] = list(self.recent)[-tail:]
+        return event
+
+
+class ProgressThrottle:
+    """Publishes parser snapshots at most once per interval (phase changes always go out)."""
+
+    def __init__(self, publish, interval=0.5, clock=time.monotonic):
+        self.publish = publish
+        self.interval = interval
+        self.clock = clock
+        self.last = None
+        self.published = 0
+
+    def offer(self, parser, force=False):
+        now = self.clock()
+        if not force and self.last is not None and now - self.last < self.interval:
+            return False
+        self.last = now
+        self.published += 1
+        self.publish(parser.snapshot())
+        return True
+
+
+def stream(lines, parser, throttle=None, echo=None):
+    """Drive a parser over any line iterable (live pipe or recorded log)."""
+    for line in lines:
+        changed = parser.feed(line)
+        if echo is not None:
+            echo(line)
+        if throttle is not None:
+            throttle.offer(parser, force=changed)
+    if throttle is not None:
+        throttle.offer(parser, force=True)
+    return parser
@@ -1,13 +1,20 @@
 import sys
 import subprocess
 import os
-from PySide6.QtCore import Qt
+import threading
+import time
+from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, 
-                             QPushButton, QWidget, QLabel, QHBoxLayout)
+                             QPushButton, QWidget, QLabel, QHBoxLayout, QScrollArea, QLineEdit)
+from project_index import ProjectIndex, editor_binary
 
 class UnrealLauncherOverlay(QMainWindow):
-    def __init__(self):
+    # (projects, stats) from the background refresh, delivered on the UI thread
+    projects_refreshed = Signal(list, dict)
+
+    def __init__(self, index=None):
         super().__init__()
+        opened = time.perf_counter()
         
         self.setWindowTitle("Unreal Tactical Instance")
         
@@ -49,47 +56,51 @@ class UnrealLauncherOverlay(QMainWindow):
         
         self.layout.addSpacing(40)
         
-        # Projects
-        self.projects = [
-            ("ProjectAnywhereXR", "/Users/joeywalter/Documents/Unreal Projects/ProjectAnywhereXR/ProjectAnywhereXR.uproject", "XR/VR Interactive Demo"),
-            ("PixelStreamingDemo", "/Users/joeywalter/Documents/Unreal Projects/PixelStreamingDemo/PixelStreamingDemo.uproject", "Pixel Streaming Server"),
-            ("UIMaterialLab", "/Users/joeywalter/Documents/Unreal Projects/UIMaterialLab/UIMaterialLab.uproject", "Material & UI Testing"),
-            ("MyProject", "/Users/joeywalter/Documents/Unreal Projects/MyProject/MyProject.uproject", "Default Project Template")
-        ]
-        
-        for name, path, desc in self.projects:
-            btn = QPushButton()
-            btn.setFixedHeight(90)
-            btn.setStyleSheet("""
-                QPushButton {
-                    background: rgba(255,255,255,0.03);
-                    border: 1px solid rgba(255,255,255,0.08);
-                    border-radius: 16px;
-                    text-align: left;
-                    padding-left: 30px;
-                }
-                QPushButton:hover {
-                    background: rgba(59, 130, 246, 0.2);
-                    border-color: #3b82f6;
-                }
-            """)
-            
-            btn_layout = QVBoxLayout(btn)
-            btn_layout.setContentsMargins(30, 15, 30, 15)
-            
-            name_label = QLabel(name)
-            name_label.setStyleSheet("font-size: 18px; font-weight: bold; color: white; border: none; background: transparent;")
-            btn_layout.addWidget(name_label)
-            
-            desc_label = QLabel(desc)
-            desc_label.setStyleSheet("font-size: 11px; color: rgba(255,255,255,0.5); border: none; background: transparent;")
-            btn_layout.addWidget(desc_label)
-            
-            btn.clicked.connect(lambda checked, p=path: self.launch(p))
-            self.layout.addWidget(btn)
-        
-        self.layout.addStretch()
-        
+        # Projects: cached index first, disks re-checked in the background
+        self.index = index or ProjectIndex()
+        self.filter = QLineEdit()
+        self.filter.setPlaceholderText("Filter projects...")
+        self.filter.setStyleSheet("font-size: 14px; color: white; padding: 10px 16px; border-radius: 12px; background: rgba(255,255,255,0.05);")
+        self.filter.textChanged.connect(self.apply_filter)
+        self.layout.addWidget(self.filter)
+
+        self.status = QLabel("")
+        self.status.setStyleSheet("font-size: 10px; color: rgba(255,255,255,0.3); border: none; background: transparent;")
+        self.layout.addWidget(self.status)
+
+        self.list_widget = QWidget()
+        # One stylesheet for every row: per-button setStyleSheet() re-parses CSS hundreds of times on open
+        self.list_widget.setStyleSheet("""
+            QWidget { background: transparent; border: none; }
+            QPushButton {
+                background: rgba(255,255,255,0.03);
+                border: 1px solid rgba(255,255,255,0.08);
+                border-radius: 16px;
+                text-align: left;
+                padding-left: 30px;
+            }
+            QPushButton:hover {
+                background: rgba(59, 130, 246, 0.2);
+                border-color: #3b82f6;
+            }
+            QLabel#name { font-size: 18px; font-weight: bold; color: white; }
+            QLabel#desc { font-size: 11px; color: rgba(255,255,255,0.5); }
+        """)
+        self.list_layout = QVBoxLayout(self.list_widget)
+        self.list_layout.setContentsMargins(0, 0, 0, 0)
+        self.list_layout.setSpacing(20)
+        self.list_layout.addStretch()
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setStyleSheet("background: transparent; border: none;")
+        scroll.setWidget(self.list_widget)
+        self.layout.addWidget(scroll, 1)
+
+        self.buttons = {}  # uproject path -> (button, search text)
+        self.populate(self.index.projects())
+        self.projects_refreshed.connect(self.on_refreshed)
+        threading.Thread(target=self.refresh_index, daemon=True).start()
+
         # Close button
         close_btn = QPushButton("ESC TO CLOSE")
         close_btn.setStyleSheet("background: transparent; color: rgba(255,255,255,0.3); border: none; font-size: 10px;")
@@ -98,9 +109,62 @@ class UnrealLauncherOverlay(QMainWindow):
         
         # Drag support
         self.old_pos = None
+        print(f"⏱️ Launcher ready in {(time.perf_counter() - opened) * 1000:.0f} ms ({len(self.buttons)} cached projects)")
+
+    def project_button(self, project):
+        btn = QPushButton()
+        btn.setFixedHeight(90)
+        
+        btn_layout = QVBoxLayout(btn)
+        btn_layout.setContentsMargins(30, 15, 30, 15)
+        
+        name_label = QLabel(project["name"])
+        name_label.setObjectName("name")
+        btn_layout.addWidget(name_label)
+        
+        # .uproject contents are only read on launch; show them if an earlier launch already did
+        details = project["details"]
+        desc = os.path.relpath(project["dir"], os.path.dirname(project["root"]))
+        if details:
+            desc = " · ".join(filter(None, [details["description"], f"UE {details['engine']}" if details["engine"] else "",
+                                            f"{len(details['plugins'])} plugins", desc]))
+        desc_label = QLabel(desc)
+        desc_label.setObjectName("desc")
+        btn_layout.addWidget(desc_label)
+        
+        btn.clicked.connect(lambda checked, p=project["path"]: self.launch(p))
+        return btn
+
+    def populate(self, projects):
+        for btn, _ in self.buttons.values():
+            btn.deleteLater()
+        self.buttons = {}
+        for position, project in enumerate(projects):
+            btn = self.project_button(project)
+            self.list_layout.insertWidget(position, btn)
+            self.buttons[project["path"]] = (btn, f"{project['name']} {project['dir']}".lower())
+        self.apply_filter(self.filter.text())
+        if not projects:
+            self.status.setText(f"Scanning {', '.join(self.index.roots)}...")
+
+    def apply_filter(self, text):
+        text = text.lower().strip()
+        for btn, haystack in self.buttons.values():
+            btn.setVisible(not text or text in haystack)
+
+    def refresh_index(self):
+        projects, stats = self.index.refresh()
+        self.projects_refreshed.emit(projects, stats)
+
+    def on_refreshed(self, projects, stats):
+        if stats["listed"] or len(projects) != len(self.buttons):
+            self.populate(projects)
+        self.status.setText(f"{len(projects)} projects in {len(self.index.roots)} roots · "
+                            f"checked {stats['checked']} folders, re-listed {stats['listed']} in {stats['seconds'] * 1000:.0f} ms")
 
     def launch(self, project_path):
-        editor = "/Users/Shared/Epic Games/UE_5.7/Engine/Binaries/Mac/UnrealEditor.app/Contents/MacOS/UnrealEditor"
+        details = self.index.details(project_path)
+        editor = editor_binary(details["engine"])
         cmd = [editor, project_path, "-skipcompile"]
         try:
             subprocess.Popen(cmd)
@@ -1,15 +1,166 @@
 import unreal
+import threading
 import time
 import json
+from telemetry import TelemetryStore, TelemetrySampler, SAMPLES_EVENT, memory_mb
 
 # Antigravity Live Editing Engine
 # This script runs INSIDE the Unreal process or via the Remote Control API
 
+COLOR_PARAM = "Color"
+# A label nobody has may trigger a full re-index at most this often (catches renames, which have no event)
+MISS_REBUILD_SECONDS = 1.0
+REPORT_EVERY_TICKS = 600
+MEMORY_EVERY_TICKS = 30
+
+# Delegates that change which actors exist; anything but a plain drop re-indexes on next use
+ACTOR_EVENTS = ("on_delete_actors_end", "on_duplicate_actors_end", "on_edit_paste_actors_end", "on_edit_cut_actors_end")
+LEVEL_EVENTS = ("on_map_opened", "on_map_changed")
+HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+
+def color_value(value):
+    """LinearColor, (r, g, b[, a]) in 0..1, {'r','g','b','a'} or '#RGB[A]' / '#RRGGBB[AA]' -> (r, g, b, a).
+    Anything else (named colours included) raises ValueError."""
+    if isinstance(value, unreal.LinearColor):
+        return (value.r, value.g, value.b, value.a)
+    if isinstance(value, str):
+        hex_digits = value[1:] if value.startswith("#") else value
+        if len(hex_digits) in (3, 4):
+            hex_digits = "".join(c * 2 for c in hex_digits)
+        if len(hex_digits) not in (6, 8) or any(c not in HEX_DIGITS for c in hex_digits):
+            raise ValueError(f"not a hex colour: {value!r}")
+        channels = [int(hex_digits[i:i + 2], 16) / 255.0 for i in range(0, len(hex_digits), 2)]
+        return tuple(channels + [1.0] * (4 - len(channels)))
+    try:
+        if isinstance(value, dict):
+            channels = (value["r"], value["g"], value["b"], value.get("a", 1.0))
+        else:
+            channels = tuple(value)
+            if len(channels) not in (3, 4):
+                raise ValueError
+        return tuple(float(c) for c in channels) + (1.0,) * (4 - len(channels))
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"not a colour: {value!r}") from None
+
+
+class ActorLabelIndex:
+    """label -> [actors], kept current by editor delegates and verified on every lookup"""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.actor_subsystem = unreal.get_editor_subsystem(unreal.EditorActorSubsystem)
+        self.level_subsystem = unreal.get_editor_subsystem(unreal.LevelEditorSubsystem)
+        self._by_label = {}
+        self._dirty = True
+        self._built_at = None
+        self._bound = []
+        self.on_level_changed = None
+        self.on_rebuilt = None  # fn(actors) after every full re-index
+        self.rebuilds = 0
+        self.rebuild_ms = 0.0
+
+    def bind(self):
+        for owner, names, callback in ((self.actor_subsystem, ACTOR_EVENTS, self.mark_dirty),
+                                       (self.actor_subsystem, ("on_new_actors_dropped",), self.on_actors_dropped),
+                                       (self.level_subsystem, LEVEL_EVENTS, self.on_level_event)):
+            for name in names:
+                delegate = getattr(owner, name, None)
+                if delegate is not None:
+                    delegate.add_callable(callback)
+                    self._bound.append((delegate, callback))
+
+    def unbind(self):
+        for delegate, callback in self._bound:
+            delegate.remove_callable(callback)
+        self._bound = []
+
+    def mark_dirty(self, *args):
+        self._dirty = True
+
+    def on_level_event(self, *args):
+        self._dirty = True
+        if self.on_level_changed:
+            self.on_level_changed()
+
+    def on_actors_dropped(self, objects, actors):
+        if self._dirty:
+            return
+        for actor in actors:
+            self._by_label.setdefault(actor.get_actor_label(), []).append(actor)
+
+    def rebuild(self):
+        start = self.clock()
+        by_label = {}
+        actors = self.actor_subsystem.get_all_level_actors()
+        for actor in actors:
+            by_label.setdefault(actor.get_actor_label(), []).append(actor)
+        self._by_label = by_label
+        if self.on_rebuilt:
+            self.on_rebuilt(actors)
+        self._dirty = False
+        self._built_at = self.clock()
+        self.rebuilds += 1
+        self.rebuild_ms = (self._built_at - start) * 1000.0
+
+    def lookup(self, label):
+        if self._dirty:
+            self.rebuild()
+        actors = self._by_label.get(label)
+        if actors and all(self._still(actor, label) for actor in actors):
+            return actors
+        # Deleted or renamed behind our back, or a brand-new label: one re-index, rate-limited for misses
+        if actors or self.clock() - self._built_at >= MISS_REBUILD_SECONDS:
+            self.rebuild()
+            return self._by_label.get(label, [])
+        return []
+
+    @staticmethod
+    def _still(actor, label):
+        try:
+            return actor.get_actor_label() == label
+        except Exception:  # destroyed actor
+            return False
+
+    def __len__(self):
+        return sum(len(actors) for actors in self._by_label.values())
+
+
 class LiveEditor:
-    def __init__(self):
+    def __init__(self, clock=time.perf_counter):
         self.editor_subsystem = unreal.get_editor_subsystem(unreal.UnrealEditorSubsystem)
+        self.clock = clock
+        self.index = ActorLabelIndex(clock)
+        self.index.on_level_changed = self.forget_materials
+        self.index.on_rebuilt = self.prune_materials
+        self._actor_mids = {}  # actor path -> (actor, [(slot key, MaterialInstanceDynamic)])
+        self._applied = {}     # slot key -> {param: last value set}
+        self._pending = {}     # (label, param) -> value, coalesced until the next tick
+        self._lock = threading.Lock()
+        self._handle = None
+        self.counters = {"updates": 0, "applied": 0, "unchanged": 0, "missing": 0, "invalid": 0,
+                         "mids_created": 0, "mids_reused": 0}
+        self.ticks = 0
+        self.last_tick_ms = 0.0
+        self.max_tick_ms = 0.0
+        self.total_tick_ms = 0.0
+        # Frame times from the Slate tick (+ process memory now and then), local and optionally streamed out
+        self.telemetry = TelemetryStore()
+        self.telemetry_sampler = None
         print("📡 Antigravity Python Live Editor Linked")
 
+    def start(self):
+        """Apply queued updates from the Slate tick, one batch per frame"""
+        self.index.bind()
+        if self._handle is None:
+            self._handle = unreal.register_slate_post_tick_callback(self.tick)
+
+    def stop(self):
+        self.index.unbind()
+        if self._handle is not None:
+            unreal.unregister_slate_post_tick_callback(self._handle)
+            self._handle = None
+
     def spawn_umg_widget_in_world(self, name="TacticalWidget", text="LIVE DATA"):
         # AAA UMG Spawning Logic (Conceptual)
         print(f"📡 Spawning World-Space UMG: {name} with text '{text}'")
@@ -21,18 +172,164 @@ class LiveEditor:
     def enrich_level_with_ui(self):
         # Automatically populate the scene with UMG tactical assets
         self.spawn_umg_widget_in_world("SectorMonitor", "SECTOR 7G: STABLE")
-        self.spawn_umg_widget_in_world("PerfOverlay", "FPS: 120 | MS: 8.3")
+        self.spawn_umg_widget_in_world("PerfOverlay", self.perf_text())
         self.spawn_umg_widget_in_world("MetalLink", "METAL 3: ACTIVE")
 
     def update_metal_pipeline(self, actor_name, color):
         # Find actor and update its material (Directly affecting Metal buffers)
-        actors = unreal.EditorLevelLibrary.get_all_level_actors()
-        for actor in actors:
-            if actor.get_actor_label() == actor_name:
-                # Set dynamic material instance value
-                pass
+        return self.apply_updates([(actor_name, COLOR_PARAM, color)])
+
+    def queue(self, label, param, value):
+        """Thread-safe; the last value per (label, param) wins and is applied on the next tick"""
+        with self._lock:
+            self._pending[(label, param)] = value
+
+    def stream_telemetry(self, publish):
+        """publish(samples) is handed a batch of tick samples every TelemetrySampler interval"""
+        self.telemetry_sampler = TelemetrySampler(publish)
+
+    def record_frame(self, delta_seconds):
+        sample = {"frame_ms": delta_seconds * 1000.0}
+        if self.ticks % MEMORY_EVERY_TICKS == 0:
+            sample["memory_mb"] = memory_mb()
+        self.telemetry.ingest(sample)
+        if self.telemetry_sampler is not None:
+            self.telemetry_sampler.add(sample)
+
+    def perf_text(self):
+        frame = self.telemetry.percentiles("frame_ms")
+        if frame["p50"] is None:
+            return "FPS: -- | MS: --"
+        return f"FPS: {1000.0 / frame['p50']:.0f} | MS: {frame['p50']:.1f} (p99 {frame['p99']:.1f})"
+
+    def tick(self, delta_seconds=0.0):
+        if delta_seconds:
+            self.record_frame(delta_seconds)
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        start = self.clock()
+        if pending:
+            self.apply_updates((label, param, value) for (label, param), value in pending.items())
+        self.last_tick_ms = (self.clock() - start) * 1000.0
+        self.max_tick_ms = max(self.max_tick_ms, self.last_tick_ms)
+        self.total_tick_ms += self.last_tick_ms
+        self.ticks += 1
+        if self.ticks % REPORT_EVERY_TICKS == 0:
+            self.report()
+
+    def apply_updates(self, updates):
+        """[(label, param, value)] in one pass: each label resolved once, MIDs created once and reused,
+        values equal to what the MID already has are skipped. Colours: see color_value(); numbers: scalars."""
+        by_label = {}
+        count = 0
+        invalid = []
+        for label, param, value in updates:
+            count += 1
+            # A bad value fails its own update only; the rest of the tick's batch still applies
+            params = by_label.setdefault(label, {})
+            try:
+                params[param] = self._normalize(value)
+            except ValueError as e:
+                params.pop(param, None)
+                invalid.append({"label": label, "param": param, "error": str(e)})
+        self.counters["updates"] += count
+        result = {"updates": count, "applied": 0, "unchanged": 0, "missing": [], "invalid": invalid}
+        for label, params in by_label.items():
+            if not params:
+                continue
+            actors = self.index.lookup(label)
+            if not actors:
+                result["missing"].append(label)
+                continue
+            params = [(param, *normalized) for param, normalized in params.items()]
+            for actor in actors:
+                for key, mid in self._mids_for(actor):
+                    for param, is_color, value in params:
+                        applied = self._applied.setdefault(key, {})
+                        if applied.get(param) == value:
+                            result["unchanged"] += 1
+                            continue
+                        if is_color:
+                            mid.set_vector_parameter_value(param, unreal.LinearColor(*value))
+                        else:
+                            mid.set_scalar_parameter_value(param, value)
+                        applied[param] = value
+                        result["applied"] += 1
+        self.counters["applied"] += result["applied"]
+        self.counters["unchanged"] += result["unchanged"]
+        self.counters["missing"] += len(result["missing"])
+        self.counters["invalid"] += len(invalid)
+        return result
+
+    @staticmethod
+    def _normalize(value):
+        if isinstance(value, (int, float)):
+            return False, float(value)
+        return True, color_value(value)
+
+    def _mids_for(self, actor):
+        path = actor.get_path_name()
+        cached = self._actor_mids.get(path)
+        if cached is not None:
+            return cached[1]
+        mids = []
+        for component in actor.get_components_by_class(unreal.MeshComponent):
+            component_path = component.get_path_name()
+            for slot in range(component.get_num_materials()):
+                material = component.get_material(slot)
+                if isinstance(material, unreal.MaterialInstanceDynamic):
+                    self.counters["mids_reused"] += 1
+                    mid = material
+                else:
+                    mid = component.create_dynamic_material_instance(slot)
+                    self.counters["mids_created"] += 1
+                mids.append(((component_path, slot), mid))
+        self._actor_mids[path] = (actor, mids)
+        return mids
+
+    def forget_materials(self):
+        # A new map means new components; stale MIDs must not be written to
+        self._actor_mids = {}
+        self._applied = {}
+
+    def prune_materials(self, actors):
+        # After a re-index: forget deleted actors, and actors replaced by a new one at the same path, so writes
+        # never go to a destroyed actor's MIDs and the cache cannot outgrow the level
+        if not self._actor_mids:
+            return
+        level = {actor.get_path_name(): actor for actor in actors}
+        for path, (actor, mids) in list(self._actor_mids.items()):
+            if level.get(path) is not actor:
+                del self._actor_mids[path]
+                for key, _ in mids:
+                    self._applied.pop(key, None)
+
+    def stats(self):
+        return {
+            **self.counters,
+            "indexed_actors": len(self.index),
+            "index_rebuilds": self.index.rebuilds,
+            "index_rebuild_ms": round(self.index.rebuild_ms, 2),
+            "ticks": self.ticks,
+            "last_tick_ms": round(self.last_tick_ms, 3),
+            "avg_tick_ms": round(self.total_tick_ms / self.ticks, 3) if self.ticks else 0.0,
+            "max_tick_ms": round(self.max_tick_ms, 3),
+        }
+
+    def report(self):
+        s = self.stats()
+        print(f"⏱️ Live sync: {s['avg_tick_ms']:.2f} ms/tick avg, {s['max_tick_ms']:.2f} max | "
+              f"{s['applied']} set, {s['unchanged']} unchanged, {s['missing']} missing, {s['invalid']} invalid | "
+              f"{s['indexed_actors']} actors indexed ({s['index_rebuilds']} rebuilds)")
 
 if __name__ == "__main__":
     engine = LiveEditor()
     # Continuous loop for live sync with Dashboard
+    engine.start()
+    try:
+        from nexus_client import ThreadedNexusClient
+        feed = ThreadedNexusClient(events=False, source="unreal_live_editor")
+        engine.stream_telemetry(lambda samples: feed.publish(SAMPLES_EVENT, {"samples": samples}))
+    except ImportError:  # aiohttp missing in the editor's Python: telemetry stays local
+        pass
     print("🚀 Monitoring Dashboard Data Feed...")
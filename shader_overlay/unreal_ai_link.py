@@ -1,105 +1,347 @@
 import unreal
-import requests
 import json
+import time
+from response_cache import ResponseCache
+try:
+    from nexus_client import ThreadedNexusClient, AIResponse, AIChat, AddCard
+except ImportError:  # aiohttp is not in Unreal's embedded Python: plain HTTP to the bridge, no live events
+    ThreadedNexusClient = None
+    from nexus_http import BlockingNexusClient
+from snippet_store import SnippetStore, SnippetError, CodeBlockScanner, extract_code
+from nexus_async import GameThreadDispatcher, AsyncNexusClient, MAX_IN_FLIGHT, DEFAULT_TIMEOUT, wait_result
+from cpp_builder import CppBatcher
 
 # CONFIG
-BRIDGE_URL = "http://localhost:3002/chat"
+CPP_MODULE = "MyProject"
+EXECUTION_PROMPT = "SYSTEM INSTRUCTION: You are an Unreal Engine 5.7 Python Expert. Return ONLY valid python code that uses the 'unreal' module to achieve the goal. No explanation.\n\nUSER REQUEST: {message}"
+
+def strip_code_fences(ai_code):
+    # Prefer the fenced block (replies often wrap it in prose), then strip any stray markdown fences
+    return extract_code(ai_code).replace("```python", "").replace("```", "").strip()
 
 class UnrealNexusAI:
-    def __init__(self):
+    def __init__(self, max_in_flight=MAX_IN_FLIGHT, timeout=DEFAULT_TIMEOUT):
         unreal.log("🛡️ Antigravity-UnrealEngine-Max: NL Agent Builder Online")
-        
-    def talk(self, message):
-        """Send message and EXECUTE code returned by Gemini"""
-        try:
-            # We explicitly tell Gemini it has access to the 'unreal' python API
-            payload = {
-                "message": f"SYSTEM INSTRUCTION: You are an Unreal Engine 5.7 Python Expert. Return ONLY valid python code that uses the 'unreal' module to achieve the goal. No explanation.\n\nUSER REQUEST: {message}",
-                "context": {
-                    "source": "unreal_editor_live",
-                    "mode": "execution"
-                }
+        # Repeat requests are answered from disk instead of a model round trip
+        self.cache = ResponseCache()
+        # Generated snippets are compiled and AST-checked once per distinct source
+        self.snippets = SnippetStore()
+
+        # HTTP runs on worker threads; exec() and file writes run from the Slate tick on the game thread
+        self.dispatcher = GameThreadDispatcher()
+        self.dispatcher.start()
+        self.client = AsyncNexusClient(self.dispatcher, self.fetch, max_in_flight=max_in_flight, timeout=timeout)
+        # Generated C++ is written on change only and compiled once per batch (see cpp_builder)
+        self.cpp = None
+
+        # Shared pooled HTTP + live WebSocket events; bridge events are logged from the game thread
+        if ThreadedNexusClient is not None:
+            self.bridge = ThreadedNexusClient(source="unreal_editor_live", read_timeout=timeout)
+            for event_type in (AIResponse, AIChat, AddCard):
+                self.bridge.on(event_type, self.on_bridge_event, via=self.dispatcher.post)
+        else:
+            unreal.log_warning("⚠️ aiohttp not installed: Nexus requests use plain HTTP, live bridge events disabled")
+            self.bridge = BlockingNexusClient(source="unreal_editor_live", read_timeout=timeout)
+
+    def fetch(self, payload, timeout, on_token=None):
+        """Worker thread: one streamed bridge round trip (on_token runs on the client loop thread)"""
+        # One deadline for the whole streamed reply; cancel() aborts it and frees the worker
+        text, stats = wait_result(self.bridge.chat(payload["message"], payload.get("context"), on_token,
+                                                   use_cache=False, stream=True, timeout=timeout), timeout)
+        if stats["ttft"] is not None:
+            self.dispatcher.post(unreal.log, f"⏱️ Nexus TTFT {stats['ttft'] * 1000:.0f} ms | "
+                                             f"total {stats['total'] * 1000:.0f} ms")
+        return text
+
+    def on_bridge_event(self, event):
+        # Replies to our own requests are handled by the request callbacks
+        if event.mine:
+            return
+        unreal.log(f"📡 Nexus: {event.describe()}")
+
+    def request(self, message, payload, mode, on_done, use_cache=True, timeout=None, on_token=None):
+        """Queue a bridge request (or serve it from the response cache). on_done(text) runs on the game thread."""
+        cached = self.cache.get(message, mode) if use_cache else None
+        if cached is not None:
+            unreal.log(f"⚡ Nexus cache hit ({mode})")
+
+        def fetch_and_cache(payload, timeout):
+            text = self.fetch(payload, timeout, on_token)
+            if text:
+                self.cache.put(message, mode, text)
+            return text
+
+        def on_error(request, error):
+            unreal.log_error(f"❌ Failed to reach Nexus Bridge ({request.state}): {str(error)}")
+
+        return self.client.submit(message, payload, mode, lambda request, text: on_done(text), on_error,
+                                  cached=cached, timeout=timeout, fetch=fetch_and_cache)
+
+    def talk(self, message, use_cache=True, timeout=None):
+        """Send message and EXECUTE code returned by Gemini (returns immediately with a NexusRequest)"""
+        # We explicitly tell Gemini it has access to the 'unreal' python API
+        payload = {
+            "message": EXECUTION_PROMPT.format(message=message),
+            "context": {
+                "source": "unreal_editor_live",
+                "mode": "execution"
             }
-            
-            response = requests.post(BRIDGE_URL, json=payload)
-            if response.status_code == 200:
-                ai_code = response.json().get('response', '')
-                
-                # Strip markdown code blocks if present
-                clean_code = ai_code.replace("```python", "").replace("```", "").strip()
-                
-                unreal.log(f"🚀 EXECUTING NEXUS CODE:\n{clean_code}")
-                
-                # THE LIVE EXECUTION STEP
+        }
+        requests = []
+        # Every block of one reply runs in order in one namespace, so later blocks see what earlier ones defined
+        namespace = self.namespace()
+        failed = []
+
+        def run_block(code):
+            if requests[0].cancelled:
+                return
+            if failed:
+                unreal.log_warning("⏭️ Skipping a later code block: an earlier block of this reply failed")
+                return
+            if not self.execute_code(code, message, namespace):
+                failed.append(code)
+
+        def on_block(code):
+            # Client loop thread: compile as soon as each code block closes, then run it on the next tick
+            # instead of waiting for the rest of the reply
+            try:
+                self.snippets.prepare(code)
+            except SnippetError:
+                pass  # execute_code reports it
+            self.dispatcher.post(lambda: run_block(code))
+
+        scanner = CodeBlockScanner(on_block)
+
+        def on_done(text):
+            if scanner.code is None:
+                self.execute_code(text, message)
+
+        requests.append(self.request(message, payload, "execution", on_done, use_cache, timeout, on_token=scanner.feed))
+        return requests[0]
+
+    def implement_many(self, messages, use_cache=True, timeout=None, stop_on_error=False):
+        """One bridge round trip for many requests; every snippet compiles before any runs, in one undo transaction"""
+        messages = list(messages)
+        responses = [self.cache.get(m, "execution") if use_cache else None for m in messages]
+        missing = [i for i, r in enumerate(responses) if r is None]
+        if len(missing) < len(messages):
+            unreal.log(f"⚡ Nexus cache hits: {len(messages) - len(missing)}/{len(messages)}")
+
+        def fetch_batch(payload, timeout):
+            # Worker thread
+            results = list(responses)
+            if missing:
+                fetched = self.fetch_many([messages[i] for i in missing], timeout)
+                for i, text in zip(missing, fetched):
+                    results[i] = text
+                    if isinstance(text, str) and text:
+                        self.cache.put(messages[i], "execution", text)
+            return results
+
+        def on_done(request, results):
+            request.report = self.run_batch(messages, results, stop_on_error)
+
+        def on_error(request, error):
+            unreal.log_error(f"❌ Nexus batch failed ({request.state}): {str(error)}")
+
+        payload = {"items": len(messages)}
+        return self.client.submit(f"batch[{len(messages)}]", payload, "execution_batch", on_done, on_error,
+                                  cached=responses if not missing else None, timeout=timeout, fetch=fetch_batch)
+
+    def fetch_many(self, messages, timeout):
+        """Worker thread: POST /chat/batch (the client falls back to parallel /chat on older bridges)"""
+        context = {"source": "unreal_editor_live", "mode": "execution"}
+        items = [{"message": EXECUTION_PROMPT.format(message=m)} for m in messages]
+        return wait_result(self.bridge.chat_batch(items, context, timeout), timeout)
+
+    def run_batch(self, messages, responses, stop_on_error=False):
+        """Game thread: compile all, then exec in order inside one editor transaction"""
+        report = []
+        compiled = []
+        for i, (message, text) in enumerate(zip(messages, responses)):
+            item = {"index": i, "message": message, "ok": False, "error": None, "compile_ms": 0.0, "exec_ms": 0.0}
+            report.append(item)
+            if isinstance(text, Exception) or text is None:
+                item["error"] = f"bridge: {text}"
+                continue
+            start = time.perf_counter()
+            try:
+                compiled.append((item, self.snippets.prepare(strip_code_fences(text), f"<nexus:{i}>")))
+            except SnippetError as e:
+                item["error"] = f"rejected: {e}"
+            item["compile_ms"] = (time.perf_counter() - start) * 1000
+
+        failed = [item for item in report if item["error"]]
+        if failed:
+            unreal.log_error(f"❌ Nexus batch aborted before execution: {len(failed)}/{len(report)} snippets unusable")
+            self.log_batch(report)
+            return report
+
+        # Snippets share a namespace so later requests can build on earlier ones
+        namespace = self.namespace("__nexus_batch__")
+        with unreal.ScopedEditorTransaction(f"Nexus: {len(compiled)} requests"):
+            for item, snippet in compiled:
                 try:
-                    exec(clean_code)
-                    unreal.log("✅ EXECUTION SUCCESSFUL")
+                    self.snippets.run(snippet, namespace, label=item["message"])
+                    item["ok"] = True
                 except Exception as e:
-                    unreal.log_error(f"❌ Execution Failed: {str(e)}")
-                    
-            else:
-                unreal.log_error(f"❌ Bridge Error: {response.status_code}")
+                    item["error"] = f"exec: {e}"
+                item["exec_ms"] = snippet.last_ms
+                if item["error"] and stop_on_error:
+                    break
+
+        self.log_batch(report)
+        return report
+
+    def log_batch(self, report):
+        ok = sum(1 for item in report if item["ok"])
+        unreal.log(f"📦 Nexus batch: {ok}/{len(report)} executed")
+        for item in report:
+            status = "✅" if item["ok"] else "❌"
+            unreal.log(f"  {status} [{item['index']}] {item['message'][:40]} "
+                       f"(compile {item['compile_ms']:.1f} ms, exec {item['exec_ms']:.1f} ms)"
+                       f"{' ' + item['error'] if item['error'] else ''}")
+
+    def namespace(self, name="__nexus__"):
+        return {"unreal": unreal, "__name__": name}
+
+    def execute_code(self, ai_code, label=None, namespace=None):
+        """Returns True when the code ran without raising"""
+        clean_code = strip_code_fences(ai_code)
+
+        unreal.log(f"🚀 EXECUTING NEXUS CODE:\n{clean_code}")
+
+        # THE LIVE EXECUTION STEP
+        try:
+            snippet = self.snippets.run(clean_code, namespace if namespace is not None else self.namespace(), label)
+            unreal.log(f"✅ EXECUTION SUCCESSFUL ({snippet.last_ms:.1f} ms, run #{snippet.runs})")
+            return True
+        except SnippetError as e:
+            unreal.log_error(f"❌ Snippet rejected before execution: {str(e)}")
         except Exception as e:
-            unreal.log_error(f"❌ Failed to reach Nexus Bridge: {str(e)}")
+            unreal.log_error(f"❌ Execution Failed: {str(e)}")
+        return False
 
-    def implement_cpp(self, message):
+    def replay(self, index=-1):
+        """Re-run a snippet from the history without asking the bridge again"""
+        try:
+            snippet = self.snippets.replay(index, self.namespace())
+            unreal.log(f"🔁 Replayed {snippet.digest} ({snippet.last_ms:.1f} ms)")
+        except KeyError as e:
+            unreal.log_error(f"❌ {str(e)}")
+        except Exception as e:
+            unreal.log_error(f"❌ Replay Failed: {str(e)}")
+
+    def implement_cpp(self, message, use_cache=True, timeout=None):
         """Handle C++ Generation, File Writing, and Live Coding Trigger"""
         unreal.log("🛡️ Antigravity Nexus: Initiating C++ Tactical Build...")
-        
-        try:
-            payload = {
-                "message": f"SYSTEM INSTRUCTION: You are a Senior Unreal C++ Architect. Return a JSON object with 'header_code', 'source_code', and 'filename' (e.g. MyActor). No explanation.\n\nUSER REQUEST: {message}",
-                "context": {
-                    "source": "unreal_editor_cpp",
-                    "mode": "cpp_generation"
-                }
+
+        payload = {
+            "message": f"SYSTEM INSTRUCTION: You are a Senior Unreal C++ Architect. Return a JSON object with 'header_code', 'source_code', and 'filename' (e.g. MyActor). No explanation.\n\nUSER REQUEST: {message}",
+            "context": {
+                "source": "unreal_editor_cpp",
+                "mode": "cpp_generation"
             }
-            
-            response = requests.post(BRIDGE_URL, json=payload)
-            if response.status_code == 200:
-                data = json.loads(response.json().get('response', '{}'))
-                
-                h_code = data.get('header_code')
-                cpp_code = data.get('source_code')
-                filename = data.get('filename')
-                
-                # Use Unreal Python to find the source directory
-                proj_dir = unreal.Paths.project_dir()
-                source_dir = unreal.Paths.combine(unreal.Paths.convert_relative_path_to_full(proj_dir), "Source/MyProject")
-                
-                if not unreal.Paths.directory_exists(source_dir):
-                    unreal.log_error(f"❌ Source directory not found: {source_dir}")
-                    return
-
-                # Write files
-                h_path = unreal.Paths.combine(source_dir, f"{filename}.h")
-                cpp_path = unreal.Paths.combine(source_dir, f"{filename}.cpp")
-                
-                with open(h_path, 'w') as f: f.write(h_code)
-                with open(cpp_path, 'w') as f: f.write(cpp_code)
-                
-                unreal.log(f"✅ C++ Files Written: {filename}.h/cpp")
-                
-                # Trigger Live Coding Recompile
-                unreal.log("⚙️ Triggering Live Coding Recompile...")
-                unreal.EditorTests.recompile_game_code() # Or use subprocess to trigger shortcut
-                
-            else:
-                unreal.log_error(f"❌ Bridge Error: {response.status_code}")
+        }
+        return self.request(message, payload, "cpp_generation", self.write_cpp, use_cache, timeout)
+
+    def cpp_batcher(self):
+        """Created on first use: the project's Source/<CPP_MODULE> tree, built from the Slate tick"""
+        if self.cpp is None:
+            proj_dir = unreal.Paths.convert_relative_path_to_full(unreal.Paths.project_dir())
+            source_dir = unreal.Paths.combine(proj_dir, f"Source/{CPP_MODULE}")
+            if not unreal.Paths.directory_exists(source_dir):
+                raise FileNotFoundError(f"Source directory not found: {source_dir}")
+            self.cpp = CppBatcher(source_dir, self.recompile, self.log_cpp_batch)
+            self.cpp.start()
+        return self.cpp
+
+    def recompile(self):
+        # Trigger Live Coding Recompile
+        unreal.log("⚙️ Triggering Live Coding Recompile...")
+        unreal.EditorTests.recompile_game_code() # Or use subprocess to trigger shortcut
+
+    def write_cpp(self, raw):
+        """Game thread: queue the generated class; the batch is written and compiled after a quiet period"""
+        try:
+            data = json.loads(raw or '{}')
+            batcher = self.cpp_batcher()
+            queued = batcher.queue(data.get('filename'), data.get('header_code'), data.get('source_code'))
+            unreal.log(f"🧱 C++ queued: {data['filename']}.h/cpp ({queued} in batch, "
+                       f"building in {batcher.due_in():.1f}s)")
         except Exception as e:
             unreal.log_error(f"❌ C++ Build Failed: {str(e)}")
 
+    def flush_cpp(self):
+        """Write and compile the queued C++ batch now instead of waiting for the debounce"""
+        return self.cpp.flush() if self.cpp is not None else None
+
+    def log_cpp_batch(self, report):
+        if report["written"]:
+            unreal.log(f"✅ C++ Files Written: {', '.join(report['written'])}")
+        if report["unchanged"]:
+            unreal.log(f"⏭️ C++ unchanged on disk, not rewritten: {', '.join(report['unchanged'])}")
+        if report["recompiled"]:
+            unreal.log(f"⏱️ Live Coding batch: {len(report['compiled'])} classes, "
+                       f"write {report['write_ms']:.1f} ms, compile {report['compile_ms']:.0f} ms")
+        elif not report["errors"]:
+            unreal.log("⚡ C++ batch identical to disk: recompile skipped")
+        for error in report["errors"]:
+            unreal.log_error(f"❌ C++ Build Failed: {error}")
+
+    def shutdown(self):
+        if self.cpp is not None:
+            self.cpp.flush()
+            self.cpp.stop()
+        self.client.shutdown()
+        self.snippets.flush()
+        self.cache.flush()
+        self.bridge.close()
+        self.dispatcher.stop()
+
 # Global instance for the session
 if 'nexus_ai' not in globals():
     nexus_ai = UnrealNexusAI()
 
-def implement(msg):
+def implement(msg, use_cache=True, timeout=None):
     """Call this from Unreal Python Console: implement('spawn 10 red spheres')"""
-    nexus_ai.talk(msg)
+    return nexus_ai.talk(msg, use_cache, timeout)
+
+def implement_many(msgs, use_cache=True, timeout=None, stop_on_error=False):
+    """Call this from Unreal Python Console: implement_many(['add a floor', 'spawn 10 red spheres on it'])"""
+    return nexus_ai.implement_many(msgs, use_cache, timeout, stop_on_error)
 
-def implement_cpp(msg):
+def implement_cpp(msg, use_cache=True, timeout=None):
     """Call this from Unreal Python Console: implement_cpp('create a new C++ component that follows the player')"""
-    nexus_ai.implement_cpp(msg)
+    return nexus_ai.implement_cpp(msg, use_cache, timeout)
+
+def flush_cpp():
+    """Build queued C++ classes now: one write pass and one Live Coding recompile"""
+    return nexus_ai.flush_cpp()
+
+def cpp_stats():
+    """C++ batches so far: recompiles, unchanged classes skipped, average compile time"""
+    return nexus_ai.cpp.stats() if nexus_ai.cpp is not None else None
+
+def pending():
+    """Requests still waiting on the bridge"""
+    return nexus_ai.client.active()
+
+def cancel_all():
+    """Drop every pending generation; results that arrive later are discarded"""
+    nexus_ai.client.cancel_all()
+
+def replay(index=-1):
+    """Re-run a previous snippet: replay() for the last one, replay(-3) or replay('<digest>')"""
+    nexus_ai.replay(index)
+
+def snippet_history(limit=20):
+    """Recent snippet runs with timing: [{digest, label, ok, ms, error, at}]"""
+    return nexus_ai.snippets.history(limit)
+
+def cache_stats():
+    """Hit/miss statistics for the Nexus response cache"""
+    return nexus_ai.cache.stats()
 
 unreal.log("--- NEXUS LIVE IMPLEMENTATION READY ---")
 unreal.log("Use: implement('request') to generate and run code instantly.")
@@ -1,53 +1,76 @@
+import argparse
 import json
 import os
 import sys
+from manifest_store import ManifestStore
+from asset_validation import RULES, POLY_BUDGETS, POLY_TOLERANCE, DEFAULT_PLATFORMS, ERROR, WARNING, ValidationContext, validate
 
 MANIFEST_PATH = "/Users/joeywalter/antigravity-nexus/shader_overlay/nexus_asset_manifest.json"
 
-def validate_manifest():
-    print("🛡️ ANTIGRAVITY NEXUS: ASSET AUDIT STARTING...")
-    
-    if not os.path.exists(MANIFEST_PATH):
-        print(f"❌ CRITICAL ERROR: Manifest not found at {MANIFEST_PATH}")
-        return
+def validate_manifest(manifest_path=MANIFEST_PATH, rules=None, platforms=DEFAULT_PLATFORMS, workers=8,
+                      output_format="text", output=None, strict=False, poly_tolerance=POLY_TOLERANCE):
+    if output_format == "text":
+        print("🛡️ ANTIGRAVITY NEXUS: ASSET AUDIT STARTING...")
 
-    with open(MANIFEST_PATH, 'r') as f:
-        data = json.load(f)
+    if not os.path.exists(manifest_path):
+        print(f"❌ CRITICAL ERROR: Manifest not found at {manifest_path}", file=sys.stderr)
+        return 2
 
-    meta = data.get('meta', {})
+    # Indexed sidecar: only re-parses the JSON when it changed on disk
+    store = ManifestStore(manifest_path)
+    ctx = ValidationContext(os.path.dirname(os.path.abspath(manifest_path)), platforms=platforms,
+                            poly_tolerance=poly_tolerance)
+    report = validate(store, ctx, rules=rules, workers=workers)
+
+    if output_format == "json":
+        emit(json.dumps(report.to_dict(), indent=2), output)
+    elif output_format == "junit":
+        emit(report.to_junit(), output)
+    else:
+        print_text(store.meta, report)
+
+    failed = not report.passed or (strict and report.count(WARNING) > 0)
+    return 1 if failed else 0
+
+def emit(text, output):
+    if output:
+        with open(output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+def print_text(meta, report):
     print(f"--- Meta Context ---")
     print(f"Compliance: {meta.get('pbr_compliance')}")
     print(f"UE Target: {meta.get('engine_target')}")
     print(f"References: {len(meta.get('authoritative_references', {}))} found.")
 
-    assets = data.get('asset_mappings', [])
-    print(f"\n--- Asset Audit ({len(assets)} items) ---")
-    
-    for asset in assets:
-        asset_id = asset.get('id')
-        name = asset.get('name')
-        latest = asset['versions'][0]
-        
-        print(f"\n[ID: {asset_id}] {name} (v{latest['ver']})")
-        
-        # Check targets
-        targets = latest.get('targets', {})
-        for target_type, spec in targets.items():
-            if target_type == 'gltf':
-                path = spec.get('path')
-                full_path = os.path.join("/Users/joeywalter/antigravity-nexus/shader_overlay", path)
-                status = "✅ FOUND" if os.path.exists(full_path) else "⚠️ MISSING (Placeholder)"
-                print(f"  - glTF: {path} [{status}]")
-                if spec.get('poly_count', 0) > 100000:
-                    print(f"    🚨 WARNING: Polycount ({spec['poly_count']}) exceeds mobile/XR limits (Khronos recommendation).")
-            
-            elif target_type == 'spline':
-                print(f"  - Spline: {spec.get('url')[:40]}...")
-            
-            elif target_type == 'unreal':
-                print(f"  - Unreal: {spec.get('asset_path')} [Nanite: {spec.get('nanite')}]")
-
-    print("\n✅ AUDIT COMPLETE. NEXUS VERSION MAPPING IS AUTHORITATIVE.")
+    print(f"\n--- Asset Audit ({report.assets} items, {report.seconds * 1000:.0f} ms) ---")
+    for name, seconds in report.rule_seconds.items():
+        print(f"  {name:<18} {seconds * 1000:>8.1f} ms  {report.rule_failures[name]} findings")
+
+    for finding in report.findings:
+        icon = "❌" if finding.severity == ERROR else "⚠️"
+        print(f"  {icon} [ID: {finding.asset_id}] {finding.rule}: {finding.message}")
+
+    if report.passed:
+        print("\n✅ AUDIT COMPLETE. NEXUS VERSION MAPPING IS AUTHORITATIVE.")
+    else:
+        print(f"\n❌ AUDIT FAILED: {report.count(ERROR)} errors, {report.count(WARNING)} warnings.")
 
 if __name__ == "__main__":
-    validate_manifest()
+    args = argparse.ArgumentParser(description="Validate the Nexus asset manifest")
+    args.add_argument("--manifest", default=MANIFEST_PATH)
+    args.add_argument("--rules", nargs="+", choices=sorted(RULES), help="subset of rules to run (default: all)")
+    args.add_argument("--platforms", nargs="+", choices=sorted(POLY_BUDGETS), default=list(DEFAULT_PLATFORMS))
+    args.add_argument("--workers", type=int, default=8)
+    args.add_argument("--poly-tolerance", type=float, default=POLY_TOLERANCE,
+                      help="allowed relative drift between manifest poly_count and the GLB")
+    args.add_argument("--format", dest="output_format", choices=["text", "json", "junit"], default="text")
+    args.add_argument("--output", help="write the report to a file instead of stdout")
+    args.add_argument("--strict", action="store_true", help="fail on warnings too (CI gate)")
+    opts = args.parse_args()
+
+    sys.exit(validate_manifest(opts.manifest, rules=opts.rules, platforms=opts.platforms, workers=opts.workers,
+                               output_format=opts.output_format, output=opts.output, strict=opts.strict,
+                               poly_tolerance=opts.poly_tolerance))
@@ -0,0 +1,87 @@
+import http.server
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "shader_overlay"))
+
+
+class StubBridge(http.server.ThreadingHTTPServer):
+    """Local stand-in for the bridge's HTTP side. `script` holds canned replies popped per POST /chat
+    (status int, "stream", "json" or ("sleep", seconds)); an empty script answers with streamed echo tokens."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        self.script = []
+        self.requests = []
+        self.peers = set()  # client (host, port) pairs: one per TCP connection
+        self.batch = True
+
+    def handle_error(self, request, client_address):
+        pass  # clients that time out on purpose hang up mid-reply
+
+
+class _StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is observable
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server.requests.append((self.path, body))
+        server.peers.add(self.client_address)
+        if self.path == "/chat/batch":
+            if not server.batch:
+                return self._reply(404, {"error": "not found"})
+            return self._reply(200, {"responses": [{"response": f"echo:{item['message']}"}
+                                                   for item in body["items"]]})
+        step = server.script.pop(0) if server.script else ("stream" if body.get("stream") else "json")
+        if isinstance(step, tuple):
+            threading.Event().wait(step[1])
+            step = "json"
+        if isinstance(step, int):
+            return self._reply(step, {"error": f"status {step}"})
+        if step == "json" or not body.get("stream"):
+            return self._reply(200, {"response": f"echo:{body['message']}"})
+        events = [{"text": "echo:"}, {"text": body["message"]}]
+        data = "".join(f"data: {json.dumps(e)}\n\n" for e in events) + "data: [DONE]\n\n"
+        self._send(200, "text/event-stream", data.encode())
+
+    def _reply(self, status, payload):
+        self._send(status, "application/json", json.dumps(payload).encode())
+
+    def _send(self, status, content_type, data):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def stub_bridge():
+    server = StubBridge()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fake_unreal(monkeypatch):
+    import fake_unreal
+    unreal = fake_unreal.make_module()
+    monkeypatch.setitem(sys.modules, "unreal", unreal)
+    return unreal
@@ -0,0 +1,151 @@
+# Stand-in for the editor's `unreal` module: logging, Slate tick callbacks driven by the test,
+# and a synthetic level (actors with mesh components, material slots and editor subsystem delegates)
+
+import types
+
+
+class LinearColor:
+    def __init__(self, r=0.0, g=0.0, b=0.0, a=1.0):
+        self.r, self.g, self.b, self.a = r, g, b, a
+
+
+class Delegate:
+    def __init__(self):
+        self.callbacks = []
+
+    def add_callable(self, fn):
+        self.callbacks.append(fn)
+
+    def remove_callable(self, fn):
+        self.callbacks.remove(fn)
+
+    def broadcast(self, *args):
+        for fn in list(self.callbacks):
+            fn(*args)
+
+
+class MaterialInstanceDynamic:
+    def __init__(self):
+        self.vectors = {}
+        self.scalars = {}
+        self.writes = 0
+
+    def set_vector_parameter_value(self, name, value):
+        self.vectors[name] = (value.r, value.g, value.b, value.a)
+        self.writes += 1
+
+    def set_scalar_parameter_value(self, name, value):
+        self.scalars[name] = value
+        self.writes += 1
+
+
+class MeshComponent:
+    def __init__(self, path, slots):
+        self.path = path
+        self.materials = [None] * slots
+        self.created = 0
+
+    def get_path_name(self):
+        return self.path
+
+    def get_num_materials(self):
+        return len(self.materials)
+
+    def get_material(self, slot):
+        return self.materials[slot]
+
+    def create_dynamic_material_instance(self, slot):
+        self.created += 1
+        self.materials[slot] = MaterialInstanceDynamic()
+        return self.materials[slot]
+
+
+class Actor:
+    def __init__(self, label, path, slots=2):
+        self.label = label
+        self.path = path
+        self.components = [MeshComponent(f"{path}.StaticMeshComponent0", slots)]
+        self.destroyed = False
+
+    def get_actor_label(self):
+        if self.destroyed:
+            raise RuntimeError("Actor has been destroyed")
+        return self.label
+
+    def get_path_name(self):
+        return self.path
+
+    def get_components_by_class(self, cls):
+        return self.components
+
+
+class EditorActorSubsystem:
+    EVENTS = ("on_delete_actors_end", "on_duplicate_actors_end", "on_edit_paste_actors_end",
+              "on_edit_cut_actors_end", "on_new_actors_dropped")
+
+    def __init__(self):
+        self.actors = []
+        self.scans = 0
+        for name in self.EVENTS:
+            setattr(self, name, Delegate())
+
+    def get_all_level_actors(self):
+        self.scans += 1
+        return list(self.actors)
+
+
+class LevelEditorSubsystem:
+    def __init__(self):
+        self.on_map_opened = Delegate()
+        self.on_map_changed = Delegate()
+
+
+class UnrealEditorSubsystem:
+    pass
+
+
+def make_module():
+    unreal = types.ModuleType("unreal")
+    unreal.logs = []
+    unreal.tick_callbacks = {}
+    handles = iter(range(1, 1 << 30))
+
+    def register_slate_post_tick_callback(fn):
+        handle = next(handles)
+        unreal.tick_callbacks[handle] = fn
+        return handle
+
+    def unregister_slate_post_tick_callback(handle):
+        unreal.tick_callbacks.pop(handle, None)
+
+    def tick(delta_seconds=1 / 60):
+        for fn in list(unreal.tick_callbacks.values()):
+            fn(delta_seconds)
+
+    subsystems = {}
+
+    def get_editor_subsystem(cls):
+        if cls not in subsystems:
+            subsystems[cls] = cls()
+        return subsystems[cls]
+
+    def populate(count, slots=2):
+        """Fill the level with Actor_0..Actor_<count-1>; returns the actor list"""
+        actors = get_editor_subsystem(EditorActorSubsystem).actors
+        start = len(actors)
+        actors.extend(Actor(f"Actor_{i}", f"/Game/Maps/Test.Test:PersistentLevel.Actor_{i}", slots)
+                      for i in range(start, start + count))
+        return actors
+
+    unreal.log = lambda msg: unreal.logs.append(("log", msg))
+    unreal.log_warning = lambda msg: unreal.logs.append(("warning", msg))
+    unreal.log_error = lambda msg: unreal.logs.append(("error", msg))
+    unreal.register_slate_post_tick_callback = register_slate_post_tick_callback
+    unreal.unregister_slate_post_tick_callback = unregister_slate_post_tick_callback
+    unreal.tick = tick
+    unreal.get_editor_subsystem = get_editor_subsystem
+    unreal.populate = populate
+    for cls in (LinearColor, MaterialInstanceDynamic, MeshComponent, Actor, EditorActorSubsystem,
+                LevelEditorSubsystem, UnrealEditorSubsystem):
+        setattr(unreal, cls.__name__, cls)
+    return unreal
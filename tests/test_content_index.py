@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+import content_index
+import package_unreal
+from content_index import ContentIndex
+
+
+@pytest.fixture
+def project(tmp_path):
+    for rel, text in {"Game.uproject": "{}", "Source/Game/Game.cpp": "int x;", "Content/Maps/Main.umap": "map",
+                      "Content/Meshes/Rock.uasset": "rock", "Config/DefaultEngine.ini": "[x]"}.items():
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return tmp_path
+
+
+def failing_hash(fail):
+    """hash_file that raises fail[name] for files with that base name"""
+    real = content_index.hash_file
+
+    def hash_file(path):
+        error = fail.get(os.path.basename(path))
+        if error is not None:
+            raise error
+        return real(path)
+    return hash_file
+
+
+def test_first_scan_hashes_everything_and_plans_a_full_run(project):
+    index = ContentIndex(str(project))
+    current, stats = index.scan()
+    assert stats == {"files": 5, "hashed": 5, "vanished": 0, "unreadable": 0}
+    assert "Game.uproject" in current
+    assert index.plan(current)["first_run"]
+
+
+def test_file_vanishing_between_walk_and_hash_is_dropped(project, monkeypatch):
+    index = ContentIndex(str(project))
+    monkeypatch.setattr(content_index, "hash_file", failing_hash({"Rock.uasset": FileNotFoundError("gone")}))
+    current, stats = index.scan()
+    assert "Content/Meshes/Rock.uasset" not in current
+    assert (stats["files"], stats["vanished"]) == (4, 1)
+
+
+def test_unreadable_file_forces_the_cook_and_is_retried(project, monkeypatch):
+    index = ContentIndex(str(project))
+    index.save(index.scan()[0])
+    (project / "Content" / "Maps" / "Main.umap").write_text("map v2")
+
+    monkeypatch.setattr(content_index, "hash_file", failing_hash({"Main.umap": PermissionError("locked")}))
+    current, stats = index.scan()
+    assert stats["unreadable"] == 1
+    assert current["Content/Maps/Main.umap"][2] is None
+    plan = index.plan(current)
+    assert plan["needs_cook"] and not plan["needs_build"]
+
+    # Saved with no digest, the file is hashed again next time even though size/mtime match
+    index.save(current)
+    monkeypatch.undo()
+    current, stats = index.scan()
+    assert stats["hashed"] == 1 and current["Content/Maps/Main.umap"][2] is not None
+
+
+def test_scan_errors_go_through_the_packaging_error_path(project, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(package_unreal, "PROJECT_DIR", str(project))
+    monkeypatch.setattr(package_unreal, "ARCHIVE_PATH", str(tmp_path / "archive"))
+
+    def scan(self):
+        raise OSError("disk on fire")
+
+    monkeypatch.setattr(ContentIndex, "scan", scan)
+    assert package_unreal.package_project(incremental=True) == 1
+    assert "Error executing packaging: disk on fire" in capsys.readouterr().out
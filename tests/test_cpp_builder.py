@@ -0,0 +1,199 @@
+import os
+
+import pytest
+
+import cpp_builder
+from cpp_builder import CppBatcher, SourceTree
+
+HEADER = "#pragma once\nclass A{name} {{}};\n"
+SOURCE = "#include \"{name}.h\"\n"
+
+
+class Recompiler:
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("Live Coding failed")
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    path = tmp_path / "Source" / "Game"
+    path.mkdir(parents=True)
+    return path
+
+
+@pytest.fixture
+def batcher(source_dir):
+    now = [0.0]
+    reports = []
+    recompile = Recompiler()
+    batcher = CppBatcher(str(source_dir), recompile, on_report=reports.append, debounce=1.5, max_delay=10.0,
+                         clock=lambda: now[0])
+    batcher.now, batcher.reports_seen, batcher.recompiler = now, reports, recompile
+    return batcher
+
+
+def queue(batcher, name, body=""):
+    return batcher.queue(name, HEADER.format(name=name) + body, SOURCE.format(name=name) + body)
+
+
+def test_several_classes_build_with_one_recompile(batcher, source_dir):
+    for name in ("Turret", "Drone", "Shield"):
+        queue(batcher, name)
+    report = batcher.flush()
+    assert report["written"] == ["Turret", "Drone", "Shield"]
+    assert report["compiled"] == ["Drone", "Shield", "Turret"]
+    assert report["recompiled"] and report["ok"]
+    assert batcher.recompiler.calls == 1
+    assert (source_dir / "Drone.h").read_text() == HEADER.format(name="Drone")
+    assert (source_dir / "Drone.cpp").read_text() == SOURCE.format(name="Drone")
+    assert not [p for p in os.listdir(source_dir) if p.endswith(".tmp")]
+    assert batcher.reports_seen == [report]
+
+
+def test_identical_output_is_not_rewritten_or_recompiled(batcher, source_dir):
+    queue(batcher, "Turret")
+    batcher.flush()
+    mtime = (source_dir / "Turret.h").stat().st_mtime_ns
+    queue(batcher, "Turret")
+    report = batcher.flush()
+    assert report["unchanged"] == ["Turret"] and report["written"] == []
+    assert not report["recompiled"]
+    assert batcher.recompiler.calls == 1
+    assert (source_dir / "Turret.h").stat().st_mtime_ns == mtime
+
+
+def test_changing_only_the_source_file_still_rebuilds(batcher, source_dir):
+    queue(batcher, "Turret")
+    batcher.flush()
+    batcher.queue("Turret", HEADER.format(name="Turret"), SOURCE.format(name="Turret") + "// v2\n")
+    assert batcher.flush()["written"] == ["Turret"]
+    assert batcher.recompiler.calls == 2
+
+
+def test_queue_debounces_and_caps_the_delay(batcher):
+    queue(batcher, "A")
+    batcher.now[0] = 1.0
+    batcher.tick()
+    assert batcher.pending() == ["A"] and batcher.due_in() == pytest.approx(0.5)
+    batcher.now[0] = 1.5
+    batcher.tick()
+    assert batcher.pending() == [] and batcher.recompiler.calls == 1
+
+    # A steady stream never goes quiet for 1.5 s, but still builds after max_delay
+    for step in range(12):
+        batcher.now[0] = 2.0 + step
+        queue(batcher, f"Stream{step}")
+        batcher.tick()
+    assert batcher.recompiler.calls == 2
+    assert batcher.reports_seen[-1]["classes"] == [f"Stream{i}" for i in range(11)]  # 10 s after Stream0
+
+
+def test_newer_generation_of_a_class_replaces_the_queued_one(batcher, source_dir):
+    queue(batcher, "A", "// old\n")
+    queue(batcher, "B")
+    queue(batcher, "A", "// new\n")
+    assert batcher.pending() == ["B", "A"]
+    report = batcher.flush()
+    assert report["classes"] == ["B", "A"]
+    assert (source_dir / "A.h").read_text().endswith("// new\n")
+
+
+def test_failed_recompile_keeps_classes_until_a_build_succeeds(batcher):
+    batcher.recompiler.fail = True
+    queue(batcher, "Turret")
+    report = batcher.flush()
+    assert not report["ok"] and not report["recompiled"]
+    assert report["errors"] == ["recompile: Live Coding failed"]
+    assert batcher.stats()["uncompiled"] == ["Turret"]
+
+    # Regenerating identical code finds the files unchanged on disk, but they were never built
+    batcher.recompiler.fail = False
+    queue(batcher, "Turret")
+    report = batcher.flush()
+    assert report["unchanged"] == ["Turret"] and report["compiled"] == ["Turret"]
+    assert report["recompiled"] and report["ok"]
+    assert batcher.stats()["uncompiled"] == []
+    assert batcher.flush() is None
+
+
+def test_failed_recompile_is_retried_by_a_plain_flush(batcher):
+    batcher.recompiler.fail = True
+    queue(batcher, "Turret")
+    batcher.flush()
+    batcher.recompiler.fail = False
+    report = batcher.flush()
+    assert report["classes"] == [] and report["compiled"] == ["Turret"] and report["recompiled"]
+    assert batcher.recompiler.calls == 2
+
+
+def test_idle_flush_does_nothing(batcher):
+    assert batcher.flush() is None
+    assert batcher.due_in() is None
+    assert batcher.recompiler.calls == 0
+
+
+@pytest.mark.parametrize("name, header, source", [
+    ("../Escape", "h", "c"),
+    ("Has Space", "h", "c"),
+    (None, "h", "c"),
+    ("Fine", None, "c"),
+    ("Fine", "h", 42),
+])
+def test_unusable_requests_are_rejected_at_queue_time(batcher, name, header, source):
+    with pytest.raises(ValueError):
+        batcher.queue(name, header, source)
+    assert batcher.pending() == []
+
+
+def test_a_write_error_skips_that_class_only(batcher, source_dir):
+    (source_dir / "Blocked.h").mkdir()  # os.replace onto a directory fails
+    queue(batcher, "Blocked")
+    queue(batcher, "Fine")
+    report = batcher.flush()
+    assert report["written"] == ["Fine"]
+    assert len(report["errors"]) == 1 and report["errors"][0].startswith("Blocked:")
+    assert report["compiled"] == ["Fine"] and not report["ok"]
+
+
+def test_stats_summarise_batches(batcher):
+    queue(batcher, "A")
+    queue(batcher, "B")
+    batcher.flush()
+    queue(batcher, "A")
+    batcher.flush()
+    stats = batcher.stats()
+    assert (stats["batches"], stats["recompiles"], stats["classes"], stats["unchanged"]) == (2, 1, 3, 1)
+    assert stats["avg_compile_ms"] == 0.0  # the fake clock does not move during the build
+
+
+def test_start_and_stop_use_the_slate_tick(batcher, fake_unreal):
+    batcher.start()
+    batcher.start()
+    assert len(fake_unreal.tick_callbacks) == 1
+    queue(batcher, "A")
+    batcher.now[0] = 5.0
+    fake_unreal.tick()
+    assert batcher.recompiler.calls == 1
+    batcher.stop()
+    assert fake_unreal.tick_callbacks == {}
+
+
+def test_source_tree_hashes_unchanged_files_once(source_dir, monkeypatch):
+    tree = SourceTree(str(source_dir))
+    assert tree.write("A.h", "one") is True
+    hashed = []
+    digest = cpp_builder.content_digest
+    monkeypatch.setattr(cpp_builder, "content_digest", lambda data: hashed.append(data) or digest(data))
+    assert tree.write("A.h", "one") is False
+    assert hashed == [b"one"]  # the new text only; the file on disk came from the cache
+
+    # An edit made outside the builder changes mtime/size, so the file is re-read and rewritten
+    (source_dir / "A.h").write_text("edited by hand")
+    assert tree.write("A.h", "one") is True
+    assert (source_dir / "A.h").read_text() == "one"
@@ -0,0 +1,39 @@
+import sys
+import threading
+
+from job_executor import JobExecutor
+
+
+def run_jobs(executor, count):
+    done = threading.Semaphore(0)
+    executor.on_event = lambda event: event["event"] == "finished" and done.release()
+    for i in range(count):
+        executor.submit("echo", [sys.executable, "-c", f"print({i})"])
+    for _ in range(count):
+        assert done.acquire(timeout=30)
+
+
+def test_finished_jobs_are_kept_in_a_bounded_history():
+    executor = JobExecutor(None, max_workers=1, history_size=3)
+    try:
+        run_jobs(executor, 6)
+        jobs = executor.jobs()
+        assert [job["id"] for job in jobs] == [4, 5, 6]
+        assert all(job["state"] == "finished" for job in jobs)
+        assert executor._jobs == {}
+        assert executor.cancel(6) is False
+    finally:
+        executor.shutdown(wait=True)
+
+
+def test_queued_jobs_cancelled_by_shutdown_move_to_history():
+    output = threading.Event()
+    executor = JobExecutor(lambda event: event["event"] == "output" and output.set(), limits={"sleep": 1})
+    running = executor.submit("sleep", [sys.executable, "-u", "-c", "import time; print('up'); time.sleep(30)"])
+    queued = executor.submit("sleep", [sys.executable, "-c", "print('never')"])
+    assert output.wait(30)  # the child is running, so shutdown has a process to terminate
+    executor.shutdown(wait=True)
+    states = {job["id"]: job["state"] for job in executor.jobs()}
+    assert states[queued.id] == "cancelled"
+    assert states[running.id] not in ("queued", "running")  # terminated by shutdown
+    assert executor._jobs == {}
@@ -0,0 +1,184 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from nexus_async import (AsyncNexusClient, GameThreadDispatcher, wait_result, CANCELLED, DONE, FAILED, PENDING,
+                         TIMED_OUT)
+
+
+def pump(unreal, until, timeout=5.0):
+    """Tick the fake editor until until() holds"""
+    deadline = time.perf_counter() + timeout
+    while not until():
+        assert time.perf_counter() < deadline, "timed out waiting on the dispatcher"
+        unreal.tick()
+        time.sleep(0.002)
+
+
+@pytest.fixture
+def dispatcher(fake_unreal):
+    dispatcher = GameThreadDispatcher()
+    dispatcher.start()
+    yield dispatcher
+    dispatcher.stop()
+
+
+def make_client(dispatcher, fetch, **opts):
+    return AsyncNexusClient(dispatcher, fetch, **opts)
+
+
+def test_results_are_applied_on_the_ticking_thread(fake_unreal, dispatcher):
+    fetched = threading.Event()
+    done = []
+
+    def fetch(payload, timeout):
+        fetched.set()
+        return f"reply:{payload}"
+
+    client = make_client(dispatcher, fetch)
+    request = client.submit("hi", "hi", "chat", lambda r, text: done.append((text, threading.current_thread())))
+    assert fetched.wait(5)
+    time.sleep(0.01)
+    assert done == []  # nothing reaches editor state before a tick
+    pump(fake_unreal, lambda: done)
+    assert done == [("reply:hi", threading.current_thread())]
+    assert request.state == DONE and request.result == "reply:hi"
+    assert client.active() == []
+    client.shutdown()
+
+
+def test_in_flight_requests_are_capped(fake_unreal, dispatcher):
+    lock = threading.Lock()
+    running = [0, 0]  # now, peak
+    release = threading.Event()
+
+    def fetch(payload, timeout):
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        release.wait(5)
+        with lock:
+            running[0] -= 1
+        return payload
+
+    client = make_client(dispatcher, fetch, max_in_flight=2)
+    done = []
+    requests = [client.submit(str(i), str(i), "chat", lambda r, text: done.append(text)) for i in range(6)]
+    time.sleep(0.05)
+    assert running[1] == 2
+    assert sum(r.state == PENDING for r in requests) == 4
+    release.set()
+    pump(fake_unreal, lambda: len(done) == 6)
+    assert running[1] == 2
+    client.shutdown()
+
+
+def test_cancel_before_start_never_fetches(fake_unreal, dispatcher):
+    release = threading.Event()
+    calls = []
+
+    def fetch(payload, timeout):
+        calls.append(payload)
+        release.wait(5)
+        return payload
+
+    client = make_client(dispatcher, fetch, max_in_flight=1)
+    done = []
+    first = client.submit("a", "a", "chat", lambda r, text: done.append(text))
+    queued = client.submit("b", "b", "chat", lambda r, text: done.append(text))
+    assert queued.cancel()
+    assert queued.state == CANCELLED
+    assert client.active() == [first]
+    release.set()
+    pump(fake_unreal, lambda: first.state == DONE)
+    assert calls == ["a"] and done == ["a"]
+    client.shutdown()
+
+
+def test_cancel_frees_a_worker_blocked_on_a_running_fetch(fake_unreal, dispatcher):
+    started = threading.Event()
+    upstream = Future()
+    upstream.set_running_or_notify_cancel()  # already running elsewhere: cannot be cancelled
+
+    def fetch(payload, timeout):
+        started.set()
+        return wait_result(upstream, timeout)
+
+    client = make_client(dispatcher, fetch, max_in_flight=1, timeout=30)
+    done, errors = [], []
+    request = client.submit("slow", "slow", "chat", lambda r, t: done.append(t), lambda r, e: errors.append(e))
+    assert started.wait(5)
+    cancelled_at = time.perf_counter()
+    request.cancel()
+    pump(fake_unreal, lambda: request.state == CANCELLED)
+    assert time.perf_counter() - cancelled_at < 1.0
+    # The single worker is free again
+    follow_up = client.submit("next", "next", "chat", lambda r, t: done.append(t), fetch=lambda p, t: p)
+    pump(fake_unreal, lambda: follow_up.state == DONE)
+    assert done == ["next"] and errors == []
+    client.shutdown()
+
+
+def test_wait_result_timeout_is_reported_as_timed_out(fake_unreal, dispatcher):
+    never = Future()
+    client = make_client(dispatcher, lambda payload, timeout: wait_result(never, timeout))
+    errors = []
+    request = client.submit("x", "x", "chat", lambda r, t: None, lambda r, e: errors.append(e), timeout=0.1)
+    pump(fake_unreal, lambda: errors)
+    assert request.state == TIMED_OUT
+    assert isinstance(errors[0], TimeoutError)
+    assert never.cancelled()
+    client.shutdown()
+
+
+@pytest.mark.parametrize("error, state", [
+    (asyncio.TimeoutError(), TIMED_OUT),
+    (TimeoutError("socket"), TIMED_OUT),
+    (ValueError("Request timed out"), FAILED),  # classified by type, not by message text
+])
+def test_errors_are_classified_by_type(fake_unreal, dispatcher, error, state):
+    def fetch(payload, timeout):
+        raise error
+
+    client = make_client(dispatcher, fetch)
+    errors = []
+    request = client.submit("x", "x", "chat", lambda r, t: None, lambda r, e: errors.append(e))
+    pump(fake_unreal, lambda: errors)
+    assert request.state == state and errors == [error]
+    client.shutdown()
+
+
+def test_cached_results_skip_the_pool_but_complete_on_a_tick(fake_unreal, dispatcher):
+    def fetch(payload, timeout):
+        raise AssertionError("cache hits must not fetch")
+
+    client = make_client(dispatcher, fetch)
+    done = []
+    request = client.submit("x", "x", "chat", lambda r, t: done.append(t), cached="from cache")
+    assert request.future is None and done == []
+    fake_unreal.tick()
+    assert done == ["from cache"]
+    client.shutdown()
+
+
+def test_dispatcher_respects_its_tick_budget_and_survives_failing_callbacks(fake_unreal):
+    now = [0.0]
+    dispatcher = GameThreadDispatcher(budget_ms=4.0, clock=lambda: now[0])
+    ran = []
+
+    def step(i):
+        now[0] += 0.003
+        ran.append(i)
+
+    dispatcher.post(lambda: 1 / 0)
+    for i in range(4):
+        dispatcher.post(step, i)
+    dispatcher.tick()
+    assert ran == [0, 1]  # 6 ms of work crosses the 4 ms budget
+    assert dispatcher.pending() == 2
+    assert fake_unreal.logs and fake_unreal.logs[0][0] == "error"
+    dispatcher.tick()
+    assert ran == [0, 1, 2, 3]
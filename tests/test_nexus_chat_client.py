@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from nexus_client import NexusClient, BridgeError
+from nexus_http import BlockingNexusClient, BridgeHTTPError
+
+
+def run(stub, coro_fn, **opts):
+    async def main():
+        client = await NexusClient(stub.url, backoff=0.01, **opts).start(events=False)
+        try:
+            return await coro_fn(client)
+        finally:
+            await client.close()
+    return asyncio.run(main())
+
+
+def test_streamed_chat_reports_tokens_and_latency(stub_bridge):
+    tokens = []
+
+    async def turn(client):
+        return await client.chat("hi", on_token=tokens.append)
+
+    text, stats = run(stub_bridge, turn)
+    assert text == "echo:hi"
+    assert tokens == ["echo:", "hi"]
+    assert stats["status"] == 200 and stats["streamed"]
+    assert 0 <= stats["ttft"] <= stats["total"]
+
+
+def test_turns_reuse_one_keep_alive_connection(stub_bridge):
+    async def turns(client):
+        return [(await client.chat(f"m{i}"))[0] for i in range(5)]
+
+    assert run(stub_bridge, turns) == [f"echo:m{i}" for i in range(5)]
+    assert len(stub_bridge.requests) == 5
+    assert len(stub_bridge.peers) == 1
+
+
+def test_5xx_is_retried_with_backoff(stub_bridge):
+    stub_bridge.script = [503, 502, "stream"]
+
+    async def turn(client):
+        text, _ = await client.chat("again")
+        return text, client.stats["retries"]
+
+    assert run(stub_bridge, turn) == ("echo:again", 2)
+    assert len(stub_bridge.requests) == 3
+
+
+def test_retries_give_up_with_the_last_status(stub_bridge):
+    stub_bridge.script = [500, 500]
+
+    async def turn(client):
+        await client.chat("down")
+
+    with pytest.raises(BridgeError) as error:
+        run(stub_bridge, turn, retries=1)
+    assert error.value.status == 500
+    assert len(stub_bridge.requests) == 2
+
+
+def test_4xx_is_not_retried(stub_bridge):
+    stub_bridge.script = [400]
+
+    async def turn(client):
+        await client.chat("bad")
+
+    with pytest.raises(BridgeError):
+        run(stub_bridge, turn)
+    assert len(stub_bridge.requests) == 1
+
+
+def test_hung_bridge_hits_the_read_timeout(stub_bridge):
+    stub_bridge.script = [("sleep", 1.0)]
+
+    async def turn(client):
+        await client.chat("slow", timeout=0.2)
+
+    with pytest.raises(asyncio.TimeoutError):
+        run(stub_bridge, turn)
+    assert len(stub_bridge.requests) == 1  # a read timeout is never retried
+
+
+def test_batch_falls_back_to_single_chats_on_old_bridges(stub_bridge):
+    stub_bridge.batch = False
+
+    async def batch(client):
+        return await client.chat_batch([{"message": "a"}, {"message": "b"}])
+
+    assert run(stub_bridge, batch) == ["echo:a", "echo:b"]
+
+
+def test_blocking_fallback_client(stub_bridge):
+    client = BlockingNexusClient(stub_bridge.url, read_timeout=5.0)
+    try:
+        tokens = []
+        text, stats = client.chat("plain", on_token=tokens.append).result(timeout=5)
+        assert (text, tokens, stats["streamed"]) == ("echo:plain", ["echo:", "plain"], True)
+        stub_bridge.batch = False
+        assert client.chat_batch([{"message": "x"}]).result(timeout=5) == ["echo:x"]
+        stub_bridge.script = [400]
+        with pytest.raises(BridgeHTTPError):
+            client.chat("bad").result(timeout=5)
+    finally:
+        client.close()
@@ -0,0 +1,41 @@
+import types
+
+import pytest
+
+import relay_queue
+from relay_queue import RelayQueue
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(relay_queue, "time", types.SimpleNamespace(perf_counter=lambda: now[0]))
+    return now
+
+
+def test_avg_flush_ms_is_per_drain_not_per_target(clock):
+    queue = RelayQueue()
+    for latency in (0.010, 0.030):
+        for target in ("controller", "editor", "hub"):
+            queue.push(target, "set_param", '{"action": "set_param"}')
+        clock[0] += latency
+        assert len(queue.drain()) == 3
+    stats = queue.stats()
+    assert (stats["flushes"], stats["flushed_batches"], stats["flushed_commands"]) == (2, 6, 6)
+    assert stats["avg_flush_ms"] == pytest.approx(20.0)
+    assert stats["max_flush_ms"] == pytest.approx(30.0)
+
+
+def test_empty_drain_is_not_a_flush(clock):
+    queue = RelayQueue()
+    assert queue.drain() == {}
+    assert queue.stats()["flushes"] == 0 and queue.stats()["avg_flush_ms"] == 0.0
+
+
+def test_coalesced_actions_keep_only_the_newest_command(clock):
+    queue = RelayQueue()
+    queue.push("editor", "show_status", '"a"')
+    queue.push("editor", "set_param", '"b"')
+    queue.push("editor", "show_status", '"c"')
+    assert queue.drain() == {"editor": '["b","c"]'}
+    assert queue.stats()["coalesced"] == 1
@@ -0,0 +1,205 @@
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+
+from nexus_client.remote_control import RemoteControlClient, RemoteControlError
+from nexus_client.threaded import ThreadedRemoteControl
+from unreal_rc_bench import RemoteControlStub
+
+LIGHT = "/Game/Maps/Live.Live:PersistentLevel.Light_0.LightComponent0"
+BROKEN = "/Game/Maps/Live.Live:PersistentLevel.Broken"
+
+
+def written(stub, object_path, name):
+    # propertyValue is {name: value} on the wire
+    return stub.values[(object_path, name)][name]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class Stub(RemoteControlStub):
+    """The benchmark stub, plus one object whose writes fail like a missing object does in the editor"""
+
+    def apply(self, url, body):
+        if body.get("objectPath") == BROKEN:
+            return 400, {"errorMessage": "Object not found"}
+        return super().apply(url, body)
+
+
+async def start_stub(latency_ms=0):
+    stub = Stub(latency_ms)
+    http_port, ws_port = free_port(), free_port()
+    await stub.start(http_port, ws_port)
+    return stub, f"http://127.0.0.1:{http_port}", f"ws://127.0.0.1:{ws_port}"
+
+
+def run_against_stub(transport, scenario, **opts):
+    async def main():
+        stub, http_url, ws_url = await start_stub()
+        try:
+            async with RemoteControlClient(http_url, ws_url, transport=transport, **opts) as client:
+                return await scenario(stub, client)
+        finally:
+            await stub.runner.cleanup()
+    return asyncio.run(main())
+
+
+@pytest.fixture(params=["http", "ws"])
+def transport(request):
+    return request.param
+
+
+def test_writes_in_one_frame_coalesce_into_one_batch(transport):
+    async def scenario(stub, client):
+        writes = [client.set_property(LIGHT, "Intensity", float(i)) for i in range(10)]
+        other = client.set_property(LIGHT, "LightColor", {"R": 255})
+        call = client.call(LIGHT, "SetVisibility", {"bNewVisibility": True})
+        results = await asyncio.gather(*writes, other, call)
+        return stub, client.stats(), results
+
+    stub, stats, results = run_against_stub(transport, scenario)
+    assert stub.requests == 1  # one /remote/batch for the whole frame
+    assert stub.sub_requests == 3  # ten Intensity writes became one
+    assert written(stub, LIGHT, "Intensity") == 9.0
+    assert results[-1] == {"ReturnValue": None}
+    assert (stats["ops"], stats["coalesced"], stats["batches"], stats["sent_ops"]) == (12, 9, 1, 3)
+
+
+def test_calls_are_never_merged(transport):
+    async def scenario(stub, client):
+        await asyncio.gather(*[client.call(LIGHT, "Toggle") for _ in range(3)])
+        return stub
+
+    assert run_against_stub(transport, scenario).sub_requests == 3
+
+
+def test_large_frames_split_into_batches_in_queue_order(transport):
+    async def scenario(stub, client):
+        writes = [client.set_property(f"{LIGHT}_{i}", "Intensity", i) for i in range(25)]
+        await asyncio.gather(*writes)
+        return stub, client.stats()
+
+    stub, stats = run_against_stub(transport, scenario, max_batch=10)
+    assert stats["batches"] == stub.requests == 3
+    assert [written(stub, f"{LIGHT}_{i}", "Intensity") for i in range(25)] == list(range(25))
+
+
+def test_a_failing_sub_request_only_fails_its_own_future(transport):
+    async def scenario(stub, client):
+        good = client.set_property(LIGHT, "Intensity", 1.0)
+        bad = client.set_property(BROKEN, "Intensity", 1.0)
+        results = await asyncio.gather(good, bad, return_exceptions=True)
+        return results, client.stats()
+
+    (good, bad), stats = run_against_stub(transport, scenario)
+    assert good is None
+    assert isinstance(bad, RemoteControlError) and bad.status == 400
+    assert stats["errors"] == 1
+
+
+def test_separate_frames_send_separate_batches(transport):
+    async def scenario(stub, client):
+        await client.set_property(LIGHT, "Intensity", 1.0)
+        await client.set_property(LIGHT, "Intensity", 2.0)
+        return stub
+
+    stub = run_against_stub(transport, scenario)
+    assert stub.requests == 2 and written(stub, LIGHT, "Intensity") == 2.0
+
+
+def test_ws_batches_are_pipelined_and_matched_to_their_replies():
+    async def scenario(stub, client):
+        stub.latency = 0.02
+        for i in range(40):
+            client.set_property(f"{LIGHT}_{i}", "Intensity", i)
+        # Four batches go out before the first reply arrives
+        flush = asyncio.ensure_future(client.flush())
+        await asyncio.sleep(0.01)
+        in_flight = client.stats()["in_flight"]
+        await flush
+        return in_flight, stub
+
+    in_flight, stub = run_against_stub("ws", scenario, max_batch=10, max_in_flight=8)
+    assert in_flight == 4
+    assert [written(stub, f"{LIGHT}_{i}", "Intensity") for i in range(40)] == list(range(40))
+
+
+def test_non_reply_ws_frames_are_ignored():
+    async def scenario(stub, client):
+        for frame in ("not json", "[1, 2]", "null", '"text"', '{"RequestId": [1]}', '{"RequestId": 999}'):
+            client._on_reply(frame)
+        return await client.set_property(LIGHT, "Intensity", 3.0)
+
+    assert run_against_stub("ws", scenario) is None
+
+
+def test_unreachable_editor_fails_writes_with_remote_control_error(transport):
+    async def main():
+        port = free_port()
+        async with RemoteControlClient(f"http://127.0.0.1:{port}", f"ws://127.0.0.1:{port}", transport=transport,
+                                       timeout=0.3) as client:
+            with pytest.raises(RemoteControlError):
+                await client.set_property(LIGHT, "Intensity", 1.0)
+            return client.stats()
+
+    assert asyncio.run(main())["errors"] == 1
+
+
+def test_unknown_transport_is_rejected():
+    with pytest.raises(ValueError):
+        RemoteControlClient(transport="udp")
+
+
+def test_threaded_client_writes_from_any_thread():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    stub, http_url, ws_url = asyncio.run_coroutine_threadsafe(start_stub(), loop).result(5)
+    client = ThreadedRemoteControl(http_url=http_url, ws_url=ws_url, transport="ws")
+    try:
+        for i in range(100):
+            client.set_property(LIGHT, "Intensity", i)
+        client.call(LIGHT, "Toggle")
+        time.sleep(0.05)  # let the frame timer fire first
+        client.flush().result(5)
+        stats = client.stats()
+    finally:
+        client.close()
+        asyncio.run_coroutine_threadsafe(stub.runner.cleanup(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+    assert written(stub, LIGHT, "Intensity") == 99
+    assert stats["coalesced"] == 99 and stats["errors"] == 0
+
+
+def test_threaded_client_rate_limits_error_reports():
+    errors = []
+    port = free_port()
+    client = ThreadedRemoteControl(on_error=errors.append, error_interval=0.3, http_url=f"http://127.0.0.1:{port}",
+                                   transport="http", frame_ms=1)
+
+    def failing_frame(writes=1):
+        for i in range(writes):
+            client.set_property(f"{LIGHT}_{i}", "Intensity", 1.0)
+        time.sleep(0.1)
+
+    try:
+        failing_frame(writes=20)  # one failed batch: one report, not twenty
+        assert len(errors) == 1
+        failing_frame()
+        failing_frame()
+        assert len(errors) == 1
+        time.sleep(0.2)
+        failing_frame()
+    finally:
+        client.close()
+    assert len(errors) == 2
+    assert isinstance(errors[1], RemoteControlError)
+    assert "+2 more failures" in str(errors[1])
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from response_cache import ResponseCache, cache_key, normalize_prompt
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "cache.json")
+
+
+def stored(path):
+    with open(path) as f:
+        return [response for _, _, response in json.load(f)["entries"]]
+
+
+def test_chat_prompts_share_a_key_across_filler_case_and_number_words():
+    assert normalize_prompt("Please spawn TEN  red spheres!") == "spawn 10 red spheres"
+    assert cache_key("spawn 10 red spheres", None) == cache_key("Hey, could you spawn ten Red spheres?", "chat")
+
+
+@pytest.mark.parametrize("prompt", ["hi", "OK", "please", "  hey  "])
+def test_prompts_that_are_only_filler_keep_their_own_key(prompt):
+    assert normalize_prompt(prompt) == prompt.strip()
+    assert cache_key(prompt, None) != cache_key("", None)
+
+
+def test_code_prompts_keep_their_case():
+    assert normalize_prompt("Please create AMyTurret with TEN barrels", "cpp_generation") == \
+        "create AMyTurret with 10 barrels"
+    assert cache_key("spawn BP_Door", "execution") != cache_key("spawn bp_door", "execution")
+
+
+def test_puts_are_written_once_per_burst(path):
+    cache = ResponseCache(path, save_delay=60)
+    for i in range(5):
+        cache.put(f"prompt {i}", None, f"answer {i}")
+    assert cache._save_timer is not None
+    with pytest.raises(FileNotFoundError):
+        open(path)
+    cache.flush()
+    assert cache._save_timer is None
+    assert stored(path) == [f"answer {i}" for i in range(5)]
+
+
+def test_processes_sharing_the_file_keep_each_others_entries(path):
+    now = [100.0]
+    editor = ResponseCache(path, clock=lambda: now[0], save_delay=60)
+    cli = ResponseCache(path, clock=lambda: now[0], save_delay=60)
+    editor.put("spawn a cube", "execution", "editor answer")
+    now[0] += 1
+    cli.put("what is a material", None, "cli answer")
+    now[0] += 1
+    cli.put("spawn a cube", "execution", "newer cli answer")
+    editor.flush()
+    cli.flush()
+    editor.flush()  # nothing pending: no rewrite
+
+    assert sorted(stored(path)) == ["cli answer", "newer cli answer"]
+    fresh = ResponseCache(path, clock=lambda: now[0])
+    assert fresh.get("spawn a cube", "execution") == "newer cli answer"
+    assert fresh.get("what is a material", None) == "cli answer"
+
+
+def test_clear_does_not_bring_back_entries_from_disk(path):
+    cache = ResponseCache(path, save_delay=60)
+    cache.put("hello there", None, "hi")
+    cache.flush()
+    cache.clear()
+    assert stored(path) == []
@@ -0,0 +1,31 @@
+import pytest
+
+from snippet_store import CodeBlockScanner, extract_code
+
+REPLY = ("Sure, two steps:\n```python\ndef spawn(n):\n    return n\n```\nThen the settings:\n"
+         "```json\n{\"count\": 3}\n```\nand finally\n```py\nspawn(3)\n```\nDone.")
+
+
+def scan(text, size):
+    blocks = []
+    scanner = CodeBlockScanner(blocks.append)
+    for i in range(0, len(text), size):
+        scanner.feed(text[i:i + size])
+    return scanner, blocks
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 7, len(REPLY)])
+def test_every_python_block_fires_in_order_however_the_reply_is_chunked(size):
+    scanner, blocks = scan(REPLY, size)
+    assert blocks == ["def spawn(n):\n    return n", "spawn(3)"]
+    assert scanner.code == "def spawn(n):\n    return n\n\nspawn(3)"
+
+
+def test_an_unclosed_block_does_not_fire():
+    scanner, blocks = scan("```python\nprint(1)\n```\n```python\nprint(2)", 3)
+    assert blocks == ["print(1)"]
+
+
+def test_extract_code_joins_blocks_or_keeps_plain_replies():
+    assert extract_code(REPLY) == "def spawn(n):\n    return n\n\nspawn(3)"
+    assert extract_code("unreal.log('hi')") == "unreal.log('hi')"
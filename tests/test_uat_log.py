@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from uat_log import UATLogParser, stream
+
+LOG = os.path.join(os.path.dirname(__file__), "data", "buildcookrun.log")
+
+
+@pytest.fixture
+def parsed():
+    now = [0.0]
+
+    def clock():
+        # One second per clock read, so clock-timed phases are visibly non-zero
+        now[0] += 1.0
+        return now[0]
+
+    with open(LOG) as f:
+        return stream(f, UATLogParser(clock=clock)).snapshot()
+
+
+def test_replay_finds_every_phase(parsed):
+    assert parsed["phase"] is None
+    assert parsed["exit_code"] == 0
+    assert parsed["cook_progress"] == 1.0
+    assert all(p["started"] and p["done"] for p in parsed["phases"].values())
+
+
+def test_phases_are_timed_from_the_log_when_it_is_stamped(parsed):
+    phases = parsed["phases"]
+    assert (phases["build"]["timing"], phases["build"]["seconds"]) == ("log", 84.5)  # Took only
+    assert (phases["cook"]["timing"], phases["cook"]["seconds"]) == ("log", 78.0)  # Took beats the 75 s stamp span
+    assert (phases["pak"]["timing"], phases["pak"]["seconds"]) == ("log", 12.5)  # stamp span and Took agree
+    # UAT's own stage/archive steps are unstamped: the clock is all there is
+    assert phases["stage"]["timing"] == phases["archive"]["timing"] == "clock"
+    assert phases["stage"]["seconds"] == 3.0 and phases["archive"]["seconds"] == 3.0
+    assert parsed["elapsed"] == pytest.approx(102.377)  # first to last stamp outlasts the fake clock
+
+
+def test_warnings_and_errors_are_billed_to_their_phase(parsed):
+    phases = parsed["phases"]
+    assert (phases["build"]["warnings"], phases["build"]["errors"]) == (2, 0)  # setup warning + compiler warning
+    assert (phases["cook"]["warnings"], phases["cook"]["errors"]) == (1, 0)
+    assert (phases["pak"]["warnings"], phases["pak"]["errors"]) == (0, 1)
+    assert (parsed["warnings"], parsed["errors"]) == (3, 1)
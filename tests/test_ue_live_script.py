@@ -0,0 +1,219 @@
+import importlib
+import sys
+
+import pytest
+
+LEVEL_SIZE = 100000
+
+
+@pytest.fixture
+def live(fake_unreal, monkeypatch):
+    # ue_live_script binds `unreal` at import time: import it fresh against this test's fake module
+    monkeypatch.delitem(sys.modules, "ue_live_script", raising=False)
+    return importlib.import_module("ue_live_script")
+
+
+@pytest.fixture
+def editor(live, fake_unreal):
+    fake_unreal.populate(10)
+    now = [0.0]
+    editor = live.LiveEditor(clock=lambda: now[0])
+    editor.now = now
+    editor.start()
+    yield editor
+    editor.stop()
+
+
+def actor_subsystem(unreal):
+    return unreal.get_editor_subsystem(unreal.EditorActorSubsystem)
+
+
+def mids(actor):
+    return [m for component in actor.components for m in component.materials]
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("#ff0000", (1.0, 0.0, 0.0, 1.0)),
+    ("#00ff0080", (0.0, 1.0, 0.0, 128 / 255)),
+    ("#f00", (1.0, 0.0, 0.0, 1.0)),
+    ("#0F08", (0.0, 1.0, 0.0, 136 / 255)),
+    ("336699", (0.2, 0.4, 0.6, 1.0)),
+    ((0.1, 0.2, 0.3), (0.1, 0.2, 0.3, 1.0)),
+    ([0, 1, 0, 0.5], (0.0, 1.0, 0.0, 0.5)),
+    ({"r": 1, "g": 0.5, "b": 0}, (1.0, 0.5, 0.0, 1.0)),
+])
+def test_color_value_accepts(live, value, expected):
+    assert live.color_value(value) == pytest.approx(expected)
+
+
+def test_color_value_accepts_linear_color(live, fake_unreal):
+    assert live.color_value(fake_unreal.LinearColor(0.1, 0.2, 0.3, 0.4)) == (0.1, 0.2, 0.3, 0.4)
+
+
+@pytest.mark.parametrize("value", ["red", "#12", "#12345", "#gg0000", "", (1, 0), {"r": 1}, ("a", "b", "c"), None])
+def test_color_value_rejects(live, value):
+    with pytest.raises(ValueError):
+        live.color_value(value)
+
+
+def test_batch_creates_mids_once_and_skips_unchanged_values(editor, fake_unreal):
+    actor = actor_subsystem(fake_unreal).actors[3]
+    result = editor.apply_updates([("Actor_3", "Color", "#f00"), ("Actor_3", "Roughness", 0.25)])
+    assert result == {"updates": 2, "applied": 4, "unchanged": 0, "missing": [], "invalid": []}
+    assert [m.vectors["Color"] for m in mids(actor)] == [(1.0, 0.0, 0.0, 1.0)] * 2
+    assert [m.scalars["Roughness"] for m in mids(actor)] == [0.25] * 2
+
+    result = editor.apply_updates([("Actor_3", "Color", (1, 0, 0)), ("Actor_3", "Roughness", 0.5)])
+    assert (result["applied"], result["unchanged"]) == (2, 2)
+    assert actor.components[0].created == 2  # MIDs reused, not recreated
+    assert editor.stats()["mids_created"] == 2
+
+
+def test_existing_dynamic_instances_are_reused(editor, fake_unreal):
+    actor = actor_subsystem(fake_unreal).actors[0]
+    existing = fake_unreal.MaterialInstanceDynamic()
+    actor.components[0].materials[0] = existing
+    editor.apply_updates([("Actor_0", "Color", "#fff")])
+    assert actor.components[0].materials[0] is existing
+    assert (editor.counters["mids_reused"], editor.counters["mids_created"]) == (1, 1)
+
+
+def test_one_bad_value_does_not_abort_the_batch(editor, fake_unreal):
+    result = editor.apply_updates([("Actor_1", "Color", "red"), ("Actor_1", "Metallic", 1),
+                                   ("Actor_2", "Color", "#0f0"), ("Nobody", "Color", "#000")])
+    assert result["applied"] == 4
+    assert result["missing"] == ["Nobody"]
+    assert [(i["label"], i["param"]) for i in result["invalid"]] == [("Actor_1", "Color")]
+    assert "red" in result["invalid"][0]["error"]
+    actor = actor_subsystem(fake_unreal).actors[1]
+    assert all("Color" not in m.vectors and m.scalars["Metallic"] == 1.0 for m in mids(actor))
+    assert editor.counters["invalid"] == 1
+
+
+def test_lookups_use_the_index_not_a_level_scan(editor, fake_unreal):
+    subsystem = actor_subsystem(fake_unreal)
+    for i in range(10):
+        editor.apply_updates([(f"Actor_{i}", "Color", (i / 10, 0, 0))])
+    assert subsystem.scans == 1
+    assert editor.stats()["indexed_actors"] == 10
+
+
+def test_missing_labels_rebuild_at_most_once_per_interval(editor, fake_unreal, live):
+    subsystem = actor_subsystem(fake_unreal)
+    editor.apply_updates([("Actor_0", "Color", "#fff")])
+    for _ in range(5):
+        editor.apply_updates([("Ghost", "Color", "#fff")])
+    assert subsystem.scans == 1
+    editor.now[0] += live.MISS_REBUILD_SECONDS
+    subsystem.actors.append(fake_unreal.Actor("Ghost", "/Game/Maps/Test.Test:PersistentLevel.Ghost"))
+    assert editor.apply_updates([("Ghost", "Color", "#fff")])["applied"] == 2
+    assert subsystem.scans == 2
+
+
+def test_deleted_and_renamed_actors_are_noticed(editor, fake_unreal):
+    subsystem = actor_subsystem(fake_unreal)
+    editor.apply_updates([("Actor_5", "Color", "#fff")])
+
+    # Delete with an event: re-indexed on next use
+    deleted = subsystem.actors.pop(5)
+    deleted.destroyed = True
+    subsystem.on_delete_actors_end.broadcast()
+    assert editor.apply_updates([("Actor_5", "Color", "#000")])["missing"] == ["Actor_5"]
+
+    # Rename without an event: the lookup verifies the label it found and re-indexes right away
+    subsystem.actors[0].label = "Hero"
+    scans = subsystem.scans
+    assert editor.apply_updates([("Actor_0", "Color", "#000")])["missing"] == ["Actor_0"]
+    assert subsystem.scans == scans + 1
+    assert editor.apply_updates([("Hero", "Color", "#000")])["applied"] == 2
+
+
+def test_dropped_actors_are_indexed_without_a_rescan(editor, fake_unreal):
+    subsystem = actor_subsystem(fake_unreal)
+    editor.apply_updates([("Actor_0", "Color", "#fff")])
+    dropped = fake_unreal.Actor("Dropped", "/Game/Maps/Test.Test:PersistentLevel.Dropped")
+    subsystem.actors.append(dropped)
+    subsystem.on_new_actors_dropped.broadcast([], [dropped])
+    assert editor.apply_updates([("Dropped", "Color", "#fff")])["applied"] == 2
+    assert subsystem.scans == 1
+
+
+def test_map_change_forgets_material_instances(editor, fake_unreal):
+    editor.apply_updates([("Actor_0", "Color", "#fff")])
+    fake_unreal.get_editor_subsystem(fake_unreal.LevelEditorSubsystem).on_map_changed.broadcast(0)
+    # Same value again: nothing is cached for the new map, so it is written, not skipped
+    assert editor.apply_updates([("Actor_0", "Color", "#fff")])["applied"] == 2
+
+
+def test_queued_updates_coalesce_and_apply_on_the_next_tick(editor, fake_unreal):
+    for value in ("#100", "#200", "#300"):
+        editor.queue("Actor_2", "Color", value)
+    editor.queue("Actor_2", "Specular", 0.1)
+    editor.queue("Actor_4", "Color", "not a colour")
+    assert editor.counters["updates"] == 0
+    fake_unreal.tick()
+    assert editor.counters["updates"] == 3
+    assert editor.counters["invalid"] == 1
+    actor = actor_subsystem(fake_unreal).actors[2]
+    assert mids(actor)[0].vectors["Color"] == pytest.approx((0x33 / 255, 0, 0, 1))
+    stats = editor.stats()
+    assert stats["ticks"] == 1 and stats["last_tick_ms"] >= 0 and stats["max_tick_ms"] >= stats["avg_tick_ms"]
+
+
+def test_stop_unbinds_delegates_and_the_tick(editor, fake_unreal):
+    editor.stop()
+    assert fake_unreal.tick_callbacks == {}
+    assert actor_subsystem(fake_unreal).on_delete_actors_end.callbacks == []
+
+
+def test_synthetic_level_of_100k_actors(live, fake_unreal):
+    fake_unreal.populate(LEVEL_SIZE, slots=1)
+    editor = live.LiveEditor()
+    editor.start()
+    labels = [f"Actor_{i}" for i in range(0, LEVEL_SIZE, 100)]
+    for label in labels:
+        editor.queue(label, "Color", "#0af")
+    fake_unreal.tick()
+    first = editor.stats()
+    for label in labels:
+        editor.queue(label, "Color", "#0af")
+    fake_unreal.tick()
+    second = editor.stats()
+    editor.stop()
+
+    assert first["indexed_actors"] == LEVEL_SIZE
+    assert first["index_rebuilds"] == 1 and second["index_rebuilds"] == 1
+    assert first["applied"] == len(labels) and first["mids_created"] == len(labels)
+    assert second["unchanged"] == len(labels) and second["mids_created"] == len(labels)
+    assert actor_subsystem(fake_unreal).scans == 1
+    # The steady-state tick does no level scan: far below the one-off index build
+    assert second["last_tick_ms"] < first["last_tick_ms"]
+
+
+def test_actor_replaced_at_the_same_path_gets_fresh_material_instances(editor, fake_unreal):
+    subsystem = actor_subsystem(fake_unreal)
+    old = subsystem.actors[1]
+    editor.apply_updates([("Actor_1", "Color", "#fff")])
+
+    old.destroyed = True
+    new = fake_unreal.Actor("Actor_1", old.path)
+    subsystem.actors[1] = new
+    subsystem.on_delete_actors_end.broadcast()
+
+    # Same value as before: the destroyed actor's "already applied" state must not make it a no-op
+    result = editor.apply_updates([("Actor_1", "Color", "#fff")])
+    assert result["applied"] == 2
+    assert [m.vectors["Color"] for m in mids(new)] == [(1.0, 1.0, 1.0, 1.0)] * 2
+    assert all(m.writes == 1 for m in mids(old))
+
+
+def test_deleted_actors_leave_the_material_cache(editor, fake_unreal):
+    subsystem = actor_subsystem(fake_unreal)
+    editor.apply_updates([(f"Actor_{i}", "Color", "#fff") for i in range(10)])
+    for actor in subsystem.actors[:8]:
+        actor.destroyed = True
+    del subsystem.actors[:8]
+    subsystem.on_delete_actors_end.broadcast()
+    editor.apply_updates([("Actor_9", "Color", "#000")])
+    assert len(editor._actor_mids) == 2
+    assert len(editor._applied) == 4  # two actors x two slots
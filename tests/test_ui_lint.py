@@ -0,0 +1,29 @@
+import glob
+import os
+
+import ui_lint
+
+CONTROLLER = os.path.join(ui_lint.ROOT, "shader_overlay", "engine_controller.html")
+
+
+def unhandled(output):
+    return sorted(line.strip() for line in output.splitlines() if "UNHANDLED:" in line)
+
+
+def test_single_page_run_resolves_actions_from_every_handler_page(capsys):
+    ui_lint.audit_all([CONTROLLER], use_cache=False, workers=1)
+    single = unhandled(capsys.readouterr().out)
+    assert not [line for line in single if "'new_level'" in line]  # handled by another page's handleEngineCommand
+
+    pages = sorted(glob.glob(ui_lint.PAGES_GLOB))
+    ui_lint.audit_all(pages, use_cache=False, workers=1)
+    full = capsys.readouterr().out
+    controller_section = full.split(f"Auditing UI Linkage: {os.path.basename(CONTROLLER)}")[1].split("🔍")[0]
+    assert single == unhandled(controller_section)
+
+
+def test_audit_ui_linkage_sees_the_same_handlers(capsys):
+    ui_lint.audit_ui_linkage(CONTROLLER)
+    single = unhandled(capsys.readouterr().out)
+    ui_lint.audit_all([CONTROLLER], use_cache=False, workers=1)
+    assert single == unhandled(capsys.readouterr().out)
@@ -1,58 +1,251 @@
+import argparse
+import glob
+import hashlib
+import json
 import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
 
-def audit_ui_linkage(file_path):
-    print(f"🔍 Auditing UI Linkage: {os.path.basename(file_path)}")
-    with open(file_path, 'r') as f:
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PAGES_GLOB = os.path.join(ROOT, "shader_overlay", "*.html")
+BRIDGE_PATH = os.path.join(ROOT, "shader_overlay", "main.py")
+CACHE_PATH = os.path.join(ROOT, ".ui_lint_cache.json")
+CACHE_VERSION = 1
+# Pages whose handleEngineCommand receives relayed uiCommand(target, ...) calls; always read, whatever is audited
+HANDLER_PAGES = [os.path.join(ROOT, "shader_overlay", name)
+                 for name in ("nexus_hub.html", "editor_ui.html", "engine_controller.html")]
+
+INTERACTIVE_TAGS = {"button", "div", "span", "a"}
+INTERACTIVE_CLASSES = ("btn", "item", "row")
+LINK_ATTRS = ("onclick", "href")
+
+UI_COMMAND = re.compile(r"""uiCommand\(\s*['"](\w+)['"]\s*,\s*['"](\w+)['"]""")
+CALL_NAME = re.compile(r"^\s*([A-Za-z_$][\w$.]*)\s*\(")
+FUNCTION_DEF = re.compile(r"function\s+([A-Za-z_$][\w$]*)\s*\(|([A-Za-z_$][\w$]*)\s*=\s*(?:async\s*)?(?:function\b|\([^)]*\)\s*=>)")
+ENGINE_ACTION = re.compile(r"""action\s*===?\s*['"](\w+)['"]""")
+SYSTEM_ACTION = re.compile(r"""action\s*==\s*['"](\w+)['"]""")
+GLOBAL_CALLS = {"console", "alert", "window", "document", "location", "setTimeout", "fetch"}
+
+
+class LinkageIndexer(HTMLParser):
+    """Single streaming pass: interactive element index + script text for handler discovery"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.elements = []
+        self.scripts = []
+        self._in_script = False
+        self._awaiting_label = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "script":
+            self._in_script = True
+            return
+        if tag not in INTERACTIVE_TAGS:
+            return
+        attrs = dict(attrs)
+        classes = attrs.get("class") or ""
+        onclick = attrs.get("onclick")
+        if not (onclick or any(c in classes for c in INTERACTIVE_CLASSES)):
+            return
+        element = {
+            "tag": tag,
+            "line": self.getpos()[0],
+            "onclick": onclick,
+            "linked": any(attrs.get(a) for a in LINK_ATTRS),
+            "label": None,
+        }
+        self.elements.append(element)
+        self._awaiting_label.append(element)
+
+    def handle_endtag(self, tag):
+        if tag == "script":
+            self._in_script = False
+
+    def handle_data(self, data):
+        if self._in_script:
+            self.scripts.append(data)
+            return
+        text = data.strip()
+        if text and self._awaiting_label:
+            for element in self._awaiting_label:
+                element["label"] = text[:60]
+            self._awaiting_label = []
+
+
+def index_page(path):
+    """Parse one page into a JSON-serialisable index (cacheable by content hash)"""
+    with open(path, "r", errors="replace") as f:
         content = f.read()
+    parser = LinkageIndexer()
+    parser.feed(content)
+    parser.close()
+
+    script = "\n".join(parser.scripts)
+    defined = {a or b for a, b in FUNCTION_DEF.findall(script)}
+    commands = []
+    calls = []
+    for element in parser.elements:
+        onclick = element["onclick"] or ""
+        for target, action in UI_COMMAND.findall(onclick):
+            commands.append({"target": target, "action": action, "line": element["line"], "label": element["label"]})
+        call = CALL_NAME.match(onclick)
+        if call and call.group(1) != "uiCommand":
+            calls.append({"name": call.group(1), "line": element["line"], "label": element["label"]})
+
+    return {
+        "elements": parser.elements,
+        "commands": commands,
+        "calls": calls,
+        "defined": sorted(defined),
+        "engine_actions": sorted(set(ENGINE_ACTION.findall(script))) if "handleEngineCommand" in script else [],
+    }
+
+
+def system_actions(bridge_path=BRIDGE_PATH):
+    """Actions CommandBridge.execute_system_action understands"""
+    try:
+        with open(bridge_path, "r") as f:
+            source = f.read()
+    except OSError:
+        return set()
+    start = source.find("def execute_system_action")
+    end = source.find("\nclass ", start)
+    return set(SYSTEM_ACTION.findall(source[start:end if end != -1 else None]))
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def load_cache(path=CACHE_PATH):
+    try:
+        with open(path, "r") as f:
+            cache = json.load(f)
+        return cache if cache.get("version") == CACHE_VERSION else {"version": CACHE_VERSION, "pages": {}}
+    except (OSError, ValueError):
+        return {"version": CACHE_VERSION, "pages": {}}
+
 
-    # Find all interactive-looking elements (buttons, drop-rows, menu-items)
-    # We look for onclick or uiCommand calls
-    interactive_elements = re.findall(r'<(button|div|span)[^>]+class=["\'][^"\']*(btn|item|row)[^"\']*["\'][^>]*>', content)
-    
-    total_found = len(interactive_elements)
-    linked_count = 0
-    failures = []
-
-    # Regex for onclick or any linked action
-    # We specifically look for onclick="...uiCommand..." or unique functions
-    tags = re.finditer(r'<(button|div|span)([^>]+)>', content)
-    
-    for match in tags:
-        tag_type = match.group(1)
-        attrs = match.group(2)
-        
-        # Filter for only UI elements we care about
-        if 'btn' in attrs or 'item' in attrs or 'row' in attrs or 'onclick' in attrs:
-            if 'onclick' in attrs:
-                linked_count += 1
-            else:
-                # Potential failure
-                label_match = re.search(r'>(.*?)<', content[match.end():match.end()+100])
-                label = label_match.group(1).strip() if label_match else "Unknown Label"
-                failures.append(f"MISSING LINK: <{tag_type}> {label}")
+def save_cache(cache, path=CACHE_PATH):
+    with open(path, "w") as f:
+        json.dump(cache, f)
+
+
+def index_pages(paths, cache, workers=None):
+    """Index pages in parallel; pages whose hash is cached are skipped"""
+    hashes = {path: file_hash(path) for path in paths}
+    pages = {}
+    stale = []
+    for path in paths:
+        entry = cache["pages"].get(os.path.relpath(path, ROOT))
+        if entry and entry["hash"] == hashes[path]:
+            pages[path] = entry["index"]
+        else:
+            stale.append(path)
+
+    if stale:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for path, index in zip(stale, pool.map(index_page, stale)):
+                pages[path] = index
+                cache["pages"][os.path.relpath(path, ROOT)] = {"hash": hashes[path], "index": index}
+    return pages, len(stale)
+
+
+def handler_actions(pages):
+    """Every action a handleEngineCommand page understands, from already-indexed pages {path: index}"""
+    actions = set()
+    for index in pages.values():
+        actions.update(index["engine_actions"])
+    return actions
+
+
+def cross_check(index, engine_actions, sys_actions):
+    """Resolve each element's handler against the bridge and the pages' command handlers"""
+    unresolved = []
+    for cmd in index["commands"]:
+        if cmd["target"] == "system":
+            known = cmd["action"] in sys_actions
+        else:
+            known = cmd["action"] in engine_actions
+        if not known:
+            unresolved.append(f"UNHANDLED: uiCommand('{cmd['target']}', '{cmd['action']}') "
+                              f"line {cmd['line']} ({cmd['label'] or 'Unknown Label'})")
+    defined = set(index["defined"])
+    for call in index["calls"]:
+        # Methods resolve through their root object (console.log -> console)
+        root = call["name"].split(".")[0]
+        if root not in defined and root not in GLOBAL_CALLS:
+            unresolved.append(f"UNDEFINED: {call['name']}() line {call['line']} ({call['label'] or 'Unknown Label'})")
+    return unresolved
+
+
+def report_page(path, index, engine_actions, sys_actions, verbose=True):
+    elements = index["elements"]
+    total_found = len(elements)
+    linked_count = sum(1 for e in elements if e["linked"])
+    failures = [f"MISSING LINK: <{e['tag']}> {e['label'] or 'Unknown Label'}" for e in elements if not e["linked"]]
+    unresolved = cross_check(index, engine_actions, sys_actions)
 
     success_rate = (linked_count / total_found * 100) if total_found > 0 else 100
-    print(f"✅ Audit Complete: {linked_count}/{total_found} elements linked ({success_rate:.1f}%)")
-    
-    if failures:
-        print("❌ FAILURES DETECTED:")
-        for f in failures:
-            print(f"  - {f}")
-    
+    if verbose:
+        print(f"🔍 Auditing UI Linkage: {os.path.basename(path)}")
+        print(f"✅ Audit Complete: {linked_count}/{total_found} elements linked ({success_rate:.1f}%)")
+        if failures or unresolved:
+            print("❌ FAILURES DETECTED:")
+            for f in failures + unresolved:
+                print(f"  - {f}")
+    return success_rate, failures, unresolved
+
+
+def audit_ui_linkage(file_path):
+    index = index_page(file_path)
+    handlers = {path: index_page(path) for path in HANDLER_PAGES
+                if os.path.exists(path) and os.path.abspath(path) != os.path.abspath(file_path)}
+    handlers[file_path] = index
+    success_rate, failures, _ = report_page(file_path, index, handler_actions(handlers), system_actions())
     return success_rate, failures
 
+
+def audit_all(paths, use_cache=True, workers=None, strict=False):
+    cache = load_cache() if use_cache else {"version": CACHE_VERSION, "pages": {}}
+    # The handler pages are indexed too (cached like the rest) so a partial audit resolves the same actions
+    pages, parsed = index_pages(paths, cache, workers)
+    handlers, _ = index_pages([path for path in HANDLER_PAGES if path not in pages and os.path.exists(path)],
+                              cache, workers)
+    if use_cache:
+        save_cache(cache)
+
+    # Any page that defines handleEngineCommand can receive relayed commands
+    engine_actions = handler_actions({**handlers, **pages})
+    sys_actions = system_actions()
+
+    scores = []
+    unresolved_total = 0
+    for path in paths:
+        score, _, unresolved = report_page(path, pages[path], engine_actions, sys_actions)
+        scores.append(score)
+        unresolved_total += len(unresolved)
+        print()
+
+    total_score = sum(scores) / len(scores) if scores else 100
+    print(f"📄 {len(paths)} pages ({parsed} parsed, {len(paths) - parsed} cached) | "
+          f"{unresolved_total} unresolved handlers")
+    print(f"🏆 FINAL UI SCORE: {total_score:.1f}%")
+    return total_score < 100 or (strict and unresolved_total > 0)
+
+
 if __name__ == "__main__":
-    controller_path = "shader_overlay/engine_controller.html"
-    editor_path = "shader_overlay/editor_ui.html"
-    
-    c_score, c_fails = audit_ui_linkage(controller_path)
-    e_score, e_fails = audit_ui_linkage(editor_path)
-    
-    total_score = (c_score + e_score) / 2
-    print(f"\n🏆 FINAL UI SCORE: {total_score:.1f}%")
-    
-    if total_score < 100:
-        exit(1)
-    else:
-        exit(0)
+    args = argparse.ArgumentParser(description="Audit onclick/uiCommand linkage across the overlay pages")
+    args.add_argument("pages", nargs="*", help="pages to audit (default: shader_overlay/*.html)")
+    args.add_argument("--no-cache", action="store_true", help="re-parse every page")
+    args.add_argument("--workers", type=int, default=None)
+    args.add_argument("--strict", action="store_true", help="also fail on unhandled actions / undefined handlers")
+    opts = args.parse_args()
+
+    paths = [os.path.abspath(p) for p in opts.pages] or sorted(glob.glob(PAGES_GLOB))
+    failed = audit_all(paths, use_cache=not opts.no_cache, workers=opts.workers, strict=opts.strict)
+    sys.exit(1 if failed else 0)
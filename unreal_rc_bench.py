@@ -0,0 +1,186 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "shader_overlay"))
+from nexus_client.remote_control import RemoteControlClient, RC_HTTP_URL, RC_WS_URL, property_request
+
+# Antigravity Unreal Remote Control benchmark
+# Streams dashboard-style property writes at an editor (or the built-in stub) and compares
+# one PUT per write against per-frame batches over HTTP and pipelined batches over WebSocket
+
+STUB_HTTP_PORT = 30110
+STUB_WS_PORT = 30120
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class RemoteControlStub:
+    """Just enough of the Remote Control web server: property/call/batch over HTTP and the WebSocket 'http' message.
+    Requests are handled one at a time with a fixed cost each, like the editor's game-thread dispatch."""
+
+    def __init__(self, latency_ms):
+        self.latency = latency_ms / 1000.0
+        self.lock = asyncio.Lock()
+        self.requests = 0
+        self.sub_requests = 0
+        self.values = {}
+
+    async def handle(self, url, body):
+        async with self.lock:
+            self.requests += 1
+            await asyncio.sleep(self.latency)
+            if url == "/remote/batch":
+                responses = []
+                for request in body.get("Requests", []):
+                    self.sub_requests += 1
+                    code, reply = self.apply(request["URL"], request.get("Body", {}))
+                    responses.append({"RequestId": request.get("RequestId"), "ResponseCode": code, "ResponseBody": reply})
+                return 200, {"Responses": responses}
+            self.sub_requests += 1
+            return self.apply(url, body)
+
+    def apply(self, url, body):
+        if url == "/remote/object/property":
+            self.values[(body["objectPath"], body["propertyName"])] = body["propertyValue"]
+            return 200, None
+        if url == "/remote/object/call":
+            return 200, {"ReturnValue": None}
+        return 404, {"errorMessage": f"unknown route {url}"}
+
+    async def http(self, request):
+        code, reply = await self.handle(request.path, await request.json())
+        return web.json_response(reply, status=code)
+
+    async def ws(self, request):
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        async for msg in ws:
+            message = json.loads(msg.data)
+            params = message.get("Parameters", {})
+            code, reply = await self.handle(params.get("Url"), params.get("Body", {}))
+            await ws.send_str(json.dumps({"RequestId": params.get("RequestId"), "ResponseCode": code,
+                                          "ResponseBody": reply}))
+        return ws
+
+    async def start(self, http_port, ws_port):
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_put("/remote/{tail:.*}", self.http)
+        app.router.add_get("/", self.ws)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        for port in (http_port, ws_port):
+            await web.TCPSite(self.runner, "127.0.0.1", port).start()
+
+
+def workload(opts):
+    """frames x writes; a small hot set of actors is rewritten several times per frame, like a live dashboard"""
+    rng = random.Random(7)
+    hot = max(1, opts.actors // 10)
+    frames = []
+    for _ in range(opts.frames):
+        writes = []
+        for _ in range(opts.writes):
+            actor = rng.randrange(hot) if rng.random() < 0.5 else rng.randrange(opts.actors)
+            writes.append((f"/Game/Maps/Live.Live:PersistentLevel.Actor_{actor}.Light", "Intensity",
+                           round(rng.random() * 5000, 1)))
+        frames.append(writes)
+    return frames
+
+
+async def run_naive(opts, frames):
+    # The obvious client: one keep-alive PUT per write, awaited before the next
+    latencies = []
+    requests = 0
+    async with aiohttp.ClientSession() as session:
+        start = time.perf_counter()
+        for writes in frames:
+            frame_start = time.perf_counter()
+            for path, name, value in writes:
+                sent = time.perf_counter()
+                request = property_request(path, name, value)
+                async with session.put(f"{opts.http}{request['URL']}", json=request["Body"]) as response:
+                    await response.read()
+                requests += 1
+                latencies.append(time.perf_counter() - sent)
+            await asyncio.sleep(max(0.0, opts.frame_ms / 1000 - (time.perf_counter() - frame_start)))
+        elapsed = time.perf_counter() - start
+    return {"requests": requests, "elapsed": elapsed, "latencies": latencies}
+
+
+async def run_client(opts, frames, transport):
+    latencies = []
+    client = RemoteControlClient(opts.http, opts.ws, transport=transport, frame_ms=opts.frame_ms)
+    async with client:
+        start = time.perf_counter()
+        futures = []
+        for writes in frames:
+            frame_start = time.perf_counter()
+            for path, name, value in writes:
+                sent = time.perf_counter()
+                future = client.set_property(path, name, value)
+                future.add_done_callback(lambda f, sent=sent: latencies.append(time.perf_counter() - sent))
+                futures.append(future)
+            await asyncio.sleep(max(0.0, opts.frame_ms / 1000 - (time.perf_counter() - frame_start)))
+        await client.flush()
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        elapsed = time.perf_counter() - start
+        stats = client.stats()
+    errors = sum(1 for r in results if isinstance(r, Exception))
+    return {"requests": stats["batches"], "elapsed": elapsed, "latencies": latencies, "errors": errors, "stats": stats}
+
+
+def report(name, writes, result):
+    lat = sorted(ms * 1000 for ms in result["latencies"])
+    print(f"{name:>10}: {result['requests']:6d} requests for {writes} writes | {result['elapsed']:.2f}s "
+          f"({writes / result['elapsed']:,.0f} writes/s) | write->ack p50 {percentile(lat, 50):.1f} ms "
+          f"p95 {percentile(lat, 95):.1f} ms{' | errors ' + str(result['errors']) if result.get('errors') else ''}")
+
+
+async def main(opts):
+    stub = None
+    if opts.stub:
+        stub = RemoteControlStub(opts.stub_latency_ms)
+        await stub.start(STUB_HTTP_PORT, STUB_WS_PORT)
+        opts.http, opts.ws = f"http://127.0.0.1:{STUB_HTTP_PORT}", f"ws://127.0.0.1:{STUB_WS_PORT}"
+    frames = workload(opts)
+    writes = sum(len(f) for f in frames)
+    print(f"🎛️ {opts.frames} frames x {opts.writes} writes over {opts.actors} actors ({opts.http}, {opts.ws})")
+    summary = {}
+    for mode in opts.modes:
+        result = await (run_naive(opts, frames) if mode == "naive" else run_client(opts, frames, mode))
+        report(mode, writes, result)
+        summary[mode] = {"requests": result["requests"], "seconds": round(result["elapsed"], 3),
+                         "stats": result.get("stats")}
+    if stub is not None:
+        print(f"   stub handled {stub.requests} requests / {stub.sub_requests} property writes")
+        await stub.runner.cleanup()
+    if opts.json:
+        print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    args = argparse.ArgumentParser(description="Benchmark batched Unreal Remote Control writes")
+    args.add_argument("--http", default=RC_HTTP_URL)
+    args.add_argument("--ws", default=RC_WS_URL)
+    args.add_argument("--stub", action="store_true", help="run against a local Remote Control stub")
+    args.add_argument("--stub-latency-ms", type=float, default=1.0, help="stub cost per request")
+    args.add_argument("--frames", type=int, default=120)
+    args.add_argument("--writes", type=int, default=50, help="property writes per frame")
+    args.add_argument("--actors", type=int, default=200)
+    args.add_argument("--frame-ms", type=float, default=16.0)
+    args.add_argument("--modes", nargs="+", default=["naive", "http", "ws"], choices=["naive", "http", "ws"])
+    args.add_argument("--json", action="store_true", help="also print a machine-readable summary")
+    asyncio.run(main(args.parse_args()))